@@ -12,5 +12,7 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'Quickfix.settings')
+# Read by the settings: no persistent database connections under ASGI
+os.environ.setdefault('QUICKFIX_ASGI', '1')
 
 application = get_asgi_application()
@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -45,6 +46,7 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
+    "project.routers.ReplicaRoutingMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
@@ -87,13 +89,52 @@ WSGI_APPLICATION = "Quickfix.wsgi.application"
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
+# Set by asgi.py. Async views reach the database from sync_to_async threads,
+# whose connections the request lifecycle never closes, so persistent
+# connections are only used under WSGI.
+RUNNING_ASGI = os.environ.get("QUICKFIX_ASGI") == "1"
+
 DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.sqlite3",
         "NAME": BASE_DIR / "db.sqlite3",
+        # Reuse connections across requests, checking them before reuse
+        "CONN_MAX_AGE": 0 if RUNNING_ASGI else 600,
+        "CONN_HEALTH_CHECKS": True,
+        "OPTIONS": {
+            # Take the write lock when a transaction starts. A deferred
+            # transaction that reads and then writes can't wait for the lock
+            # and fails with "database is locked" instead.
+            "transaction_mode": "IMMEDIATE",
+            "timeout": 5,
+        },
     }
 }
 
+# Read replica: GET requests read from it until they write, everything else
+# uses the primary. Locally it's a second SQLite file refreshed with
+# `manage.py sync_replica`.
+REPLICA_DB = os.environ.get("QUICKFIX_REPLICA_DB")
+if REPLICA_DB:
+    DATABASES["replica"] = {
+        **DATABASES["default"],
+        "NAME": Path(REPLICA_DB),
+        "TEST": {"MIRROR": "default"},
+    }
+    DATABASE_ROUTERS = ["project.routers.PrimaryReplicaRouter"]
+
+# Applied to every SQLite connection by project/db.py; {} keeps SQLite defaults
+SQLITE_PRAGMAS = {
+    # Readers don't block the writer and the writer doesn't block readers
+    "journal_mode": "wal",
+    "busy_timeout": 5000,  # ms to wait for the write lock
+    # In WAL mode only a power loss can drop the last commits, never corrupt
+    "synchronous": "normal",
+    "mmap_size": 128 * 1024 * 1024,
+    "cache_size": -16000,  # negative: KiB, so 16 MB per connection
+    "temp_store": "memory",
+}
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -131,6 +172,37 @@ USE_TZ = True
 
 STATIC_URL = "static/"
 
+# User uploads (job images, qualification certificates)
+MEDIA_URL = "/media/"
+MEDIA_ROOT = BASE_DIR / "media"
+# Set to "x-accel-redirect" (nginx) or "x-sendfile" (Apache, lighttpd) to have
+# the front proxy send media files once project.views.serve_media has checked
+# the request. For nginx, map the prefix to MEDIA_ROOT in an internal location:
+#     location /protected-media/ { internal; alias /srv/quickfix/media/; }
+MEDIA_ACCEL = os.environ.get("QUICKFIX_MEDIA_ACCEL")
+MEDIA_ACCEL_PREFIX = "/protected-media/"
+
+# Chunked uploads (project/uploads.py): partial files live outside MEDIA_ROOT
+# until finalized, and are dropped after a day without a new chunk
+UPLOAD_TEMP_DIR = BASE_DIR / "upload_tmp"
+MAX_UPLOAD_SIZE = 50 * 1024 * 1024
+UPLOAD_SESSION_MAX_AGE = 24 * 60 * 60
+
+# Background tasks (project/tasks.py). Each process runs the tasks it enqueues
+# in this many threads right after commit; `manage.py run_task_worker` runs
+# the rest, including retries. 0 leaves everything to run_task_worker.
+TASK_WORKER_THREADS = 2
+# A task running this long is assumed to belong to a dead worker and requeued
+TASK_STALE_AFTER = 10 * 60
+
+# Seconds a process keeps a cached job feed (project/cache.py). Signals only
+# invalidate the cache of the process that made the write, so this bounds how
+# long other worker processes can serve a stale feed.
+JOB_FEED_CACHE_TTL = 30
+# Job rows a process keeps across all cached feeds, least recently used
+# feeds going first. A feed with more open jobs than this isn't cached.
+JOB_FEED_CACHE_MAX_ROWS = 20000
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
@@ -4,8 +4,11 @@ from .models import (
     User,
     Job,
     JobAcceptance,
+    Application,
     Complaint,
     AdminRegistrationCode,
+    PincodeLocation,
+    CompletedJobSummary,
 )
 
 # Register your models here.
@@ -13,5 +16,8 @@ admin.site.register(ServiceCategory)
 admin.site.register(User)
 admin.site.register(Job)
 admin.site.register(JobAcceptance)
+admin.site.register(Application)
 admin.site.register(Complaint)
 admin.site.register(AdminRegistrationCode)
+admin.site.register(PincodeLocation)
+admin.site.register(CompletedJobSummary)
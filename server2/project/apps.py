@@ -1,6 +1,13 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_migrate
 
 
 class ProjectConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'project'
+
+    def ready(self):
+        from . import db  # noqa: F401  connects the SQLite pragmas
+        from . import signals
+
+        post_migrate.connect(signals.restore_search_index, sender=self)
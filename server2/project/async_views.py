@@ -0,0 +1,247 @@
+"""
+Async versions of the hot read endpoints, for running under ASGI
+(``uvicorn Quickfix.asgi:application``). They return the same bodies as their
+``APIView`` counterparts in views.py and share their querysets, but read
+through the async ORM so a request waiting on the database doesn't hold a
+thread. ``job_events`` has no sync counterpart: it holds a connection open
+for as long as the client listens, which only an event loop can afford.
+"""
+
+import asyncio
+import uuid
+
+from django.core.exceptions import ValidationError
+from django.http import HttpResponse, StreamingHttpResponse
+from django.utils.http import parse_etags
+from django.views.decorators.http import require_GET
+
+from . import cache, events
+from .models import Job, ServiceCategory, User
+from .pagination import InvalidPage, akeyset_page, parse_limit
+from .routers import primary
+from .serializers import JobSerializer, ServiceCategorySerializer, UserSerializer
+from .streaming import dumps
+from .views import application_data, applied_jobs, open_jobs, worker_applications
+
+
+def json_response(payload, status=200):
+    return HttpResponse(dumps(payload), status=status, content_type="application/json")
+
+
+def error_response(message, status):
+    return json_response({"message": message, "status": "error"}, status)
+
+
+@require_GET
+async def jobs_for_seekers(request):
+    try:
+        service_category = request.GET.get("service_category")
+        location = request.GET.get("location")
+        user_id = request.GET.get("userId")
+        shared_jobs = open_jobs(service_category, location).select_related(
+            "service_category"
+        )
+
+        limit = request.GET.get("limit")
+        cursor = request.GET.get("cursor")
+        if limit is not None or cursor is not None:
+            jobs = shared_jobs
+            if user_id:
+                jobs = jobs.exclude(id__in=applied_jobs(user_id))
+            page, next_cursor = await akeyset_page(
+                jobs, ("-created_at", "-id"), cursor=cursor, limit=parse_limit(limit)
+            )
+            return json_response(
+                {
+                    "message": "Jobs fetched successfully",
+                    "data": JobSerializer(page, many=True).data,
+                    "next": next_cursor,
+                    "status": "success",
+                }
+            )
+
+        async def build_feed():
+            jobs = shared_jobs.order_by("-created_at", "-id")
+            return JobSerializer([job async for job in jobs], many=True).data
+
+        async def build_applied():
+            return [job_id async for job_id in applied_jobs(user_id)]
+
+        rows = await cache.job_feeds.aget_feed(service_category, location, build_feed)
+        applied = (
+            await cache.job_feeds.aget_applied(user_id, build_applied)
+            if user_id
+            else frozenset()
+        )
+        return json_response(
+            {
+                "message": "Jobs fetched successfully",
+                "data": [row for row in rows if row["id"] not in applied],
+                "status": "success",
+            }
+        )
+
+    except InvalidPage as e:
+        return error_response(str(e), 400)
+    except Exception as e:
+        return error_response(str(e), 500)
+
+
+@require_GET
+async def my_applications(request):
+    try:
+        user_id = request.GET.get("userId")
+        if not user_id:
+            return error_response("User ID is required", 400)
+
+        applications = worker_applications(user_id, request.GET.get("status"))
+        ordering = ("-created_at", "-id")
+        limit = request.GET.get("limit")
+        cursor = request.GET.get("cursor")
+        page = {}
+        if limit is not None or cursor is not None:
+            rows, page["next"] = await akeyset_page(
+                applications, ordering, cursor=cursor, limit=parse_limit(limit)
+            )
+        else:
+            rows = [row async for row in applications.order_by(*ordering)]
+        if (
+            not rows
+            and not cursor
+            and not await User.objects.filter(id=user_id).aexists()
+        ):
+            return error_response("User not found", 404)
+
+        return json_response(
+            {
+                "message": "Applications fetched successfully",
+                "data": [application_data(row) for row in rows],
+                **page,
+                "status": "success",
+            }
+        )
+
+    except InvalidPage as e:
+        return error_response(str(e), 400)
+    except Exception as e:
+        return error_response(str(e), 500)
+
+
+@require_GET
+async def service_categories(request):
+    etag = cache.service_categories.peek_etag()
+    if etag and etag in parse_etags(request.headers.get("If-None-Match", "")):
+        response = HttpResponse(status=304)
+    else:
+
+        async def build():
+            categories = [category async for category in ServiceCategory.objects.all()]
+            return ServiceCategorySerializer(categories, many=True).data
+
+        body, etag = await cache.service_categories.aget(build)
+        response = HttpResponse(body, content_type="application/json")
+    response["ETag"] = etag
+    response["Cache-Control"] = "no-cache"
+    return response
+
+
+@require_GET
+async def user_profile(request):
+    try:
+        user_id = request.GET.get("userId")
+        if not user_id:
+            return error_response("User ID is required", 400)
+
+        user = await User.objects.aget(id=user_id)
+        return json_response(
+            {
+                "message": "Profile fetched successfully",
+                "data": UserSerializer(user).data,
+                "status": "success",
+            }
+        )
+
+    except User.DoesNotExist:
+        return error_response("User not found", 404)
+    except Exception as e:
+        return error_response(str(e), 500)
+
+
+# A comment line this often keeps proxies from closing an idle stream
+HEARTBEAT_SECONDS = 15
+# Most jobs replayed to a client reconnecting with Last-Event-ID
+REPLAY_LIMIT = 100
+
+
+@require_GET
+async def job_events(request):
+    """
+    Server-sent events: every new open job in ``service_category`` and/or
+    ``pincode`` as an ``event: job`` whose data is the JobSerializer row and
+    whose id is the job's. A browser ``EventSource`` reconnects by itself
+    and sends the last id, and the jobs posted since are replayed first.
+    """
+    service_category = request.GET.get("service_category") or None
+    if service_category:
+        try:
+            service_category = str(uuid.UUID(service_category))
+        except ValueError:
+            return error_response("Invalid service category", 400)
+
+    response = StreamingHttpResponse(
+        job_event_stream(
+            service_category,
+            request.GET.get("pincode") or None,
+            request.headers.get("Last-Event-ID"),
+        ),
+        content_type="text/event-stream",
+    )
+    response["Cache-Control"] = "no-cache"
+    # Stop nginx buffering the stream
+    response["X-Accel-Buffering"] = "no"
+    return response
+
+
+def job_event(row):
+    return b"id: %s\nevent: job\ndata: %s\n\n" % (row["id"].encode(), dumps(row))
+
+
+async def job_event_stream(service_category, pincode, last_event_id):
+    # Subscribe before replaying, so a job posted in between isn't missed
+    subscription = events.new_jobs.subscribe(service_category, pincode)
+    try:
+        yield b"retry: 3000\n\n"
+        replayed = set()
+        if last_event_id:
+            for row in await jobs_since(last_event_id, service_category, pincode):
+                replayed.add(row["id"])
+                yield job_event(row)
+
+        # A subscriber that fell too far behind is dropped; the client
+        # reconnects and catches up through the replay
+        while not subscription.overflowed:
+            try:
+                row = await asyncio.wait_for(
+                    subscription.queue.get(), HEARTBEAT_SECONDS
+                )
+            except TimeoutError:
+                yield b": keepalive\n\n"
+                continue
+            if row["id"] not in replayed:
+                yield job_event(row)
+    finally:
+        events.new_jobs.unsubscribe(subscription)
+
+
+async def jobs_since(job_id, service_category, pincode):
+    # From the primary: the replica may not have the newest jobs yet
+    with primary():
+        try:
+            last = await Job.objects.only("created_at").aget(pk=job_id)
+        except (Job.DoesNotExist, ValidationError):
+            return []
+        jobs = open_jobs(service_category).filter(created_at__gt=last.created_at)
+        if pincode:
+            jobs = jobs.filter(pincode=pincode)
+        jobs = jobs.select_related("service_category").order_by("created_at", "id")
+        return JobSerializer([job async for job in jobs[:REPLAY_LIMIT]], many=True).data
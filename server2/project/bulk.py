@@ -0,0 +1,186 @@
+import csv
+import uuid
+from functools import partial
+from itertools import islice
+
+from django.db import IntegrityError, transaction
+from rest_framework import serializers
+
+from . import cache, counters, events
+from .geo import set_job_coordinates
+from .models import (
+    Application,
+    Job,
+    JobAcceptance,
+    PincodeLocation,
+    ServiceCategory,
+    User,
+)
+from .serializers import JobBulkRowSerializer
+
+BATCH_SIZE = 500
+MAX_APPLY_JOBS = 100
+# Times a batch application is worked out again after losing a race
+APPLY_ATTEMPTS = 3
+
+
+def batches(iterable, size=BATCH_SIZE):
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def create_jobs(rows):
+    """
+    Validate and insert job rows a batch at a time. Returns ``(created,
+    errors)``: the created jobs and one ``{"row", "errors"}`` entry per
+    rejected row, numbered from 1. If the body can't be read to the end, the
+    rows before that point are still created and the rest is reported as
+    one error.
+    """
+    created = []
+    errors = []
+    for offset, batch in enumerate(batches(_readable(rows, errors))):
+        first_row = offset * BATCH_SIZE + 1
+        jobs, batch_errors = _build_jobs(enumerate(batch, start=first_row))
+        errors.extend(batch_errors)
+        if jobs:
+            with transaction.atomic():
+                Job.objects.bulk_create(jobs)
+                counters.add_open_jobs(job.service_category_id for job in jobs)
+            created.extend(jobs)
+            # bulk_create skips the signals that keep the feed cache fresh and
+            # announce new jobs
+            cache.job_feeds.invalidate_jobs(jobs)
+            transaction.on_commit(partial(events.new_jobs.publish, jobs), robust=True)
+    errors.sort(key=lambda error: error["row"])
+    return created, errors
+
+
+def _readable(rows, errors):
+    """Yield ``rows`` until one can't be parsed out of the body."""
+    rows = iter(rows)
+    number = 1
+    while True:
+        try:
+            row = next(rows)
+        except StopIteration:
+            return
+        except (ValueError, csv.Error) as e:
+            errors.append({"row": number, "errors": [f"Stopped reading here: {e}"]})
+            return
+        yield row
+        number += 1
+
+
+def _build_jobs(rows):
+    valid = []
+    errors = []
+    # One serializer for the batch; building its fields per row costs more
+    # than the validation itself
+    serializer = JobBulkRowSerializer()
+    for number, row in rows:
+        if isinstance(row, Exception):
+            errors.append({"row": number, "errors": [str(row)]})
+            continue
+        try:
+            valid.append((number, serializer.run_validation(row)))
+        except serializers.ValidationError as e:
+            errors.append({"row": number, "errors": e.detail})
+
+    # One IN query each for the batch's users, categories and pincodes
+    users = User.objects.in_bulk({data["user"] for _, data in valid})
+    categories = ServiceCategory.objects.in_bulk(
+        {data["service_category"] for _, data in valid}
+    )
+    pincodes = {
+        data.get("pincode") or users[data["user"]].pincode
+        for _, data in valid
+        if data["user"] in users
+    }
+    locations = PincodeLocation.objects.in_bulk(pincodes)
+
+    jobs = []
+    for number, data in valid:
+        user = users.get(data["user"])
+        category = categories.get(data["service_category"])
+        if user is None:
+            errors.append({"row": number, "errors": ["User not found"]})
+            continue
+        if category is None:
+            errors.append({"row": number, "errors": ["Service category not found"]})
+            continue
+        job = Job(**{**data, "user": user, "service_category": category})
+        job.pincode = job.pincode or user.pincode
+        set_job_coordinates(job, locations.get(job.pincode))
+        jobs.append(job)
+    errors.sort(key=lambda error: error["row"])
+    return jobs, errors
+
+
+def apply_to_jobs(worker, job_ids):
+    """
+    Apply ``worker`` to every job in ``job_ids`` in a fixed number of queries.
+    Returns one ``{"job_id", "status"}`` per distinct ID, in request order,
+    where status is ``applied``, ``already_applied``, ``not_found`` or
+    ``invalid``.
+    """
+    outcomes = {}
+    requested = {}
+    for job_id in dict.fromkeys(str(job_id) for job_id in job_ids):
+        try:
+            requested[uuid.UUID(job_id)] = job_id
+        except ValueError:
+            outcomes[job_id] = "invalid"
+            continue
+        outcomes[job_id] = "not_found"
+
+    # An application made between the check and the insert trips the unique
+    # constraint and rolls the batch back; it is then worked out again and
+    # that job reported as already applied
+    for attempt in range(APPLY_ATTEMPTS):
+        try:
+            return _apply(worker, requested, dict(outcomes))
+        except IntegrityError:
+            if attempt == APPLY_ATTEMPTS - 1:
+                raise
+
+
+def already_applied(worker, job_ids):
+    return set(
+        Application.objects.filter(worker=worker, job_id__in=job_ids).values_list(
+            "job_id", flat=True
+        )
+    )
+
+
+def _apply(worker, requested, outcomes):
+    jobs = Job.objects.in_bulk(requested)
+    applied = already_applied(worker, list(jobs))
+
+    new_jobs = []
+    for job_id, job in jobs.items():
+        if job_id in applied:
+            outcomes[requested[job_id]] = "already_applied"
+        else:
+            new_jobs.append(job)
+            outcomes[requested[job_id]] = "applied"
+
+    if new_jobs:
+        Through = JobAcceptance.job_seekers.through
+        with transaction.atomic():
+            Application.objects.bulk_create(
+                Application(job=job, worker=worker) for job in new_jobs
+            )
+            acceptances = JobAcceptance.objects.bulk_create(
+                JobAcceptance(job=job) for job in new_jobs
+            )
+            Through.objects.bulk_create(
+                Through(jobacceptance_id=acceptance.pk, user=worker)
+                for acceptance in acceptances
+            )
+            counters.add_applicants(job.pk for job in new_jobs)
+        # bulk_create skips the signals that drop the worker's applied set
+        cache.job_feeds.invalidate_workers([worker.pk])
+
+    return [{"job_id": job_id, "status": status} for job_id, status in outcomes.items()]
@@ -0,0 +1,275 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+
+from .routers import primary
+
+# Misses are always filled from the primary database: invalidation follows a
+# write immediately, and a lagging replica would re-cache the old rows.
+
+
+def on_change_and_commit(invalidate):
+    # Drop now so this request reads its own write, and again on commit so a
+    # concurrent reader can't re-cache the pre-commit rows.
+    invalidate()
+    transaction.on_commit(invalidate)
+
+
+class VersionedResponseCache:
+    """
+    In-process cache of one pre-rendered JSON body and its strong ETag.
+
+    ``version`` is bumped by model signals whenever the source table changes;
+    a body rendered for an older version is never served. Each process keeps
+    its own copy, so a change made by another worker process is picked up
+    only when that process bumps its own version (e.g. on restart).
+    """
+
+    def __init__(self):
+        self.version = 0
+        self._entry = None
+        self._lock = threading.Lock()
+
+    def bump(self):
+        with self._lock:
+            self.version += 1
+            self._entry = None
+
+    def clear(self):
+        self.bump()
+
+    def peek_etag(self):
+        entry = self._entry
+        if entry is not None and entry[0] == self.version:
+            return entry[2]
+        return None
+
+    def get(self, build):
+        """Return ``(body, etag)``, calling ``build()`` for the data on a miss."""
+        entry = self._entry
+        if entry is not None and entry[0] == self.version:
+            return entry[1], entry[2]
+        version = self.version
+        with primary():
+            data = build()
+        return self._store(version, data)
+
+    async def aget(self, build):
+        """``get()`` for async views: ``build`` is a coroutine function."""
+        entry = self._entry
+        if entry is not None and entry[0] == self.version:
+            return entry[1], entry[2]
+        version = self.version
+        with primary():
+            data = await build()
+        return self._store(version, data)
+
+    def _store(self, version, data):
+        body = JSONRenderer().render(data)
+        etag = '"%s"' % hashlib.sha256(body).hexdigest()[:32]
+        with self._lock:
+            # Don't store a body built from data a concurrent write changed
+            if version == self.version:
+                self._entry = (version, body, etag)
+        return body, etag
+
+
+service_categories = VersionedResponseCache()
+
+
+class LRUCache:
+    """
+    Least recently used entries go first once the entries' total size passes
+    ``max_size``. Each entry counts as ``size(value)``, 1 by default, and one
+    bigger than ``max_size`` isn't kept at all. With ``ttl``, entries expire
+    too.
+    """
+
+    def __init__(self, max_size, ttl=None, size=None):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.size = size or (lambda value: 1)
+        self.total = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            try:
+                self._data.move_to_end(key)
+            except KeyError:
+                return None
+            expires, value, _ = self._data[key]
+            if expires is not None and expires <= time.monotonic():
+                self._pop(key)
+                return None
+            return value
+
+    def peek(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+        return None if entry is None else entry[1]
+
+    def set(self, key, value):
+        expires = None if self.ttl is None else time.monotonic() + self.ttl
+        size = self.size(value)
+        with self._lock:
+            self._pop(key)
+            if size > self.max_size:
+                return
+            self._data[key] = (expires, value, size)
+            self.total += size
+            while self.total > self.max_size:
+                self._pop(next(iter(self._data)))
+
+    def discard(self, keys):
+        with self._lock:
+            for key in keys:
+                self._pop(key)
+
+    def _pop(self, key):
+        entry = self._data.pop(key, None)
+        if entry is not None:
+            self.total -= entry[2]
+
+    def keys(self):
+        with self._lock:
+            return list(self._data)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.total = 0
+
+    def __len__(self):
+        return len(self._data)
+
+
+class JobFeedCache:
+    """
+    Shared part of the worker job feed: ``(service_category, location)`` to
+    the serialized open jobs, newest first. The per-worker exclusion of
+    already applied jobs is kept in a second LRU of job ID sets and applied
+    in memory.
+
+    Signals drop exactly the feeds a changed job appears in or now matches,
+    and the applied set of each worker whose applications changed. Writes
+    that bypass signals (``update()``, ``bulk_create()``) must call
+    ``clear()`` or ``invalidate_jobs()`` themselves.
+
+    Each process has its own cache and only sees its own invalidations, so
+    entries also expire after ``ttl`` seconds; a write made through another
+    worker process shows up here within that time.
+    """
+
+    def __init__(self, max_rows=20000, max_applied=100000, ttl=None):
+        # Bounded by rows and job IDs held, not entries, since one feed holds
+        # every open job that matches it
+        self.feeds = LRUCache(max_rows, ttl, size=lambda entry: len(entry[0]) or 1)
+        self.applied = LRUCache(max_applied, ttl, size=lambda ids: len(ids) or 1)
+        self.generation = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def feed_key(service_category, location):
+        return (
+            (
+                str(service_category).replace("-", "").lower()
+                if service_category
+                else None
+            ),
+            location or None,
+        )
+
+    def get_feed(self, service_category, location, build):
+        """Return the cached rows for a feed, calling ``build()`` on a miss."""
+        key = self.feed_key(service_category, location)
+        entry = self.feeds.get(key)
+        if entry is not None:
+            return entry[0]
+        generation = self.generation
+        with primary():
+            rows = tuple(build())
+        return self._store_feed(key, generation, rows)
+
+    async def aget_feed(self, service_category, location, build):
+        """``get_feed()`` for async views: ``build`` is a coroutine function."""
+        key = self.feed_key(service_category, location)
+        entry = self.feeds.get(key)
+        if entry is not None:
+            return entry[0]
+        generation = self.generation
+        with primary():
+            rows = await build()
+        return self._store_feed(key, generation, rows)
+
+    def get_applied(self, user_id, build):
+        key = str(user_id)
+        applied = self.applied.get(key)
+        if applied is not None:
+            return applied
+        generation = self.generation
+        with primary():
+            job_ids = list(build())
+        return self._store_applied(key, generation, job_ids)
+
+    async def aget_applied(self, user_id, build):
+        key = str(user_id)
+        applied = self.applied.get(key)
+        if applied is not None:
+            return applied
+        generation = self.generation
+        with primary():
+            job_ids = await build()
+        return self._store_applied(key, generation, job_ids)
+
+    def _store_feed(self, key, generation, rows):
+        rows = tuple(rows)
+        with self._lock:
+            # A write landed while we were querying; serve but don't keep it
+            if generation == self.generation:
+                self.feeds.set(key, (rows, frozenset(row["id"] for row in rows)))
+        return rows
+
+    def _store_applied(self, key, generation, job_ids):
+        applied = frozenset(str(job_id) for job_id in job_ids)
+        with self._lock:
+            if generation == self.generation:
+                self.applied.set(key, applied)
+        return applied
+
+    def invalidate_jobs(self, jobs):
+        stale = set()
+        feeds = [(key, self.feeds.peek(key)) for key in self.feeds.keys()]
+        for job in jobs:
+            job_id = str(job.pk)
+            category, location = self.feed_key(job.service_category_id, job.location)
+            for key, entry in feeds:
+                if entry is not None and job_id in entry[1]:
+                    stale.add(key)
+                elif key[0] in (None, category) and key[1] in (None, location):
+                    stale.add(key)
+        with self._lock:
+            self.generation += 1
+            self.feeds.discard(stale)
+
+    def invalidate_workers(self, user_ids):
+        with self._lock:
+            self.generation += 1
+            self.applied.discard(str(user_id) for user_id in user_ids)
+
+    def clear(self):
+        with self._lock:
+            self.generation += 1
+            self.feeds.clear()
+            self.applied.clear()
+
+
+job_feeds = JobFeedCache(
+    max_rows=settings.JOB_FEED_CACHE_MAX_ROWS, ttl=settings.JOB_FEED_CACHE_TTL
+)
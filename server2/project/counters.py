@@ -0,0 +1,95 @@
+from collections import Counter
+
+from django.db import transaction
+from django.db.models import Count, F, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+from django.db.transaction import TransactionManagementError
+
+from .models import Application, Job, JobAcceptance, ServiceCategory, User
+
+# Denormalized counters, updated with F() expressions in the same transaction
+# as the change they count so concurrent writers never lose an increment:
+#
+#   User.works                  completed jobs the worker was assigned to
+#   Job.applicant_count         Application rows for the job
+#   ServiceCategory.open_job_count   jobs in the category not yet completed
+#
+# Writes that bypass these helpers (the admin, manual SQL) can leave them
+# off; ``manage.py reconcile_counters`` recomputes all three.
+
+
+def _require_transaction():
+    if not transaction.get_connection().in_atomic_block:
+        raise TransactionManagementError(
+            "Counters must be updated in the transaction that changes the rows"
+        )
+
+
+def add_works(user_id, delta=1):
+    _require_transaction()
+    User.objects.filter(pk=user_id).update(works=F("works") + delta)
+
+
+def add_applicants(job_ids, delta=1):
+    _require_transaction()
+    Job.objects.filter(pk__in=list(job_ids)).update(
+        applicant_count=F("applicant_count") + delta
+    )
+
+
+def add_open_jobs(category_ids, delta=1):
+    """Add ``delta`` to each category once per occurrence in ``category_ids``."""
+    _require_transaction()
+    by_amount = {}
+    for category_id, count in Counter(category_ids).items():
+        if category_id is not None:
+            by_amount.setdefault(count * delta, []).append(category_id)
+    # One UPDATE per distinct amount, usually just one
+    for amount, ids in by_amount.items():
+        ServiceCategory.objects.filter(pk__in=ids).update(
+            open_job_count=F("open_job_count") + amount
+        )
+
+
+def _count(queryset, field, distinct=None):
+    """
+    Correlated ``COUNT(*)`` of ``queryset`` rows whose ``field`` is the outer
+    pk, or of distinct ``distinct`` values among them.
+    """
+    total = Count(distinct, distinct=True) if distinct else Count("*")
+    counts = (
+        queryset.filter(**{field: OuterRef("pk")})
+        .order_by()
+        .values(field)
+        .annotate(total=total)
+        .values("total")
+    )
+    return Coalesce(Subquery(counts), Value(0), output_field=IntegerField())
+
+
+def reconcile():
+    """
+    Recompute every counter with one set-based UPDATE per table, touching only
+    the rows that are off. Returns the number of rows fixed per counter.
+    """
+    fixed = {}
+    with transaction.atomic():
+        # The rows JobCompleteView counts: completed jobs the worker was
+        # assigned through
+        works = _count(
+            JobAcceptance.objects.filter(job__is_completed=True),
+            "assigned_to",
+            distinct="job",
+        )
+        fixed["works"] = User.objects.exclude(works=works).update(works=works)
+
+        applicants = _count(Application.objects.all(), "job")
+        fixed["applicant_count"] = Job.objects.exclude(
+            applicant_count=applicants
+        ).update(applicant_count=applicants)
+
+        open_jobs = _count(Job.objects.filter(is_completed=False), "service_category")
+        fixed["open_job_count"] = ServiceCategory.objects.exclude(
+            open_job_count=open_jobs
+        ).update(open_job_count=open_jobs)
+    return fixed
@@ -0,0 +1,79 @@
+"""
+In-process pub/sub of newly posted jobs, for the server-sent events endpoint
+in async_views.py. Job creation publishes on commit (see signals.py and
+bulk.create_jobs); each subscriber is an ``asyncio.Queue`` on the event loop
+of the connection that opened it.
+
+Only jobs created in the same process reach its subscribers, so the endpoint
+should be served by the process(es) that also serve job creation, e.g. a
+single ASGI process, or clients catch up through ``Last-Event-ID`` when they
+reconnect.
+"""
+
+import asyncio
+import threading
+
+from .serializers import JobSerializer
+
+# Events held per subscriber; a client this far behind is disconnected and
+# catches up from the database when it reconnects
+QUEUE_SIZE = 100
+
+
+class Subscription:
+    def __init__(self, service_category=None, pincode=None):
+        self.service_category = service_category
+        self.pincode = pincode
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(maxsize=QUEUE_SIZE)
+        self.overflowed = False
+
+    def matches(self, row):
+        return (
+            self.service_category is None
+            or str(row["service_category"]) == self.service_category
+        ) and (self.pincode is None or row["pincode"] == self.pincode)
+
+    def deliver(self, row):
+        # Runs on the subscriber's event loop
+        try:
+            self.queue.put_nowait(row)
+        except asyncio.QueueFull:
+            self.overflowed = True
+
+
+class JobBroker:
+    def __init__(self):
+        self._subscriptions = set()
+        self._lock = threading.Lock()
+
+    def subscribe(self, service_category=None, pincode=None):
+        subscription = Subscription(service_category, pincode)
+        with self._lock:
+            self._subscriptions.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            self._subscriptions.discard(subscription)
+
+    def publish(self, jobs):
+        """Send ``jobs`` to every matching subscriber; safe from any thread."""
+        with self._lock:
+            subscriptions = list(self._subscriptions)
+        if not subscriptions:
+            return
+        rows = JobSerializer(jobs, many=True).data
+        for subscription in subscriptions:
+            for row in rows:
+                if not subscription.matches(row):
+                    continue
+                try:
+                    subscription.loop.call_soon_threadsafe(subscription.deliver, row)
+                except RuntimeError:
+                    # Its event loop is gone
+                    self.unsubscribe(subscription)
+                    break
+
+
+new_jobs = JobBroker()
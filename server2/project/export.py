@@ -0,0 +1,130 @@
+import csv
+import io
+import zlib
+
+from .models import Application, Complaint, Job, User
+from .streaming import CHUNK_SIZE, dumps
+
+
+def export_users():
+    return User.objects.order_by("id").values(
+        "id",
+        "full_name",
+        "email",
+        "user_type",
+        "mobile_number",
+        "address",
+        "city",
+        "state",
+        "pincode",
+        "is_worker",
+        "is_verified",
+        "is_admin",
+        "experience",
+        "service_category_id",
+        "hourly_rate",
+        "works",
+        "qualification_certificate",
+    )
+
+
+def export_jobs():
+    return Job.objects.order_by("created_at", "id").values(
+        "id",
+        "title",
+        "description",
+        "user_id",
+        "deadline",
+        "created_at",
+        "service_category_id",
+        "assigned_to_id",
+        "is_completed",
+        "budget",
+        "location",
+        "pincode",
+        "image",
+    )
+
+
+def export_applications():
+    # Application, not the JobAcceptance.job_seekers rows: accepting an
+    # applicant removes them from job_seekers
+    return Application.objects.order_by("created_at", "id").values(
+        "id", "created_at", "job_id", "worker_id", "status"
+    )
+
+
+def export_complaints():
+    return Complaint.objects.order_by("created_at", "id").values(
+        "id", "user_id", "title", "details", "created_at"
+    )
+
+
+# entity -> (queryset factory, field ``since`` filters on, or None)
+EXPORTS = {
+    "users": (export_users, None),
+    "jobs": (export_jobs, "created_at"),
+    "applications": (export_applications, "created_at"),
+    "complaints": (export_complaints, "created_at"),
+}
+
+
+def ndjson_rows(rows):
+    for row in rows:
+        yield dumps(row) + b"\n"
+
+
+def csv_rows(rows, fields):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(fields)
+    for row in rows:
+        writer.writerow(
+            "" if row[field] is None else _csv_value(row[field]) for field in fields
+        )
+        # Flush roughly every 64 KB so chunks stay a sensible size
+        if buffer.tell() > 65536:
+            yield buffer.getvalue().encode()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue().encode()
+
+
+def _csv_value(value):
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return value
+
+
+def batched(chunks, size=65536):
+    """Coalesce small byte chunks into writes of at least ``size`` bytes."""
+    batch = []
+    length = 0
+    for chunk in chunks:
+        batch.append(chunk)
+        length += len(chunk)
+        if length >= size:
+            yield b"".join(batch)
+            batch = []
+            length = 0
+    if batch:
+        yield b"".join(batch)
+
+
+def gzipped(chunks):
+    compressor = zlib.compressobj(6, zlib.DEFLATED, zlib.MAX_WBITS | 16)
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+def export_stream(queryset, output, gzip=False):
+    rows = queryset.iterator(chunk_size=CHUNK_SIZE)
+    if output == "csv":
+        fields = [*queryset.query.values_select, *queryset.query.annotation_select]
+        chunks = csv_rows(rows, fields)
+    else:
+        chunks = batched(ndjson_rows(rows))
+    return gzipped(chunks) if gzip else chunks
@@ -0,0 +1,71 @@
+import math
+
+from .models import PincodeLocation
+
+EARTH_RADIUS_KM = 6371.0
+KM_PER_DEGREE = 111.32
+
+# Jobs are bucketed into a fixed lat/lon grid of roughly 11 km cells. A radius
+# query only reads the cells overlapping its bounding box.
+CELL_SIZE_DEG = 0.1
+CELL_COLUMNS = 10000
+MAX_RADIUS_KM = 100
+
+
+def cell_index(latitude, longitude):
+    row = math.floor((latitude + 90) / CELL_SIZE_DEG)
+    column = math.floor((longitude + 180) / CELL_SIZE_DEG)
+    return row, column
+
+
+def cell_key(latitude, longitude):
+    row, column = cell_index(latitude, longitude)
+    return row * CELL_COLUMNS + column
+
+
+def cells_within(latitude, longitude, radius_km):
+    """Every grid cell key overlapping the bounding box of the radius."""
+    lat_delta = radius_km / KM_PER_DEGREE
+    cos_lat = max(math.cos(math.radians(latitude)), 0.01)
+    lon_delta = radius_km / (KM_PER_DEGREE * cos_lat)
+
+    min_row, min_column = cell_index(latitude - lat_delta, longitude - lon_delta)
+    max_row, max_column = cell_index(latitude + lat_delta, longitude + lon_delta)
+    return [
+        row * CELL_COLUMNS + column
+        for row in range(min_row, max_row + 1)
+        for column in range(min_column, max_column + 1)
+    ]
+
+
+def distance_km(lat1, lon1, lat2, lon2):
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    d_phi = phi2 - phi1
+    d_lambda = math.radians(lon2 - lon1)
+    a = (
+        math.sin(d_phi / 2) ** 2
+        + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
+
+
+def lookup_pincode(pincode):
+    if not pincode:
+        return None
+    return PincodeLocation.objects.filter(pincode=pincode.strip()).first()
+
+
+def set_job_coordinates(job, location):
+    if location is None:
+        job.latitude = job.longitude = job.geo_cell = None
+    else:
+        job.latitude = location.latitude
+        job.longitude = location.longitude
+        job.geo_cell = cell_key(location.latitude, location.longitude)
+
+
+def locate_job(job):
+    """Fill a job's coordinates from its pincode, falling back to the poster's."""
+    if not job.pincode and job.user_id:
+        job.pincode = job.user.pincode
+    set_job_coordinates(job, lookup_pincode(job.pincode))
@@ -0,0 +1,61 @@
+from django.utils import timezone
+
+from .models import CompletedJobSummary, Job, User
+from .tasks import task
+
+
+@task()
+def record_completion(job_id, worker_id=None, completed_at=None):
+    """
+    Write (or refresh) the history row for a job that was just completed.
+    Queued by JobCompleteView, so it reads the job and worker as committed.
+    """
+    job = Job.objects.select_related("user", "service_category").get(pk=job_id)
+    worker = User.objects.get(pk=worker_id) if worker_id else None
+    category = job.service_category
+    CompletedJobSummary.objects.update_or_create(
+        job=job,
+        defaults={
+            "title": job.title,
+            "description": job.description,
+            "budget": job.budget,
+            "location": job.location,
+            "service_category_name": category.name if category else None,
+            "creator_id": job.user.id,
+            "creator_name": job.user.full_name,
+            "creator_email": job.user.email,
+            "worker_id": worker.id if worker else None,
+            "worker_name": worker.full_name if worker else None,
+            "worker_email": worker.email if worker else None,
+            "created_at": job.created_at,
+            "completed_at": completed_at or timezone.now(),
+        },
+    )
+
+
+def summary_data(summary):
+    """The CompletedJobsView item shape, built from a summary row."""
+    return {
+        "id": str(summary.job_id),
+        "title": summary.title,
+        "description": summary.description,
+        "budget": str(summary.budget),
+        "location": summary.location,
+        "created_at": summary.created_at,
+        "completed_at": summary.completed_at,
+        "service_category": summary.service_category_name,
+        "creator": {
+            "id": str(summary.creator_id),
+            "name": summary.creator_name,
+            "email": summary.creator_email,
+        },
+        "assigned_to": (
+            {
+                "id": str(summary.worker_id),
+                "name": summary.worker_name,
+                "email": summary.worker_email,
+            }
+            if summary.worker_id
+            else None
+        ),
+    }
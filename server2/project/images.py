@@ -0,0 +1,105 @@
+"""
+Resized WebP variants of job images. The feed shows jobs as small cards, so
+it links ``image_thumb``/``image_medium`` rather than the full-size upload.
+Variants are made by a background task (see tasks.py) once the job's
+transaction commits and stored in a directory of the job's own, e.g.
+``job_images/variants/<job id>/sink_thumb.webp``.
+"""
+
+import io
+import posixpath
+
+from django.core.files.base import ContentFile
+from PIL import Image, ImageOps
+
+from . import cache
+from .models import Job
+from .tasks import task
+
+# Longest side in pixels; images are only ever scaled down
+VARIANTS = {"thumb": 320, "medium": 960}
+WEBP_QUALITY = 80
+# Uploads can't have a directory in their name, so nothing but variants is
+# ever stored under here
+VARIANT_DIR = "job_images/variants"
+
+
+def variant_dir(job_id):
+    return f"{VARIANT_DIR}/{job_id}/"
+
+
+def variant_name(job_id, name, variant):
+    stem, _ = posixpath.splitext(posixpath.basename(name))
+    return f"{variant_dir(job_id)}{stem}_{variant}.webp"
+
+
+def needs_variants(job):
+    return bool(job.image) and job.image_thumb.name != variant_name(
+        job.pk, job.image.name, "thumb"
+    )
+
+
+def schedule_variants(job):
+    """Queue the variants to be made once the current transaction commits."""
+    if needs_variants(job):
+        make_variants.enqueue(job_id=str(job.pk), name=job.image.name)
+
+
+def render(image, longest_side):
+    variant = image.copy()
+    variant.thumbnail((longest_side, longest_side), Image.Resampling.LANCZOS)
+    if variant.mode not in ("RGB", "RGBA"):
+        variant = variant.convert("RGBA" if "transparency" in variant.info else "RGB")
+    out = io.BytesIO()
+    variant.save(out, "WEBP", quality=WEBP_QUALITY, method=4)
+    return out.getvalue()
+
+
+@task()
+def make_variants(job_id, name):
+    """
+    Write every variant of the image ``name`` and point the job at them.
+    Returns False if the job is gone or its image changed in the meantime.
+    """
+    job = (
+        Job.objects.filter(pk=job_id)
+        .only(
+            "id",
+            "image",
+            "image_thumb",
+            "image_medium",
+            "service_category_id",
+            "location",
+        )
+        .first()
+    )
+    if job is None or job.image.name != name:
+        return False
+
+    storage = job.image.storage
+    with storage.open(name) as original:
+        image = ImageOps.exif_transpose(Image.open(original))
+        image.load()
+
+    names = {}
+    for variant, longest_side in VARIANTS.items():
+        target = variant_name(job.pk, name, variant)
+        # Same name every time, so a rerun replaces the file in place; the
+        # directory belongs to this job, so nothing else can be overwritten
+        if storage.exists(target):
+            storage.delete(target)
+        names[f"image_{variant}"] = storage.save(
+            target, ContentFile(render(image, longest_side))
+        )
+
+    if not Job.objects.filter(pk=job_id, image=name).update(**names):
+        return False
+    # Variants of the job's previous image
+    for field, new_name in names.items():
+        old_name = getattr(job, field).name
+        if old_name and old_name != new_name:
+            if old_name.startswith(variant_dir(job.pk)):
+                storage.delete(old_name)
+    # update() skips the post_save signal that usually invalidates the feed
+    cache.job_feeds.invalidate_jobs([job])
+    return True
@@ -0,0 +1,62 @@
+import statistics
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = (
+        "Fire concurrent GET requests at a running server and report "
+        "throughput and latency per path. To compare the WSGI and ASGI "
+        "deployments, start both against the same database, e.g. "
+        "`gunicorn Quickfix.wsgi -w 1 --threads 16 -b :8001` and "
+        "`uvicorn Quickfix.asgi:application --port 8002`, then benchmark "
+        "/api/jobs/available/ on the first and /api/async/jobs/available/ "
+        "on the second."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("base_url", help="e.g. http://127.0.0.1:8000")
+        parser.add_argument("paths", nargs="+", help="paths with any query string")
+        parser.add_argument("--requests", type=int, default=500)
+        parser.add_argument("--concurrency", type=int, default=32)
+
+    def handle(self, *args, **options):
+        base_url = options["base_url"].rstrip("/")
+        self.stdout.write(
+            f"{'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'errors':>6}  path"
+        )
+        for path in options["paths"]:
+            rate, latencies, errors = self.run(
+                base_url + path, options["requests"], options["concurrency"]
+            )
+            p50, p95 = (
+                statistics.quantiles(latencies, n=20)[i] * 1000 for i in (9, 18)
+            )
+            self.stdout.write(
+                f"{rate:>8.1f} {p50:>8.1f} {p95:>8.1f} {errors:>6}  {path}"
+            )
+
+    def run(self, url, total, concurrency):
+        def fetch(_):
+            started = time.perf_counter()
+            try:
+                with urllib.request.urlopen(url, timeout=30) as response:
+                    response.read()
+                    ok = response.status < 400
+            except (urllib.error.URLError, OSError):
+                ok = False
+            return time.perf_counter() - started, ok
+
+        # Warm up the per-process caches before timing
+        fetch(None)
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            results = list(pool.map(fetch, range(total)))
+        elapsed = time.perf_counter() - started
+        latencies = [latency for latency, _ in results]
+        errors = sum(1 for _, ok in results if not ok)
+        return total / elapsed, latencies, errors
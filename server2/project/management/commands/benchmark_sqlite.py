@@ -0,0 +1,125 @@
+import random
+import sqlite3
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from project.db import pragma_statements
+
+FEED_QUERY = """
+    SELECT id, title, budget, location FROM project_job
+    WHERE is_completed = 0 ORDER BY created_at DESC, id DESC LIMIT 20
+"""
+
+
+class Command(BaseCommand):
+    help = (
+        "Run concurrent feed reads and counter-style read/write transactions "
+        "against two copies of the database, one with SQLite's defaults and "
+        "one with SQLITE_PRAGMAS and IMMEDIATE transactions, and compare "
+        "throughput and lock errors."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--readers", type=int, default=8)
+        parser.add_argument("--writers", type=int, default=4)
+        parser.add_argument("--seconds", type=float, default=5)
+
+    def handle(self, *args, **options):
+        if connection.vendor != "sqlite":
+            raise CommandError("This benchmark is for the SQLite backend")
+
+        with tempfile.TemporaryDirectory() as directory:
+            profiles = [
+                ("defaults", {}, "DEFERRED"),
+                ("tuned", settings.SQLITE_PRAGMAS, "IMMEDIATE"),
+            ]
+            self.stdout.write(
+                f"{'profile':<10} {'reads/s':>9} {'writes/s':>9} {'locked':>7}"
+            )
+            for name, pragmas, mode in profiles:
+                path = Path(directory) / f"{name}.sqlite3"
+                self.copy_database(path)
+                reads, writes, locked = self.run(path, pragmas, mode, options)
+                seconds = options["seconds"]
+                self.stdout.write(
+                    f"{name:<10} {reads / seconds:>9.0f} {writes / seconds:>9.0f} "
+                    f"{locked:>7}"
+                )
+
+    def copy_database(self, path):
+        connection.ensure_connection()
+        target = sqlite3.connect(path)
+        with target:
+            connection.connection.backup(target)
+        target.execute("PRAGMA journal_mode = delete")
+        target.close()
+
+    def connect(self, path, pragmas):
+        # Same lock wait as the Django connections (OPTIONS["timeout"])
+        db = sqlite3.connect(path, timeout=5, isolation_level=None)
+        for statement in pragma_statements(pragmas):
+            db.execute(statement)
+        return db
+
+    def run(self, path, pragmas, mode, options):
+        setup = self.connect(path, pragmas)
+        job_ids = [row[0] for row in setup.execute("SELECT id FROM project_job")]
+        setup.close()
+        if not job_ids:
+            raise CommandError("The database has no jobs to work with")
+
+        counts = {"reads": 0, "writes": 0, "locked": 0}
+        lock = threading.Lock()
+        deadline = time.monotonic() + options["seconds"]
+
+        def count(key):
+            with lock:
+                counts[key] += 1
+
+        def reader():
+            db = self.connect(path, pragmas)
+            while time.monotonic() < deadline:
+                try:
+                    db.execute(FEED_QUERY).fetchall()
+                    count("reads")
+                except sqlite3.OperationalError:
+                    count("locked")
+            db.close()
+
+        def writer():
+            # Read then write in one transaction, like apply or complete
+            db = self.connect(path, pragmas)
+            while time.monotonic() < deadline:
+                job_id = random.choice(job_ids)
+                try:
+                    db.execute(f"BEGIN {mode}")
+                    db.execute(
+                        "SELECT applicant_count FROM project_job WHERE id = ?",
+                        (job_id,),
+                    ).fetchone()
+                    db.execute(
+                        "UPDATE project_job SET applicant_count = applicant_count + 1 "
+                        "WHERE id = ?",
+                        (job_id,),
+                    )
+                    db.execute("COMMIT")
+                    count("writes")
+                except sqlite3.OperationalError:
+                    if db.in_transaction:
+                        db.execute("ROLLBACK")
+                    count("locked")
+            db.close()
+
+        threads = [threading.Thread(target=reader) for _ in range(options["readers"])]
+        threads += [threading.Thread(target=writer) for _ in range(options["writers"])]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return counts["reads"], counts["writes"], counts["locked"]
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from project import uploads
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete chunked uploads that have had no new chunk for "
+        "UPLOAD_SESSION_MAX_AGE seconds, with their temp files. Run from cron."
+    )
+
+    def handle(self, *args, **options):
+        dropped = uploads.clear_stale()
+        self.stdout.write(self.style.SUCCESS(f"Dropped {dropped} stale uploads"))
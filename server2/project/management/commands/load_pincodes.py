@@ -0,0 +1,135 @@
+import csv
+import gzip
+import io
+import statistics
+import urllib.request
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from project import cache
+from project.geo import set_job_coordinates
+from project.models import Job, PincodeLocation
+
+DEFAULT_CSV = Path(__file__).resolve().parents[2] / "data" / "pincodes.csv"
+BATCH_SIZE = 1000
+COLUMNS = {"pincode", "latitude", "longitude"}
+
+
+class Command(BaseCommand):
+    help = (
+        "Load pincode coordinates from a CSV with pincode, latitude and "
+        "longitude columns (any case, other columns ignored) and locate jobs "
+        "that have no coordinates yet. The bundled file only covers a few "
+        "cities; for all of India load the India Post 'All India Pincode "
+        "Directory' CSV from data.gov.in. It lists every post office, so a "
+        "pincode's coordinates are the median of its offices', and offices "
+        "without coordinates (NA) are skipped."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "source",
+            nargs="?",
+            default=str(DEFAULT_CSV),
+            help="CSV file or http(s) URL; a .gz name is decompressed",
+        )
+
+    def handle(self, *args, **options):
+        with self.open(options["source"]) as f:
+            coordinates, skipped = self.read(f)
+
+        loaded = 0
+        with transaction.atomic():
+            batch = []
+            for pincode, (latitudes, longitudes) in coordinates.items():
+                batch.append(
+                    PincodeLocation(
+                        pincode=pincode,
+                        latitude=statistics.median(latitudes),
+                        longitude=statistics.median(longitudes),
+                    )
+                )
+                if len(batch) >= BATCH_SIZE:
+                    loaded += self.save_batch(batch)
+                    batch = []
+            loaded += self.save_batch(batch)
+
+        located = self.locate_jobs()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Loaded {loaded} pincodes ({skipped} rows without coordinates "
+                f"skipped), located {located} jobs"
+            )
+        )
+
+    def open(self, source):
+        if source.startswith(("http://", "https://")):
+            raw = urllib.request.urlopen(source)
+        else:
+            path = Path(source)
+            if not path.exists():
+                raise CommandError(f"{path} does not exist")
+            raw = path.open("rb")
+        if source.endswith(".gz"):
+            raw = gzip.open(raw)
+        return io.TextIOWrapper(raw, encoding="utf-8-sig", newline="")
+
+    def read(self, f):
+        """``{pincode: (latitudes, longitudes)}`` and the rows skipped."""
+        reader = csv.DictReader(f)
+        fields = {name.strip().lower(): name for name in reader.fieldnames or []}
+        missing = COLUMNS - set(fields)
+        if missing:
+            raise CommandError(f"Missing columns: {', '.join(sorted(missing))}")
+
+        coordinates = {}
+        skipped = 0
+        for row in reader:
+            pincode = (row[fields["pincode"]] or "").strip()
+            try:
+                latitude = float(row[fields["latitude"]])
+                longitude = float(row[fields["longitude"]])
+            except (TypeError, ValueError):
+                skipped += 1
+                continue
+            if not pincode or not (-90 <= latitude <= 90 and -180 <= longitude <= 180):
+                skipped += 1
+                continue
+            latitudes, longitudes = coordinates.setdefault(pincode, ([], []))
+            latitudes.append(latitude)
+            longitudes.append(longitude)
+        return coordinates, skipped
+
+    def save_batch(self, batch):
+        PincodeLocation.objects.bulk_create(
+            batch,
+            update_conflicts=True,
+            unique_fields=["pincode"],
+            update_fields=["latitude", "longitude"],
+        )
+        return len(batch)
+
+    def locate_jobs(self):
+        locations = {
+            location.pincode: location
+            for location in PincodeLocation.objects.all().iterator()
+        }
+        jobs = Job.objects.filter(latitude__isnull=True).select_related("user")
+        updated = []
+        for job in jobs.iterator(chunk_size=BATCH_SIZE):
+            location = locations.get(job.pincode or job.user.pincode)
+            if location is None:
+                continue
+            job.pincode = location.pincode
+            set_job_coordinates(job, location)
+            updated.append(job)
+        Job.objects.bulk_update(
+            updated,
+            ["pincode", "latitude", "longitude", "geo_cell"],
+            batch_size=BATCH_SIZE,
+        )
+        # bulk_update skips the signals that keep the feed cache fresh
+        cache.job_feeds.invalidate_jobs(updated)
+        return len(updated)
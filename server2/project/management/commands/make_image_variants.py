@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+
+from project.images import make_variants, needs_variants
+from project.models import Job
+
+
+class Command(BaseCommand):
+    help = (
+        "Make the thumbnail and medium WebP variants for every job image that "
+        "doesn't have them yet, e.g. images uploaded before variants existed."
+    )
+
+    def handle(self, *args, **options):
+        made = failed = 0
+        jobs = (
+            Job.objects.exclude(image="")
+            .exclude(image=None)
+            .only("id", "image", "image_thumb")
+        )
+        for job in jobs.iterator():
+            if not needs_variants(job):
+                continue
+            try:
+                made += make_variants(job.pk, job.image.name)
+            except Exception as e:
+                failed += 1
+                self.stderr.write(f"{job.image.name}: {e}")
+        self.stdout.write(
+            self.style.SUCCESS(f"Variants made for {made} jobs, {failed} failed")
+        )
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild the FTS5 job search index from project_job. Run after VACUUM, "
+        "which may renumber the rowids the index is keyed on."
+    )
+
+    def handle(self, *args, **options):
+        if connection.vendor != "sqlite":
+            raise CommandError("Job search is only available on SQLite")
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "INSERT INTO project_job_fts(project_job_fts) VALUES ('rebuild')"
+            )
+        self.stdout.write(self.style.SUCCESS("Job search index rebuilt"))
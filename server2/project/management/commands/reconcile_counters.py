@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from project import counters
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute User.works, Job.applicant_count and "
+        "ServiceCategory.open_job_count from the underlying rows, e.g. after "
+        "editing jobs or applications in the admin."
+    )
+
+    def handle(self, *args, **options):
+        fixed = counters.reconcile()
+        summary = ", ".join(f"{name}: {count}" for name, count in fixed.items())
+        self.stdout.write(self.style.SUCCESS(f"Rows corrected: {summary}"))
@@ -0,0 +1,64 @@
+import threading
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections, connections
+
+from project import tasks
+
+
+class Command(BaseCommand):
+    help = (
+        "Run queued background tasks: image variants, completed job history "
+        "rows and anything else registered with project.tasks.task. Retries "
+        "failed tasks with backoff and requeues tasks left running by a dead "
+        "worker."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--threads", type=int, default=2)
+        parser.add_argument(
+            "--poll", type=float, default=1.0, help="seconds to wait when idle"
+        )
+        parser.add_argument(
+            "--burst",
+            action="store_true",
+            help="exit once no task is due instead of waiting for more",
+        )
+
+    def handle(self, *args, **options):
+        self.stop = threading.Event()
+        self.stale_after = timedelta(seconds=settings.TASK_STALE_AFTER)
+        requeued = tasks.requeue_stale(self.stale_after)
+        if requeued:
+            self.stdout.write(f"Requeued {requeued} stale tasks")
+
+        threads = [
+            threading.Thread(target=self.work, args=(options,), daemon=True)
+            for _ in range(options["threads"])
+        ]
+        for thread in threads:
+            thread.start()
+        try:
+            for thread in threads:
+                while thread.is_alive():
+                    thread.join(timeout=1)
+        except KeyboardInterrupt:
+            self.stop.set()
+            self.stdout.write("Stopping after the running tasks")
+            for thread in threads:
+                thread.join()
+
+    def work(self, options):
+        try:
+            while not self.stop.is_set():
+                close_old_connections()
+                if tasks.run_next():
+                    continue
+                if options["burst"]:
+                    break
+                tasks.requeue_stale(self.stale_after)
+                self.stop.wait(options["poll"])
+        finally:
+            connections.close_all()
@@ -0,0 +1,50 @@
+import sqlite3
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from project.routers import PRIMARY, REPLICA
+
+
+class Command(BaseCommand):
+    help = (
+        "Copy the primary SQLite database onto the replica with the online "
+        "backup API. Readers of the replica wait (busy_timeout) while a copy "
+        "is written, then see the new snapshot."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--every",
+            type=float,
+            help="keep running, copying again every this many seconds",
+        )
+
+    def handle(self, *args, **options):
+        if REPLICA not in connections:
+            raise CommandError(
+                "No replica configured; set QUICKFIX_REPLICA_DB to its path"
+            )
+        primary = connections[PRIMARY]
+        if primary.vendor != "sqlite" or connections[REPLICA].vendor != "sqlite":
+            raise CommandError("sync_replica copies SQLite databases only")
+
+        while True:
+            started = time.monotonic()
+            self.sync(primary, connections[REPLICA].settings_dict["NAME"])
+            self.stdout.write(
+                f"Replica synced in {(time.monotonic() - started) * 1000:.0f} ms"
+            )
+            if not options["every"]:
+                break
+            time.sleep(options["every"])
+
+    def sync(self, primary, replica_path):
+        primary.ensure_connection()
+        target = sqlite3.connect(replica_path, timeout=30)
+        try:
+            # Copy in steps so the primary's writers aren't held up for long
+            primary.connection.backup(target, pages=1024)
+        finally:
+            target.close()
@@ -0,0 +1,120 @@
+"""
+Serving user uploads. Replaces ``django.conf.urls.static`` with a view that
+answers revalidation with a 304 from a cached content hash, honours single
+``Range`` requests and, when ``MEDIA_ACCEL`` is set, leaves the byte transfer
+to the front proxy (nginx ``X-Accel-Redirect`` or Apache/lighttpd
+``X-Sendfile``) so no Python worker is tied up streaming a file.
+"""
+
+import hashlib
+import mimetypes
+import re
+from pathlib import Path
+
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.utils._os import safe_join
+from django.utils.encoding import filepath_to_uri
+from django.utils.http import quote_etag
+
+from .cache import LRUCache
+
+READ_SIZE = 64 * 1024
+
+# Top-level media directories that may be served, and for how long clients
+# may cache them. Stored names are never reused (storage adds a suffix
+# instead of overwriting), so a URL's content doesn't change.
+CACHE_CONTROL = {
+    "job_images": "public, max-age=31536000, immutable",
+    "qualification_certificates": "private, max-age=86400",
+}
+
+RANGE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+# (name, mtime, size) -> ETag; an edited file gets a new key
+_etags = LRUCache(max_size=4096)
+
+
+class UnsatisfiableRange(ValueError):
+    pass
+
+
+def resolve(name):
+    """
+    The file behind a media URL path, or None if it isn't one that may be
+    served: outside MEDIA_ROOT, outside the directories in CACHE_CONTROL, or
+    missing.
+    """
+    parts = name.split("/")
+    if parts[0] not in CACHE_CONTROL or ".." in parts:
+        return None
+    try:
+        path = Path(safe_join(settings.MEDIA_ROOT, name))
+    except SuspiciousFileOperation:
+        return None
+    return path if path.is_file() else None
+
+
+def cache_control(name):
+    return CACHE_CONTROL[name.split("/", 1)[0]]
+
+
+def content_type(path):
+    content_type, _ = mimetypes.guess_type(path.name)
+    return content_type or "application/octet-stream"
+
+
+def etag(path, stat):
+    key = (str(path), stat.st_mtime_ns, stat.st_size)
+    value = _etags.get(key)
+    if value is None:
+        with open(path, "rb") as f:
+            digest = hashlib.file_digest(f, "sha256").hexdigest()
+        value = quote_etag(digest[:32])
+        _etags.set(key, value)
+    return value
+
+
+def parse_range(header, size):
+    """
+    ``(start, end)`` inclusive for a single byte range, or None to send the
+    whole file (no header, or one this doesn't handle, like several ranges).
+    Raises UnsatisfiableRange if the range starts past the end of the file.
+    """
+    match = RANGE.match(header or "")
+    if not match or match.group(1) == match.group(2) == "":
+        return None
+    first, last = match.groups()
+    if first == "":
+        # Suffix range: the last N bytes
+        length = int(last)
+        if length == 0 or size == 0:
+            raise UnsatisfiableRange
+        return max(size - length, 0), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start > end:
+        if last and int(last) < start:
+            return None
+        raise UnsatisfiableRange
+    return start, end
+
+
+def read_range(path, start, end):
+    with open(path, "rb") as f:
+        f.seek(start)
+        remaining = end - start + 1
+        while remaining > 0 and (chunk := f.read(min(READ_SIZE, remaining))):
+            remaining -= len(chunk)
+            yield chunk
+
+
+def accel_headers(name, path):
+    """Headers handing the transfer to the front proxy, per ``MEDIA_ACCEL``."""
+    accel = getattr(settings, "MEDIA_ACCEL", None)
+    if accel == "x-accel-redirect":
+        prefix = settings.MEDIA_ACCEL_PREFIX.rstrip("/")
+        return {"X-Accel-Redirect": f"{prefix}/{filepath_to_uri(name)}"}
+    if accel == "x-sendfile":
+        return {"X-Sendfile": str(path)}
+    return None
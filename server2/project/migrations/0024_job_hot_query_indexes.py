@@ -0,0 +1,37 @@
+# Generated by Django 5.2 on 2026-10-18 19:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('project', '0023_remove_job_job_acceptances'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(condition=models.Q(('is_completed', False)), fields=['-created_at', '-id'], name='job_open_recent_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(condition=models.Q(('is_completed', False)), fields=['service_category', 'location', '-created_at', '-id'], name='job_open_cat_loc_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(condition=models.Q(('is_completed', True)), fields=['-created_at'], name='job_completed_recent_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['user', '-created_at'], name='job_user_recent_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobacceptance',
+            index=models.Index(fields=['job', '-created_at'], name='jobacceptance_job_recent_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobacceptance',
+            index=models.Index(fields=['assigned_to', '-created_at'], name='jobacceptance_worker_idx'),
+        ),
+    ]
@@ -0,0 +1,63 @@
+from django.db import migrations
+
+# External-content FTS5 index over Job.title/description. The triggers keep it
+# in sync with every write to project_job, including bulk and raw SQL writes.
+CREATE_SQL = [
+    """
+    CREATE VIRTUAL TABLE project_job_fts USING fts5(
+        title, description,
+        content='project_job', content_rowid='rowid',
+        tokenize='porter unicode61'
+    )
+    """,
+    """
+    CREATE TRIGGER project_job_fts_ai AFTER INSERT ON project_job BEGIN
+        INSERT INTO project_job_fts(rowid, title, description)
+        VALUES (new.rowid, new.title, new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER project_job_fts_ad AFTER DELETE ON project_job BEGIN
+        INSERT INTO project_job_fts(project_job_fts, rowid, title, description)
+        VALUES ('delete', old.rowid, old.title, old.description);
+    END
+    """,
+    """
+    CREATE TRIGGER project_job_fts_au AFTER UPDATE OF title, description
+    ON project_job BEGIN
+        INSERT INTO project_job_fts(project_job_fts, rowid, title, description)
+        VALUES ('delete', old.rowid, old.title, old.description);
+        INSERT INTO project_job_fts(rowid, title, description)
+        VALUES (new.rowid, new.title, new.description);
+    END
+    """,
+    "INSERT INTO project_job_fts(project_job_fts) VALUES ('rebuild')",
+]
+
+DROP_SQL = [
+    "DROP TRIGGER IF EXISTS project_job_fts_ai",
+    "DROP TRIGGER IF EXISTS project_job_fts_ad",
+    "DROP TRIGGER IF EXISTS project_job_fts_au",
+    "DROP TABLE IF EXISTS project_job_fts",
+]
+
+
+def run(statements):
+    def apply(apps, schema_editor):
+        if schema_editor.connection.vendor != "sqlite":
+            return
+        for statement in statements:
+            schema_editor.execute(statement)
+
+    return apply
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("project", "0024_job_hot_query_indexes"),
+    ]
+
+    operations = [
+        migrations.RunPython(run(CREATE_SQL), run(DROP_SQL)),
+    ]
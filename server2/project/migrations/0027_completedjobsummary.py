@@ -0,0 +1,107 @@
+# Generated by Django 5.2 on 2026-10-18 19:34
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+def backfill_summaries(apps, schema_editor):
+    Job = apps.get_model("project", "Job")
+    JobAcceptance = apps.get_model("project", "JobAcceptance")
+    CompletedJobSummary = apps.get_model("project", "CompletedJobSummary")
+
+    workers = {}
+    for acceptance in (
+        JobAcceptance.objects.filter(
+            job__is_completed=True, assigned_to__isnull=False
+        )
+        .select_related("assigned_to")
+        .order_by("created_at")
+    ):
+        workers[acceptance.job_id] = acceptance.assigned_to
+
+    summaries = []
+    jobs = Job.objects.filter(is_completed=True).select_related(
+        "user", "service_category"
+    )
+    for job in jobs.iterator(chunk_size=1000):
+        worker = workers.get(job.id)
+        summaries.append(
+            CompletedJobSummary(
+                job=job,
+                title=job.title,
+                description=job.description,
+                budget=job.budget,
+                location=job.location,
+                service_category_name=(
+                    job.service_category.name if job.service_category else None
+                ),
+                creator_id=job.user.id,
+                creator_name=job.user.full_name,
+                creator_email=job.user.email,
+                worker_id=worker.id if worker else None,
+                worker_name=worker.full_name if worker else None,
+                worker_email=worker.email if worker else None,
+                created_at=job.created_at,
+            )
+        )
+    CompletedJobSummary.objects.bulk_create(summaries, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("project", "0026_job_geo_index"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CompletedJobSummary",
+            fields=[
+                (
+                    "job",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="completion_summary",
+                        serialize=False,
+                        to="project.job",
+                    ),
+                ),
+                ("title", models.CharField(max_length=200)),
+                ("description", models.TextField()),
+                ("budget", models.DecimalField(decimal_places=2, max_digits=10)),
+                ("location", models.CharField(max_length=200)),
+                (
+                    "service_category_name",
+                    models.CharField(blank=True, max_length=100, null=True),
+                ),
+                ("creator_id", models.UUIDField()),
+                ("creator_name", models.CharField(max_length=100)),
+                ("creator_email", models.EmailField(max_length=254)),
+                ("worker_id", models.UUIDField(blank=True, null=True)),
+                (
+                    "worker_name",
+                    models.CharField(blank=True, max_length=100, null=True),
+                ),
+                (
+                    "worker_email",
+                    models.EmailField(blank=True, max_length=254, null=True),
+                ),
+                ("created_at", models.DateTimeField()),
+                (
+                    "completed_at",
+                    models.DateTimeField(default=django.utils.timezone.now),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["-created_at", "-job"],
+                        name="completed_summary_recent_idx",
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(backfill_summaries, migrations.RunPython.noop),
+    ]
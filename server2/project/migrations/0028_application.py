@@ -0,0 +1,109 @@
+# Generated by Django 5.2 on 2026-10-18 19:41
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import OuterRef, Q, Subquery
+
+
+def backfill_applications(apps, schema_editor):
+    JobAcceptance = apps.get_model("project", "JobAcceptance")
+    Application = apps.get_model("project", "Application")
+    Through = JobAcceptance.job_seekers.through
+
+    # (job, worker) -> status, keeping the earliest application. Assigned
+    # workers were removed from job_seekers, so they come from assigned_to
+    # instead.
+    applications = {}
+    rows = Through.objects.order_by("jobacceptance__created_at").values_list(
+        "jobacceptance__job_id",
+        "user_id",
+        "jobacceptance__status",
+        "jobacceptance__assigned_to_id",
+    )
+    for job_id, worker_id, status, assigned_to_id in rows.iterator(chunk_size=1000):
+        # An assigned acceptance's status belongs to the assigned worker
+        if assigned_to_id is not None and assigned_to_id != worker_id:
+            status = "pending"
+        applications.setdefault((job_id, worker_id), status)
+    assigned = JobAcceptance.objects.filter(assigned_to__isnull=False).values_list(
+        "job_id", "assigned_to_id"
+    )
+    for job_id, worker_id in assigned.iterator(chunk_size=1000):
+        applications[(job_id, worker_id)] = "accepted"
+
+    Application.objects.bulk_create(
+        (
+            Application(job_id=job_id, worker_id=worker_id, status=status)
+            for (job_id, worker_id), status in applications.items()
+        ),
+        batch_size=1000,
+    )
+    # auto_now_add stamped every row with now; take the original timestamp
+    # from the earliest acceptance the worker applied through
+    first_applied = (
+        JobAcceptance.objects.filter(
+            Q(job_seekers=OuterRef("worker_id")) | Q(assigned_to=OuterRef("worker_id")),
+            job=OuterRef("job_id"),
+        )
+        .order_by("created_at")
+        .values("created_at")[:1]
+    )
+    Application.objects.update(created_at=Subquery(first_applied))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("project", "0027_completedjobsummary"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Application",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("status", models.CharField(default="pending", max_length=20)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "job",
+                    models.ForeignKey(
+                        db_index=False,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="applications",
+                        to="project.job",
+                    ),
+                ),
+                (
+                    "worker",
+                    models.ForeignKey(
+                        db_index=False,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="applications",
+                        to="project.user",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["-created_at"],
+                "indexes": [
+                    models.Index(
+                        fields=["job", "-created_at"], name="application_job_recent_idx"
+                    )
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("worker", "job"), name="application_worker_job_uniq"
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(backfill_applications, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,50 @@
+# Generated by Django 5.2 on 2026-10-18 19:43
+
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def count_of(queryset, field):
+    counts = (
+        queryset.filter(**{field: OuterRef("pk")})
+        .order_by()
+        .values(field)
+        .annotate(total=Count("*"))
+        .values("total")
+    )
+    return Coalesce(Subquery(counts), Value(0), output_field=IntegerField())
+
+
+def backfill_counters(apps, schema_editor):
+    Application = apps.get_model("project", "Application")
+    Job = apps.get_model("project", "Job")
+    ServiceCategory = apps.get_model("project", "ServiceCategory")
+
+    Job.objects.update(applicant_count=count_of(Application.objects.all(), "job"))
+    ServiceCategory.objects.update(
+        open_job_count=count_of(
+            Job.objects.filter(is_completed=False), "service_category"
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("project", "0028_application"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="job",
+            name="applicant_count",
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="servicecategory",
+            name="open_job_count",
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.2 on 2026-10-18 19:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("project", "0029_counters"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="job",
+            name="image_medium",
+            field=models.ImageField(
+                blank=True, default="", editable=False, upload_to=""
+            ),
+        ),
+        migrations.AddField(
+            model_name="job",
+            name="image_thumb",
+            field=models.ImageField(
+                blank=True, default="", editable=False, upload_to=""
+            ),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2 on 2026-10-18 20:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("project", "0033_export_indexes"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="job",
+            index=models.Index(
+                condition=models.Q(("is_completed", False)),
+                fields=["pincode", "-created_at", "-id"],
+                name="job_open_pincode_idx",
+            ),
+        ),
+    ]
@@ -7,6 +7,8 @@ from django.utils import timezone
 class ServiceCategory(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     name = models.CharField(max_length=100)
+    # Maintained by counters.py
+    open_job_count = models.IntegerField(default=0, editable=False)
 
     def __str__(self):
         return self.name
@@ -55,7 +57,7 @@ class User(models.Model):
     hourly_rate = models.DecimalField(
         max_digits=10, decimal_places=2, blank=True, null=True
     )
-    works = models.IntegerField(default=0)
+    works = models.IntegerField(default=0)  # Maintained by counters.py
     qualification_certificate = models.FileField(
         upload_to="qualification_certificates/", blank=True, null=True
     )
@@ -86,12 +88,69 @@ class Job(models.Model):
     budget = models.DecimalField(max_digits=10, decimal_places=2)
     location = models.CharField(max_length=200)
     image = models.ImageField(upload_to="job_images/", blank=True, null=True)
+    # Resized WebP copies of image, written in the background by images.py
+    image_thumb = models.ImageField(blank=True, default="", editable=False)
+    image_medium = models.ImageField(blank=True, default="", editable=False)
+    # Maintained by counters.py
+    applicant_count = models.IntegerField(default=0, editable=False)
+
+    # Resolved from pincode (or the poster's pincode) on save, see geo.py
+    pincode = models.CharField(max_length=10, blank=True, default="")
+    latitude = models.FloatField(null=True, blank=True, editable=False)
+    longitude = models.FloatField(null=True, blank=True, editable=False)
+    geo_cell = models.IntegerField(null=True, blank=True, editable=False)
+
+    class Meta:
+        indexes = [
+            # Worker feed: open jobs, newest first, optionally by category/location
+            models.Index(
+                fields=["-created_at", "-id"],
+                condition=models.Q(is_completed=False),
+                name="job_open_recent_idx",
+            ),
+            models.Index(
+                fields=["service_category", "location", "-created_at", "-id"],
+                condition=models.Q(is_completed=False),
+                name="job_open_cat_loc_idx",
+            ),
+            # Admin history of completed jobs
+            models.Index(
+                fields=["-created_at"],
+                condition=models.Q(is_completed=True),
+                name="job_completed_recent_idx",
+            ),
+            # Jobs posted by a client
+            models.Index(fields=["user", "-created_at"], name="job_user_recent_idx"),
+            # Nearby jobs for a pincode with no coordinates, matched exactly
+            models.Index(
+                fields=["pincode", "-created_at", "-id"],
+                condition=models.Q(is_completed=False),
+                name="job_open_pincode_idx",
+            ),
+            # Export in creation order, optionally from a date (export.py)
+            models.Index(fields=["created_at", "id"], name="job_created_idx"),
+            # Nearby open jobs, looked up grid cell by grid cell
+            models.Index(
+                fields=["geo_cell"],
+                condition=models.Q(is_completed=False),
+                name="job_open_geo_cell_idx",
+            ),
+        ]
 
     # Add any other fields you need
     def __str__(self):
         return str(self.title)
 
 
+class PincodeLocation(models.Model):
+    pincode = models.CharField(max_length=10, primary_key=True)
+    latitude = models.FloatField()
+    longitude = models.FloatField()
+
+    def __str__(self):
+        return f"{self.pincode} ({self.latitude}, {self.longitude})"
+
+
 class JobAcceptance(models.Model):
     job = models.ForeignKey(Job, related_name="acceptances", on_delete=models.CASCADE)
     job_seekers = models.ManyToManyField(User, related_name="job_applications")
@@ -109,11 +168,89 @@ class JobAcceptance(models.Model):
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            models.Index(
+                fields=["job", "-created_at"], name="jobacceptance_job_recent_idx"
+            ),
+            models.Index(
+                fields=["assigned_to", "-created_at"], name="jobacceptance_worker_idx"
+            ),
+        ]
 
     def __str__(self):
         return str(self.id)
 
 
+class Application(models.Model):
+    """One row per worker per job applied to."""
+
+    # The composite indexes below lead with these columns, so no separate
+    # single-column foreign key indexes
+    job = models.ForeignKey(
+        Job, related_name="applications", on_delete=models.CASCADE, db_index=False
+    )
+    worker = models.ForeignKey(
+        User, related_name="applications", on_delete=models.CASCADE, db_index=False
+    )
+    status = models.CharField(
+        max_length=20, default="pending"
+    )  # pending, accepted, rejected
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+        constraints = [
+            # Worker first: also answers "which jobs has this worker applied to"
+            models.UniqueConstraint(
+                fields=["worker", "job"], name="application_worker_job_uniq"
+            ),
+        ]
+        indexes = [
+            models.Index(
+                fields=["job", "-created_at"], name="application_job_recent_idx"
+            ),
+            # Export in creation order
+            models.Index(fields=["created_at", "id"], name="application_created_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.worker_id} -> {self.job_id} ({self.status})"
+
+
+class CompletedJobSummary(models.Model):
+    """Denormalized row per completed job, read by the admin history page."""
+
+    job = models.OneToOneField(
+        Job,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="completion_summary",
+    )
+    title = models.CharField(max_length=200)
+    description = models.TextField()
+    budget = models.DecimalField(max_digits=10, decimal_places=2)
+    location = models.CharField(max_length=200)
+    service_category_name = models.CharField(max_length=100, null=True, blank=True)
+    creator_id = models.UUIDField()
+    creator_name = models.CharField(max_length=100)
+    creator_email = models.EmailField()
+    worker_id = models.UUIDField(null=True, blank=True)
+    worker_name = models.CharField(max_length=100, null=True, blank=True)
+    worker_email = models.EmailField(null=True, blank=True)
+    created_at = models.DateTimeField()
+    completed_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["-created_at", "-job"], name="completed_summary_recent_idx"
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.title} (completed {self.completed_at:%Y-%m-%d})"
+
+
 class Complaint(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="complaints")
@@ -123,6 +260,10 @@ class Complaint(models.Model):
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            # Export in creation order; the admin list reads it backwards
+            models.Index(fields=["created_at", "id"], name="complaint_created_idx"),
+        ]
 
     def __str__(self):
         return f"{self.title} - {self.user.full_name}"
@@ -140,3 +281,66 @@ class AdminRegistrationCode(models.Model):
     class Meta:
         verbose_name = "Admin Registration Code"
         verbose_name_plural = "Admin Registration Codes"
+
+
+class UploadSession(models.Model):
+    """A chunked upload in progress, see uploads.py."""
+
+    TARGET_CHOICES = [
+        ("qualification_certificate", "Qualification certificate"),
+        ("job_image", "Job image"),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name="upload_sessions"
+    )
+    job = models.ForeignKey(Job, on_delete=models.CASCADE, null=True, blank=True)
+    target = models.CharField(max_length=30, choices=TARGET_CHOICES)
+    filename = models.CharField(max_length=255)
+    size = models.BigIntegerField()
+    sha256 = models.CharField(max_length=64)
+    # Bytes written to the temp file so far; the next chunk starts here
+    received = models.BigIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.filename} ({self.received}/{self.size})"
+
+
+class Task(models.Model):
+    """
+    A queued call of a function registered with ``tasks.task``. Deleted once
+    it succeeds; kept as "failed" after its last attempt fails.
+    """
+
+    STATUS_CHOICES = [
+        ("pending", "Pending"),
+        ("running", "Running"),
+        ("failed", "Failed"),
+    ]
+
+    name = models.CharField(max_length=200)
+    kwargs = models.JSONField(default=dict)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default="pending")
+    attempts = models.IntegerField(default=0)
+    max_attempts = models.IntegerField(default=5)
+    # Not run before this; pushed back after each failed attempt
+    run_at = models.DateTimeField(default=timezone.now)
+    started_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True, default="")
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            # Workers poll for the next due task
+            models.Index(
+                fields=["run_at", "id"],
+                condition=models.Q(status="pending"),
+                name="task_pending_due_idx",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.name} ({self.status})"
@@ -0,0 +1,123 @@
+import base64
+import binascii
+import datetime
+import json
+from operator import attrgetter
+
+from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+
+class InvalidPage(ValueError):
+    pass
+
+
+class CursorEncoder(DjangoJSONEncoder):
+    # DjangoJSONEncoder truncates datetimes to milliseconds, which would make
+    # the cursor skip rows created within the same millisecond.
+    def default(self, o):
+        if isinstance(o, datetime.datetime):
+            return o.isoformat()
+        return super().default(o)
+
+
+def parse_limit(value, default=DEFAULT_PAGE_SIZE, maximum=MAX_PAGE_SIZE):
+    if value in (None, ""):
+        return default
+    try:
+        limit = int(value)
+    except (TypeError, ValueError):
+        raise InvalidPage("limit must be an integer")
+    if limit < 1:
+        raise InvalidPage("limit must be positive")
+    return min(limit, maximum)
+
+
+def encode_cursor(values):
+    raw = json.dumps(values, cls=CursorEncoder, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor, size):
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise InvalidPage("Invalid cursor")
+    if not isinstance(values, list) or len(values) != size:
+        raise InvalidPage("Invalid cursor")
+    return values
+
+
+def _cursor_values(queryset, fields, cursor):
+    """The cursor's values converted to the types of the ordering fields."""
+    values = decode_cursor(cursor, len(fields))
+    # resolve_ref() may add joins, so resolve on a copy of the query
+    query = queryset.query.clone()
+    try:
+        values = [
+            query.resolve_ref(field).output_field.to_python(value)
+            for field, value in zip(fields, values)
+        ]
+    except (TypeError, ValueError, ValidationError):
+        raise InvalidPage("Invalid cursor")
+    if None in values:
+        raise InvalidPage("Invalid cursor")
+    return values
+
+
+def _row_value(row, field):
+    if isinstance(row, dict):
+        return row[field]
+    return attrgetter(field.replace("__", "."))(row)
+
+
+def keyset_page(queryset, ordering, cursor=None, limit=DEFAULT_PAGE_SIZE):
+    """
+    Return ``(rows, next_cursor)`` for one page of ``queryset`` ordered by
+    ``ordering``. The last field must be unique so the ordering is total;
+    the cursor holds that row's sort key, so a page costs one index range
+    scan no matter how deep it is.
+    """
+    page = _page_queryset(queryset, ordering, cursor, limit)
+    return _split_page(list(page), ordering, limit)
+
+
+async def akeyset_page(queryset, ordering, cursor=None, limit=DEFAULT_PAGE_SIZE):
+    """``keyset_page()`` for async views."""
+    page = _page_queryset(queryset, ordering, cursor, limit)
+    return _split_page([row async for row in page], ordering, limit)
+
+
+def _page_queryset(queryset, ordering, cursor, limit):
+    fields = [name.lstrip("-") for name in ordering]
+    queryset = queryset.order_by(*ordering)
+
+    if cursor:
+        values = _cursor_values(queryset, fields, cursor)
+        after = Q()
+        for i, name in enumerate(ordering):
+            lookup = "lt" if name.startswith("-") else "gt"
+            term = Q(**{f"{fields[i]}__{lookup}": values[i]})
+            for prev in range(i):
+                term &= Q(**{fields[prev]: values[prev]})
+            after |= term
+        # Implied by the OR, but it gives the database a range on the leading
+        # sort column to seek to, instead of walking every row before the cursor
+        bound = "lte" if ordering[0].startswith("-") else "gte"
+        queryset = queryset.filter(Q(**{f"{fields[0]}__{bound}": values[0]}), after)
+
+    return queryset[: limit + 1]
+
+
+def _split_page(rows, ordering, limit):
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        fields = [name.lstrip("-") for name in ordering]
+        next_cursor = encode_cursor([_row_value(rows[-1], f) for f in fields])
+    return rows, next_cursor
@@ -0,0 +1,63 @@
+import csv
+import json
+
+from django.conf import settings
+from rest_framework.parsers import BaseParser
+
+
+def _encoding(parser_context):
+    return (parser_context or {}).get("encoding", settings.DEFAULT_CHARSET)
+
+
+def _lines(stream, parser_context):
+    # Decoded a line at a time, so rows before an undecodable line are read
+    encoding = _encoding(parser_context)
+    return (line.decode(encoding) for line in stream)
+
+
+class NDJSONParser(BaseParser):
+    """
+    Parses newline-delimited JSON into a lazy iterator of rows, so the body is
+    read as the view consumes it. A line that isn't a JSON object is yielded
+    as a ``ValueError`` for the view to report against that row, and so is
+    one that can't be decoded.
+    """
+
+    media_type = "application/x-ndjson"
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        return self._rows(stream, _encoding(parser_context))
+
+    def _rows(self, lines, encoding):
+        # Decoded line by line so one bad byte only costs its own row
+        for raw in lines:
+            try:
+                line = raw.decode(encoding).strip()
+            except UnicodeDecodeError as e:
+                yield ValueError(f"Invalid {encoding}: {e}")
+                continue
+            if not line:
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError as e:
+                yield ValueError(f"Invalid JSON: {e}")
+                continue
+            if isinstance(row, dict):
+                yield row
+            else:
+                yield ValueError("Each line must be a JSON object")
+
+
+class CSVParser(BaseParser):
+    """Parses CSV with a header row into a lazy iterator of row dicts."""
+
+    media_type = "text/csv"
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        return self._rows(_lines(stream, parser_context))
+
+    def _rows(self, lines):
+        for row in csv.DictReader(lines):
+            # Empty cells mean "not given", as with a missing NDJSON key
+            yield {key: value for key, value in row.items() if value not in ("", None)}
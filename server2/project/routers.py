@@ -0,0 +1,112 @@
+from contextlib import contextmanager
+from contextvars import ContextVar, copy_context
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.db import connections
+from django.http import FileResponse
+
+PRIMARY = "default"
+REPLICA = "replica"
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+# Only set for GET/HEAD/OPTIONS requests, so management commands, migrations
+# and the shell always read the primary
+_use_replica = ContextVar("use_replica", default=False)
+
+
+def pin_to_primary():
+    """Send every later read in this request to the primary."""
+    _use_replica.set(False)
+
+
+@contextmanager
+def primary():
+    token = _use_replica.set(False)
+    try:
+        yield
+    finally:
+        _use_replica.reset(token)
+
+
+class PrimaryReplicaRouter:
+    """
+    Reads in a GET request go to the replica until the request writes
+    something; from then on they go to the primary, so a request always sees
+    its own writes. Enabled by settings when a replica database is configured.
+    """
+
+    def db_for_read(self, model, **hints):
+        if _use_replica.get() and not self._replica_is_primary():
+            return REPLICA
+        return PRIMARY
+
+    def db_for_write(self, model, **hints):
+        pin_to_primary()
+        return PRIMARY
+
+    @staticmethod
+    def _replica_is_primary():
+        # e.g. under the test runner, where the replica mirrors the primary's
+        # test database but as a separate connection outside its transaction
+        return (
+            connections[REPLICA].settings_dict["NAME"]
+            == connections[PRIMARY].settings_dict["NAME"]
+        )
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # The replica is a copy of the primary made by sync_replica
+        return db == PRIMARY
+
+
+class ReplicaRoutingMiddleware:
+    """Lets GET/HEAD/OPTIONS requests read from the replica."""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        token = _use_replica.set(request.method in SAFE_METHODS)
+        try:
+            return self.keep_routing(self.get_response(request))
+        finally:
+            _use_replica.reset(token)
+
+    async def __acall__(self, request):
+        token = _use_replica.set(request.method in SAFE_METHODS)
+        try:
+            return self.keep_routing(await self.get_response(request))
+        finally:
+            _use_replica.reset(token)
+
+    @staticmethod
+    def keep_routing(response):
+        # A streamed body runs its queries after this middleware has returned;
+        # run it in the request's context so they are routed the same way
+        # Files make no queries, and wrapping them would lose sendfile
+        if (
+            response.streaming
+            and not response.is_async
+            and not isinstance(response, FileResponse)
+        ):
+            context = copy_context()
+            chunks = iter(response.streaming_content)
+            response.streaming_content = _run_in(context, chunks)
+        return response
+
+
+def _run_in(context, chunks):
+    while True:
+        try:
+            yield context.run(next, chunks)
+        except StopIteration:
+            return
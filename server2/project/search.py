@@ -0,0 +1,127 @@
+import re
+import uuid
+
+from django.db import connection, connections
+
+from .models import Job
+from .pagination import DEFAULT_PAGE_SIZE, InvalidPage, decode_cursor, encode_cursor
+
+TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+TRIGGERS = {
+    "project_job_fts_ai": """
+        CREATE TRIGGER project_job_fts_ai AFTER INSERT ON project_job BEGIN
+            INSERT INTO project_job_fts(rowid, title, description)
+            VALUES (new.rowid, new.title, new.description);
+        END
+    """,
+    "project_job_fts_ad": """
+        CREATE TRIGGER project_job_fts_ad AFTER DELETE ON project_job BEGIN
+            INSERT INTO project_job_fts(project_job_fts, rowid, title, description)
+            VALUES ('delete', old.rowid, old.title, old.description);
+        END
+    """,
+    "project_job_fts_au": """
+        CREATE TRIGGER project_job_fts_au AFTER UPDATE OF title, description
+        ON project_job BEGIN
+            INSERT INTO project_job_fts(project_job_fts, rowid, title, description)
+            VALUES ('delete', old.rowid, old.title, old.description);
+            INSERT INTO project_job_fts(rowid, title, description)
+            VALUES (new.rowid, new.title, new.description);
+        END
+    """,
+}
+
+
+def ensure_search_index(using="default"):
+    """
+    Restore the sync triggers and rebuild the index if they are missing.
+
+    SQLite migrations that alter project_job rebuild the table, which drops
+    its triggers and renumbers the rowids the index points at, so this runs
+    after every migrate. Returns True when the index was rebuilt.
+    """
+    db = connections[using]
+    if db.vendor != "sqlite":
+        return False
+    with db.cursor() as cursor:
+        cursor.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'trigger' AND name IN "
+            "('project_job_fts_ai', 'project_job_fts_ad', 'project_job_fts_au')"
+        )
+        if len(cursor.fetchall()) == len(TRIGGERS):
+            return False
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE name = 'project_job_fts'")
+        if cursor.fetchone() is None:
+            # The search migration has not been applied yet
+            return False
+        for name, statement in TRIGGERS.items():
+            cursor.execute(f"DROP TRIGGER IF EXISTS {name}")
+            cursor.execute(statement)
+        cursor.execute(
+            "INSERT INTO project_job_fts(project_job_fts) VALUES ('rebuild')"
+        )
+    return True
+
+
+def build_match_query(text):
+    """
+    Turn free text into an FTS5 query: every word must match, the last one
+    as a prefix so results keep up while the user is typing. Words are
+    quoted so FTS5 operators in user input are treated as plain text.
+    """
+    tokens = TOKEN_RE.findall(text or "")
+    if not tokens:
+        return None
+    terms = [f'"{token}"' for token in tokens]
+    terms[-1] += "*"
+    return " ".join(terms)
+
+
+def search_jobs(
+    text,
+    service_category=None,
+    is_completed=False,
+    cursor=None,
+    limit=DEFAULT_PAGE_SIZE,
+):
+    """
+    Return ``(jobs, next_cursor)`` for jobs matching ``text``, best BM25 rank
+    first. Pages are keyed on (rank, rowid) so paging never re-runs OFFSET.
+    """
+    match = build_match_query(text)
+    if match is None:
+        return [], None
+
+    sql = [
+        "SELECT j.id, f.rank, f.rowid FROM project_job_fts f",
+        "JOIN project_job j ON j.rowid = f.rowid",
+        "WHERE project_job_fts MATCH %s AND j.is_completed = %s",
+    ]
+    params = [match, is_completed]
+    if service_category:
+        sql.append("AND j.service_category_id = %s")
+        params.append(uuid.UUID(str(service_category)).hex)
+    if cursor:
+        rank, rowid = decode_cursor(cursor, 2)
+        try:
+            rank, rowid = float(rank), int(rowid)
+        except (TypeError, ValueError):
+            raise InvalidPage("Invalid cursor")
+        sql.append("AND (f.rank > %s OR (f.rank = %s AND f.rowid > %s))")
+        params.extend([rank, rank, rowid])
+    sql.append("ORDER BY f.rank, f.rowid LIMIT %s")
+    params.append(limit + 1)
+
+    with connection.cursor() as db:
+        db.execute(" ".join(sql), params)
+        rows = db.fetchall()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor([rows[-1][1], rows[-1][2]])
+
+    ids = [uuid.UUID(row[0]) for row in rows]
+    jobs = Job.objects.in_bulk(ids)
+    return [jobs[job_id] for job_id in ids if job_id in jobs], next_cursor
@@ -1,5 +1,33 @@
+import posixpath
+import re
+
+from django.conf import settings
+from django.db.models import QuerySet, prefetch_related_objects
 from rest_framework import serializers
-from .models import User, ServiceCategory, Job, JobAcceptance, Complaint
+from .models import User, ServiceCategory, Job, JobAcceptance, Complaint, UploadSession
+
+
+class EagerLoadingListSerializer(serializers.ListSerializer):
+    """
+    Loads the relations a child serializer declares in ``Meta.select_related``
+    and ``Meta.prefetch_related`` before rendering, so list views don't need
+    to know about them. Querysets get a join, already fetched lists get one
+    batched query per relation.
+    """
+
+    def to_representation(self, data):
+        meta = self.child.Meta
+        select_related = getattr(meta, "select_related", ())
+        prefetch_related = getattr(meta, "prefetch_related", ())
+        if isinstance(data, QuerySet):
+            if select_related:
+                data = data.select_related(*select_related)
+            if prefetch_related:
+                data = data.prefetch_related(*prefetch_related)
+        elif select_related or prefetch_related:
+            data = list(data)
+            prefetch_related_objects(data, *select_related, *prefetch_related)
+        return super().to_representation(data)
 
 
 class UserSerializer(serializers.ModelSerializer):
@@ -21,6 +49,15 @@ class UserSerializer(serializers.ModelSerializer):
             "works",
             "qualification_certificate",
         ]
+        read_only_fields = ["works"]
+
+    def update(self, instance, validated_data):
+        # Write only the submitted columns, so a concurrent works increment
+        # isn't overwritten with the value read here
+        for attr, value in validated_data.items():
+            setattr(instance, attr, value)
+        instance.save(update_fields=list(validated_data))
+        return instance
 
     def validate(self, data):
         if data.get("user_type") == "worker":
@@ -44,6 +81,12 @@ class ServiceCategorySerializer(serializers.ModelSerializer):
         fields = ["id", "name"]
 
 
+class ServiceCategoryOpenJobsSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = ServiceCategory
+        fields = ["id", "open_job_count"]
+
+
 class JobSerializer(serializers.ModelSerializer):
     service_category_name = serializers.SerializerMethodField()
 
@@ -61,9 +104,14 @@ class JobSerializer(serializers.ModelSerializer):
             "is_completed",
             "budget",
             "location",
+            "pincode",
             "image",
+            "image_thumb",
+            "image_medium",
         ]
-        read_only_fields = ["id", "created_at"]
+        read_only_fields = ["id", "created_at", "image_thumb", "image_medium"]
+        list_serializer_class = EagerLoadingListSerializer
+        select_related = ["service_category"]
 
     def get_service_category_name(self, obj):
         if obj.service_category:
@@ -71,10 +119,39 @@ class JobSerializer(serializers.ModelSerializer):
         return None
 
 
+class ClientJobSerializer(JobSerializer):
+    """Jobs as their poster sees them, with the applicant count."""
+
+    class Meta(JobSerializer.Meta):
+        fields = [*JobSerializer.Meta.fields, "applicant_count"]
+        read_only_fields = [*JobSerializer.Meta.read_only_fields, "applicant_count"]
+
+
+class JobBulkRowSerializer(serializers.ModelSerializer):
+    # Plain IDs: users and categories are resolved per batch, not per row
+    user = serializers.UUIDField()
+    service_category = serializers.UUIDField()
+
+    class Meta:
+        model = Job
+        fields = [
+            "title",
+            "description",
+            "user",
+            "deadline",
+            "service_category",
+            "budget",
+            "location",
+            "pincode",
+        ]
+
+
 class JobAcceptanceSerializer(serializers.ModelSerializer):
     class Meta:
         model = JobAcceptance
         fields = ["id", "job", "job_seekers", "assigned_to", "status", "created_at"]
+        list_serializer_class = EagerLoadingListSerializer
+        prefetch_related = ["job_seekers"]
 
 
 class ComplaintSerializer(serializers.ModelSerializer):
@@ -88,3 +165,49 @@ class ComplaintSerializer(serializers.ModelSerializer):
             "created_at",
         ]
         read_only_fields = ["id", "created_at", "user"]
+
+
+class UploadSessionSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = UploadSession
+        fields = [
+            "id",
+            "user",
+            "job",
+            "target",
+            "filename",
+            "size",
+            "sha256",
+            "received",
+            "created_at",
+        ]
+        read_only_fields = ["id", "received", "created_at"]
+
+    def validate_filename(self, value):
+        name = posixpath.basename(value.replace("\\", "/"))
+        if not name:
+            raise serializers.ValidationError("A file name is required")
+        return name
+
+    def validate_size(self, value):
+        if not 0 < value <= settings.MAX_UPLOAD_SIZE:
+            raise serializers.ValidationError(
+                f"Size must be between 1 and {settings.MAX_UPLOAD_SIZE} bytes"
+            )
+        return value
+
+    def validate_sha256(self, value):
+        value = value.lower()
+        if not re.fullmatch(r"[0-9a-f]{64}", value):
+            raise serializers.ValidationError("Must be a hex SHA-256 digest")
+        return value
+
+    def validate(self, data):
+        job = data.get("job")
+        if data["target"] != "job_image":
+            data["job"] = None
+        elif job is None:
+            raise serializers.ValidationError("job is required for a job image")
+        elif job.user_id != data["user"].id:
+            raise serializers.ValidationError("The job was posted by another user")
+        return data
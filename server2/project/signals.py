@@ -0,0 +1,97 @@
+from functools import partial
+
+from django.db import transaction
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_save,
+    pre_delete,
+    pre_save,
+)
+from django.dispatch import receiver
+
+from . import cache, events
+from .cache import on_change_and_commit
+from .geo import locate_job
+from .images import schedule_variants
+from .models import Application, Job, JobAcceptance, ServiceCategory
+from .search import ensure_search_index
+
+
+@receiver(pre_save, sender=Job)
+def resolve_job_coordinates(sender, instance, raw=False, update_fields=None, **kwargs):
+    if raw or (update_fields is not None and "pincode" not in update_fields):
+        return
+    if instance._state.adding or instance.latitude is None:
+        locate_job(instance)
+        return
+    stored = Job.objects.filter(pk=instance.pk).values_list("pincode", flat=True)
+    if stored.first() != instance.pincode:
+        locate_job(instance)
+
+
+@receiver(post_save, sender=Job)
+def publish_new_job(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        transaction.on_commit(partial(events.new_jobs.publish, [instance]), robust=True)
+
+
+@receiver(post_save, sender=Job)
+def make_image_variants(sender, instance, raw=False, update_fields=None, **kwargs):
+    if raw or (update_fields is not None and "image" not in update_fields):
+        return
+    schedule_variants(instance)
+
+
+@receiver(post_save, sender=ServiceCategory)
+@receiver(post_delete, sender=ServiceCategory)
+def bump_service_categories_version(sender, **kwargs):
+    on_change_and_commit(cache.service_categories.bump)
+    # Feed rows embed the category name
+    on_change_and_commit(cache.job_feeds.clear)
+
+
+@receiver(post_save, sender=Job)
+@receiver(post_delete, sender=Job)
+def invalidate_job_feeds(sender, instance, **kwargs):
+    on_change_and_commit(lambda: cache.job_feeds.invalidate_jobs([instance]))
+
+
+@receiver(m2m_changed, sender=JobAcceptance.job_seekers.through)
+def invalidate_applied_jobs(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ("post_add", "post_remove", "post_clear", "pre_clear"):
+        return
+    if reverse:
+        user_ids = [instance.pk]
+    elif action == "pre_clear":
+        user_ids = list(instance.job_seekers.values_list("id", flat=True))
+    else:
+        user_ids = pk_set or []
+    on_change_and_commit(lambda: cache.job_feeds.invalidate_workers(user_ids))
+
+
+@receiver(pre_delete, sender=JobAcceptance)
+def collect_job_seekers(sender, instance, **kwargs):
+    # The through rows are gone by post_delete, so note the workers now
+    instance._job_seeker_ids = list(instance.job_seekers.values_list("id", flat=True))
+
+
+@receiver(post_save, sender=JobAcceptance)
+@receiver(post_delete, sender=JobAcceptance)
+def invalidate_acceptance_workers(sender, instance, **kwargs):
+    user_ids = getattr(instance, "_job_seeker_ids", None)
+    if user_ids is None:
+        user_ids = [instance.assigned_to_id] if instance.assigned_to_id else []
+    on_change_and_commit(lambda: cache.job_feeds.invalidate_workers(user_ids))
+
+
+@receiver(post_save, sender=Application)
+@receiver(post_delete, sender=Application)
+def invalidate_application_worker(sender, instance, **kwargs):
+    on_change_and_commit(
+        lambda: cache.job_feeds.invalidate_workers([instance.worker_id])
+    )
+
+
+def restore_search_index(sender, using="default", **kwargs):
+    ensure_search_index(using)
@@ -0,0 +1,61 @@
+import json
+from itertools import chain
+
+from django.http import StreamingHttpResponse
+from rest_framework.utils.encoders import JSONEncoder
+
+CHUNK_SIZE = 2000
+
+
+def dumps(value):
+    # Same encoding as DRF's JSONRenderer, so streamed bodies match Response
+    return json.dumps(
+        value, cls=JSONEncoder, ensure_ascii=False, separators=(",", ":")
+    ).encode()
+
+
+def json_array(items, batch_size=100):
+    """Encode ``items`` as a JSON array, yielding a chunk every ``batch_size``."""
+    yield b"["
+    batch = []
+    first = True
+    for item in items:
+        if not first:
+            batch.append(b",")
+        first = False
+        batch.append(dumps(item))
+        if len(batch) >= batch_size * 2:
+            yield b"".join(batch)
+            batch = []
+    batch.append(b"]")
+    yield b"".join(batch)
+
+
+def json_envelope(message, items):
+    yield b'{"message":' + dumps(message) + b',"data":'
+    yield from json_array(items)
+    yield b',"status":"success"}'
+
+
+def iterate(queryset, to_dict, chunk_size=CHUNK_SIZE):
+    """Map ``to_dict`` over ``queryset`` without caching the result set."""
+    return (to_dict(row) for row in queryset.iterator(chunk_size=chunk_size))
+
+
+def streaming_json_response(items, message=None):
+    """
+    Stream ``items`` as ``{"message", "data", "status"}`` (or as a bare array
+    when ``message`` is None). Memory stays flat however many rows there are.
+
+    The first item is fetched here, so a query that fails outright raises in
+    the view and becomes its 500. Later errors can't change the status, which
+    is already sent: the exception reaches the server, which drops the
+    connection before the closing bracket, so the client sees a truncated,
+    unparseable body rather than a list that looks complete.
+    """
+    items = iter(items)
+    for first in items:
+        items = chain((first,), items)
+        break
+    body = json_array(items) if message is None else json_envelope(message, items)
+    return StreamingHttpResponse(body, content_type="application/json")
@@ -0,0 +1,137 @@
+"""
+A small durable task queue for side effects a request doesn't have to wait
+for. ``@task`` registers a function; ``func.enqueue(**kwargs)`` stores a
+``Task`` row in the caller's transaction, so the task exists exactly when the
+change that needed it commits. Keyword arguments must be JSON-serializable.
+
+Tasks are run by ``manage.py run_task_worker``, which also retries failed
+tasks with exponential backoff. With ``TASK_WORKER_THREADS`` set, the process
+that enqueued a task also starts it in a thread on commit; the worker command
+picks up anything those threads didn't finish.
+"""
+
+import logging
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from importlib import import_module
+
+from django.conf import settings
+from django.db import close_old_connections, connections, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Task
+
+logger = logging.getLogger(__name__)
+
+RETRY_DELAY = timedelta(seconds=10)
+
+_registry = {}
+_pool = None
+
+
+def task(max_attempts=5):
+    def register(func):
+        name = f"{func.__module__}.{func.__name__}"
+        _registry[name] = func
+        func.task_name = name
+        func.enqueue = lambda **kwargs: enqueue(name, kwargs, max_attempts)
+        return func
+
+    return register
+
+
+def enqueue(name, kwargs, max_attempts=5):
+    queued = Task.objects.create(name=name, kwargs=kwargs, max_attempts=max_attempts)
+    if getattr(settings, "TASK_WORKER_THREADS", 0):
+        transaction.on_commit(lambda: _threads().submit(_run_in_thread, queued.pk))
+    return queued
+
+
+def _threads():
+    global _pool
+    if _pool is None:
+        _pool = ThreadPoolExecutor(
+            max_workers=settings.TASK_WORKER_THREADS, thread_name_prefix="tasks"
+        )
+    return _pool
+
+
+def _run_in_thread(task_id):
+    close_old_connections()
+    try:
+        queued = claim(task_id)
+        if queued is not None:
+            execute(queued)
+    except Exception:
+        logger.exception("Could not run task %s", task_id)
+    finally:
+        connections.close_all()
+
+
+def lookup(name):
+    if name not in _registry:
+        # Registered when its module is imported, which a worker may not have
+        # done yet
+        import_module(name.rpartition(".")[0])
+    return _registry[name]
+
+
+def claim(task_id=None):
+    """
+    Mark the next due task (or the task ``task_id``, if it is due) as running
+    and return it, or None. The conditional update means two workers never
+    claim the same task.
+    """
+    now = timezone.now()
+    due = Task.objects.filter(status="pending", run_at__lte=now)
+    if task_id is not None:
+        due = due.filter(pk=task_id)
+    for pk in due.order_by("run_at", "id").values_list("pk", flat=True)[:10]:
+        claimed = Task.objects.filter(pk=pk, status="pending").update(
+            status="running", started_at=now, attempts=F("attempts") + 1
+        )
+        if claimed:
+            return Task.objects.get(pk=pk)
+    return None
+
+
+def execute(queued):
+    """Run a claimed task; returns whether it succeeded."""
+    try:
+        lookup(queued.name)(**queued.kwargs)
+    except Exception:
+        retry = queued.attempts < queued.max_attempts
+        Task.objects.filter(pk=queued.pk).update(
+            status="pending" if retry else "failed",
+            run_at=timezone.now() + RETRY_DELAY * 2 ** (queued.attempts - 1),
+            last_error=traceback.format_exc(),
+        )
+        logger.exception("Task %s (%s) failed", queued.pk, queued.name)
+        return False
+    Task.objects.filter(pk=queued.pk).delete()
+    return True
+
+
+def run_next():
+    """Run the next due task, if there is one; returns whether there was."""
+    queued = claim()
+    if queued is None:
+        return False
+    execute(queued)
+    return True
+
+
+def requeue_stale(timeout):
+    """
+    Put back tasks left running by a worker that died, or mark them failed
+    if that was their last attempt. Returns how many were put back.
+    """
+    stale = Task.objects.filter(
+        status="running", started_at__lt=timezone.now() - timeout
+    )
+    stale.filter(attempts__gte=F("max_attempts")).update(
+        status="failed", last_error="The worker running the task stopped"
+    )
+    return stale.update(status="pending", run_at=timezone.now())
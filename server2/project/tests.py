@@ -1,3 +1,1629 @@
-from django.test import TestCase
+import asyncio
+import csv
+import gzip
+import hashlib
+import io
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+from datetime import timedelta
+from pathlib import Path
+from types import SimpleNamespace
+from unittest import mock
 
-# Create your tests here.
+from asgiref.sync import sync_to_async
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import DatabaseError, connection
+from django.db.backends.sqlite3.base import DatabaseWrapper
+from django.db.models import QuerySet
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.utils import timezone
+from PIL import Image
+
+from . import (
+    async_views,
+    bulk,
+    cache,
+    counters,
+    events,
+    export,
+    images,
+    routers,
+    streaming,
+    tasks,
+    uploads,
+)
+from .geo import cell_key
+from .models import (
+    Application,
+    AdminRegistrationCode,
+    CompletedJobSummary,
+    Complaint,
+    Job,
+    JobAcceptance,
+    PincodeLocation,
+    ServiceCategory,
+    Task,
+    UploadSession,
+    User,
+)
+from .history import record_completion
+from .pagination import (
+    DEFAULT_PAGE_SIZE,
+    _page_queryset,
+    encode_cursor,
+    keyset_page,
+)
+from .serializers import JobSerializer
+
+
+class JobFixtureTestCase(TestCase):
+    """A "Plumbing" category and a client who posts jobs in it."""
+
+    client_pincode = ""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.category = ServiceCategory.objects.create(name="Plumbing")
+        cls.client_user = User.objects.create(
+            email="client@example.com", pincode=cls.client_pincode
+        )
+
+    def setUp(self):
+        cache.job_feeds.clear()
+        cache.service_categories.clear()
+
+    @classmethod
+    def create_worker(cls, email="worker@example.com", **fields):
+        return User.objects.create(
+            email=email, user_type="worker", is_worker=True, **fields
+        )
+
+    @classmethod
+    def job_fields(cls, title="Fix sink", **fields):
+        return {
+            "title": title,
+            "description": "Needs fixing",
+            "user": cls.client_user,
+            "service_category": cls.category,
+            "budget": 100,
+            "location": "Kochi",
+            **fields,
+        }
+
+    @classmethod
+    def create_job(cls, title="Fix sink", **fields):
+        return Job.objects.create(**cls.job_fields(title, **fields))
+
+    def create_jobs(self, count, **fields):
+        return Job.objects.bulk_create(
+            Job(**self.job_fields(f"Job {i}", **fields)) for i in range(count)
+        )
+
+
+@unittest.skipUnless(connection.vendor == "sqlite", "EXPLAIN QUERY PLAN is SQLite")
+class HotQueryPlanTests(JobFixtureTestCase):
+    """
+    Every hot list query must be answered from an index. A bare
+    ``SCAN <table>`` in the plan means SQLite fell back to reading the
+    whole table. Cursor pages must also seek: ``SCAN ... USING INDEX``
+    walks the index from its start through every row before the cursor.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.worker = cls.create_worker()
+        cls.job = cls.create_job()
+
+    def plan(self, queryset):
+        sql, params = queryset.query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute("EXPLAIN QUERY PLAN " + sql, params)
+            return [row[-1] for row in cursor.fetchall()]
+
+    def assertUsesIndex(self, queryset):
+        plan = self.plan(queryset)
+        full_scans = [
+            line for line in plan if re.fullmatch(r"SCAN \S+( AS \S+)?", line)
+        ]
+        self.assertEqual(full_scans, [], "\n".join(plan))
+
+    def assertSeeks(self, queryset):
+        plan = self.plan(queryset)
+        scans = [line for line in plan if line.startswith("SCAN ")]
+        self.assertEqual(scans, [], "\n".join(plan))
+
+    def cursor_page(self, queryset, ordering):
+        # A page after the first, the case keyset pagination exists for
+        first, _ = keyset_page(queryset, ordering, limit=1)
+        cursor = encode_cursor(
+            [getattr(first[0], name.lstrip("-")) for name in ordering]
+        )
+        return _page_queryset(queryset, ordering, cursor, DEFAULT_PAGE_SIZE)
+
+    def open_jobs_feed(self, **filters):
+        applied = Application.objects.filter(worker_id=self.worker.id)
+        return (
+            Job.objects.filter(is_completed=False, **filters)
+            .exclude(id__in=applied.values_list("job_id", flat=True))
+            .order_by("-created_at", "-id")
+        )
+
+    def test_open_jobs_feed(self):
+        self.assertUsesIndex(self.open_jobs_feed())
+
+    def test_open_jobs_feed_cursor_page(self):
+        self.assertSeeks(
+            self.cursor_page(
+                Job.objects.filter(is_completed=False), ("-created_at", "-id")
+            )
+        )
+
+    def test_completed_history_cursor_page(self):
+        CompletedJobSummary.objects.create(
+            job=self.job,
+            title=self.job.title,
+            description=self.job.description,
+            budget=self.job.budget,
+            location=self.job.location,
+            creator_id=self.client_user.id,
+            created_at=timezone.now(),
+        )
+        self.assertSeeks(
+            self.cursor_page(
+                CompletedJobSummary.objects.all(), ("-created_at", "-job_id")
+            )
+        )
+
+    def test_exports(self):
+        since = timezone.now()
+        for entity in ("jobs", "applications", "complaints"):
+            with self.subTest(entity=entity):
+                build, since_field = export.EXPORTS[entity]
+                # The whole table in index order, with no sort before streaming
+                plan = self.plan(build())
+                self.assertEqual(
+                    [line for line in plan if "TEMP B-TREE" in line], [], plan
+                )
+                self.assertUsesIndex(build())
+                self.assertSeeks(build().filter(**{f"{since_field}__gte": since}))
+
+    def test_open_jobs_feed_by_category(self):
+        self.assertUsesIndex(self.open_jobs_feed(service_category=self.category))
+
+    def test_open_jobs_feed_by_category_and_location(self):
+        self.assertUsesIndex(
+            self.open_jobs_feed(service_category=self.category, location="Kochi")
+        )
+
+    def test_completed_jobs(self):
+        self.assertUsesIndex(
+            Job.objects.filter(is_completed=True).order_by("-created_at")
+        )
+
+    def test_open_jobs_by_unmapped_pincode(self):
+        self.assertUsesIndex(
+            Job.objects.filter(is_completed=False, pincode="999999").order_by(
+                "-created_at", "-id"
+            )
+        )
+
+    def test_user_posted_jobs(self):
+        self.assertUsesIndex(
+            Job.objects.filter(user_id=self.client_user.id).order_by("-created_at")
+        )
+
+    def test_already_applied(self):
+        self.assertUsesIndex(
+            Application.objects.filter(worker=self.worker, job=self.job)
+        )
+
+    def test_applications_for_job(self):
+        self.assertUsesIndex(
+            Application.objects.filter(job=self.job).order_by("-created_at")
+        )
+
+    def test_acceptances_for_job(self):
+        self.assertUsesIndex(JobAcceptance.objects.filter(job=self.job))
+
+    def test_assigned_applications(self):
+        self.assertUsesIndex(JobAcceptance.objects.filter(assigned_to=self.worker))
+
+
+@unittest.skipUnless(connection.vendor == "sqlite", "FTS5 search is SQLite")
+class JobSearchTests(JobFixtureTestCase):
+    def search(self, **params):
+        response = self.client.get("/api/jobs/search/", params)
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.json()
+
+    def titles(self, **params):
+        return [job["title"] for job in self.search(**params)["data"]]
+
+    def test_index_follows_inserts_updates_and_deletes(self):
+        job = self.create_job("Leaking kitchen sink")
+        self.assertEqual(self.titles(q="sink"), ["Leaking kitchen sink"])
+
+        job.title = "Broken tap"
+        job.save()
+        self.assertEqual(self.titles(q="sink"), [])
+        self.assertEqual(self.titles(q="tap"), ["Broken tap"])
+
+        job.delete()
+        self.assertEqual(self.titles(q="tap"), [])
+
+    def test_ranked_and_paginated(self):
+        self.create_job("Paint fence", description="wooden fence")
+        self.create_job("Fence repair", description="fence fence fence")
+        self.create_job("Fix door", description="door hinge")
+        self.create_job("Closed fence job", description="fence", is_completed=True)
+
+        first = self.search(q="fence", limit=1)
+        self.assertEqual([job["title"] for job in first["data"]], ["Fence repair"])
+        second = self.search(q="fence", limit=1, cursor=first["next"])
+        self.assertEqual([job["title"] for job in second["data"]], ["Paint fence"])
+        self.assertIsNone(second["next"])
+
+        self.assertEqual(
+            self.titles(q="fence", is_completed="true"), ["Closed fence job"]
+        )
+
+    def test_mistyped_cursor_is_rejected(self):
+        response = self.client.get(
+            "/api/jobs/search/", {"q": "fence", "cursor": encode_cursor(["x", {}])}
+        )
+        self.assertEqual(response.status_code, 400, response.content)
+
+    def test_operators_in_input_are_plain_text(self):
+        self.create_job("Garden NOT weeding")
+        self.assertEqual(self.titles(q='garden" NOT (*'), ["Garden NOT weeding"])
+
+
+class ListEndpointQueryCountTests(TestCase):
+    """
+    List endpoints must run the same number of queries whether they return
+    10 rows or 1,000.
+    """
+
+    def setUp(self):
+        cache.job_feeds.clear()
+        cache.service_categories.clear()
+        self.categories = ServiceCategory.objects.bulk_create(
+            [ServiceCategory(name=f"Category {i}") for i in range(5)]
+        )
+        self.client_user = User.objects.create(
+            email="client@example.com", pincode="682016", is_verified=True
+        )
+        self.worker = User.objects.create(
+            email="worker@example.com",
+            user_type="worker",
+            is_worker=True,
+            service_category=self.categories[0],
+        )
+        self.popular_job = Job.objects.create(
+            title="Popular job",
+            description="Everyone applies",
+            user=self.client_user,
+            service_category=self.categories[0],
+            budget=100,
+            location="Kochi",
+        )
+        PincodeLocation.objects.create(pincode="682016", latitude=9.97, longitude=76.29)
+        self.rows = 0
+
+    def grow(self, total):
+        new = range(self.rows, total)
+        users = User.objects.bulk_create(
+            User(
+                email=f"user{i}@example.com",
+                works=i % 7,
+                qualification_certificate=f"qualification_certificates/{i}.pdf",
+                service_category=self.categories[i % 5],
+                is_verified=bool(i % 2),
+            )
+            for i in new
+        )
+        jobs = Job.objects.bulk_create(
+            Job(
+                title=f"Fix thing {i}",
+                description="Needs fixing",
+                user=self.client_user,
+                service_category=self.categories[i % 5],
+                budget=100,
+                location="Kochi",
+                pincode="682016",
+                latitude=9.97,
+                longitude=76.29,
+                geo_cell=cell_key(9.97, 76.29),
+                is_completed=i % 10 == 0,
+            )
+            for i in new
+        )
+        acceptances = JobAcceptance.objects.bulk_create(
+            JobAcceptance(job=job, assigned_to=user if job.is_completed else None)
+            for job, user in zip(jobs, users)
+        )
+        CompletedJobSummary.objects.bulk_create(
+            CompletedJobSummary(
+                job=job,
+                title=job.title,
+                description=job.description,
+                budget=job.budget,
+                location=job.location,
+                creator_id=self.client_user.id,
+                creator_name=self.client_user.full_name,
+                creator_email=self.client_user.email,
+                worker_id=user.id,
+                worker_name=user.full_name,
+                worker_email=user.email,
+                created_at=timezone.now(),
+            )
+            for job, user in zip(jobs, users)
+            if job.is_completed
+        )
+        # Every job gets one applicant, plus the worker whose views we measure
+        through = JobAcceptance.job_seekers.through
+        through.objects.bulk_create(
+            through(jobacceptance=acceptance, user=applicant)
+            for acceptance, user in zip(acceptances, users)
+            for applicant in (user, self.worker)
+        )
+        # Each applicant also applies to the popular job
+        popular = JobAcceptance.objects.bulk_create(
+            JobAcceptance(job=self.popular_job) for _ in users
+        )
+        through.objects.bulk_create(
+            through(jobacceptance=acceptance, user=user)
+            for acceptance, user in zip(popular, users)
+        )
+        Application.objects.bulk_create(
+            [Application(job=job, worker=user) for job, user in zip(jobs, users)]
+            + [Application(job=self.popular_job, worker=user) for user in users]
+        )
+        Complaint.objects.bulk_create(
+            Complaint(user=self.client_user, title=f"Complaint {i}", details="...")
+            for i in new
+        )
+        self.rows = total
+
+    def endpoints(self):
+        return [
+            ("/api/users/", {}),
+            ("/api/non-verified-users/", {}),
+            ("/api/service-categories/", {}),
+            ("/api/jobs/client/", {"client_id": self.client_user.id}),
+            ("/api/jobs/user-posted/", {"userId": self.client_user.id}),
+            ("/api/jobs/available/", {"userId": self.worker.id}),
+            ("/api/jobs/available/", {"userId": self.worker.id, "limit": 50}),
+            ("/api/jobs/search/", {"q": "fix"}),
+            ("/api/jobs/nearby/", {"pincode": "682016"}),
+            ("/api/user/requested-applications/", {"userId": self.client_user.id}),
+            (
+                "/api/user/requested-applications/",
+                {"userId": self.client_user.id, "limit": 50},
+            ),
+            ("/api/jobs/my-applications/", {"userId": self.worker.id}),
+            ("/api/jobs/my-applications/", {"userId": self.worker.id, "limit": 50}),
+            ("/api/jobs-requests/", {"job_id": self.popular_job.id}),
+            ("/api/jobs-requests/", {"job_id": self.popular_job.id, "sort": "-works"}),
+            ("/api/jobs-requests/", {"job_id": self.popular_job.id, "limit": 50}),
+            ("/api/jobs/completed/", {}),
+            ("/api/jobs/completed/history/", {}),
+            ("/api/complaints/", {}),
+            ("/api/service-categories/open-jobs/", {}),
+            ("/api/export/users/", {}),
+            ("/api/export/jobs/", {"output": "csv"}),
+            ("/api/export/applications/", {}),
+            ("/api/export/complaints/", {"since": "2000-01-01"}),
+            ("/api/async/service-categories/", {}),
+            ("/api/async/jobs/available/", {"userId": self.worker.id}),
+            ("/api/async/jobs/available/", {"userId": self.worker.id, "limit": 50}),
+            ("/api/async/jobs/my-applications/", {"userId": self.worker.id}),
+            (
+                "/api/async/jobs/my-applications/",
+                {"userId": self.worker.id, "limit": 50},
+            ),
+        ]
+
+    def count_queries(self):
+        counts = {}
+        for url, params in self.endpoints():
+            # Measure the database path, not a warm cache
+            cache.job_feeds.clear()
+            cache.service_categories.clear()
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(url, params)
+                body = response.getvalue()
+            self.assertEqual(response.status_code, 200, f"{url}: {body}")
+            counts[url, tuple(params)] = len(queries)
+        return counts
+
+    def test_query_count_does_not_grow_with_rows(self):
+        self.grow(10)
+        small = self.count_queries()
+        self.grow(1000)
+        large = self.count_queries()
+        for endpoint, count in small.items():
+            with self.subTest(endpoint=endpoint):
+                self.assertEqual(large[endpoint], count)
+
+
+class JobFeedCacheTests(SimpleTestCase):
+    def setUp(self):
+        self.feeds = cache.JobFeedCache(max_rows=3, max_applied=2, ttl=30)
+
+    def fill(self, category, location, job_ids):
+        return self.feeds.get_feed(
+            category, location, lambda: [{"id": job_id} for job_id in job_ids]
+        )
+
+    def cached(self, category, location):
+        return self.feeds.feeds.peek(self.feeds.feed_key(category, location))
+
+    def test_least_recently_used_feed_is_evicted(self):
+        self.fill("a", None, ["1"])
+        self.fill("b", None, ["2"])
+        self.fill("a", None, ["ignored"])
+        # Two rows: over the limit of three, so the oldest feed goes
+        self.fill("c", None, ["3", "4"])
+        self.assertIsNotNone(self.cached("a", None))
+        self.assertIsNone(self.cached("b", None))
+        self.assertIsNotNone(self.cached("c", None))
+        self.assertEqual(self.feeds.feeds.total, 3)
+
+    def test_feed_bigger_than_the_cache_is_not_kept(self):
+        self.fill("a", None, ["1"])
+        rows = self.fill("b", None, ["2", "3", "4", "5"])
+        self.assertEqual(len(rows), 4)
+        self.assertIsNone(self.cached("b", None))
+        self.assertIsNotNone(self.cached("a", None))
+
+    def test_invalidate_jobs_drops_only_matching_feeds(self):
+        self.fill("a", "Kochi", ["1"])
+        self.fill("b", "Kochi", ["2"])
+        self.feeds.invalidate_jobs(
+            [SimpleNamespace(pk="3", service_category_id="a", location="Kochi")]
+        )
+        self.assertIsNone(self.cached("a", "Kochi"))
+        self.assertIsNotNone(self.cached("b", "Kochi"))
+
+        # A job leaving a feed drops it even if its category changed
+        self.fill("a", "Kochi", ["1"])
+        self.feeds.invalidate_jobs(
+            [SimpleNamespace(pk="2", service_category_id="a", location="Kochi")]
+        )
+        self.assertIsNone(self.cached("b", "Kochi"))
+
+    def test_invalidate_workers(self):
+        for user_id in ("u1", "u2"):
+            self.feeds.get_applied(user_id, lambda: ["1"])
+        self.feeds.invalidate_workers(["u1"])
+        self.assertIsNone(self.feeds.applied.peek("u1"))
+        self.assertEqual(self.feeds.applied.peek("u2"), frozenset({"1"}))
+
+    def test_entries_expire(self):
+        with mock.patch("project.cache.time.monotonic", return_value=100):
+            self.fill("a", None, ["1"])
+        with mock.patch("project.cache.time.monotonic", return_value=129):
+            self.assertEqual(self.fill("a", None, ["2"]), ({"id": "1"},))
+        with mock.patch("project.cache.time.monotonic", return_value=130):
+            self.assertEqual(self.fill("a", None, ["2"]), ({"id": "2"},))
+
+
+class NearbyJobsTests(JobFixtureTestCase):
+    def setUp(self):
+        super().setUp()
+        # Kochi, about 5.5 and 55 km north of it, and Delhi
+        for pincode, latitude in (
+            ("682016", 9.97),
+            ("682017", 10.02),
+            ("680001", 10.47),
+        ):
+            PincodeLocation.objects.create(
+                pincode=pincode, latitude=latitude, longitude=76.29
+            )
+        PincodeLocation.objects.create(
+            pincode="110001", latitude=28.63, longitude=77.22
+        )
+
+    def nearby(self, **params):
+        response = self.client.get("/api/jobs/nearby/", {"pincode": "682016", **params})
+        self.assertEqual(response.status_code, 200, response.content)
+        return [(job["title"], job["distance_km"]) for job in response.json()["data"]]
+
+    def test_ordered_by_distance_within_radius(self):
+        self.create_job("Far", pincode="680001")
+        self.create_job("Near", pincode="682017")
+        self.create_job("Here", pincode="682016")
+        self.create_job("Delhi", pincode="110001")
+
+        self.assertEqual(self.nearby(), [("Here", 0.0), ("Near", 5.56)])
+        self.assertEqual(
+            [title for title, _ in self.nearby(radius_km=60)], ["Here", "Near", "Far"]
+        )
+        self.assertEqual(self.nearby(radius_km=60, limit=1), [("Here", 0.0)])
+
+    def test_pincode_change_moves_the_job(self):
+        job = self.create_job("Moving", pincode="682016")
+        job.pincode = "110001"
+        job.save()
+        job.refresh_from_db()
+        self.assertEqual((job.latitude, job.longitude), (28.63, 77.22))
+        self.assertEqual(job.geo_cell, cell_key(28.63, 77.22))
+        self.assertEqual(self.nearby(), [])
+
+    def test_unknown_pincode_matches_exactly(self):
+        self.create_job("Unmapped", pincode="999999")
+        self.create_job("Here", pincode="682016")
+        self.assertEqual(self.nearby(pincode="999999"), [("Unmapped", None)])
+
+    def test_load_post_office_directory(self):
+        job = self.create_job("Unmapped", pincode="695001")
+        directory = (
+            "officename,pincode,district,Latitude,Longitude\n"
+            "Fort,695001,Thiruvananthapuram,8.48,76.95\n"
+            "Palayam,695001,Thiruvananthapuram,8.50,76.95\n"
+            "Vazhuthacaud,695001,Thiruvananthapuram,8.52,76.95\n"
+            "Remote,695002,Thiruvananthapuram,NA,NA\n"
+        )
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "directory.csv.gz"
+            path.write_bytes(gzip.compress(directory.encode()))
+            call_command("load_pincodes", str(path), stdout=io.StringIO())
+
+        location = PincodeLocation.objects.get(pincode="695001")
+        self.assertEqual((location.latitude, location.longitude), (8.50, 76.95))
+        self.assertFalse(PincodeLocation.objects.filter(pincode="695002").exists())
+        job.refresh_from_db()
+        self.assertEqual(job.latitude, 8.50)
+
+
+class StreamingResponseTests(TestCase):
+    def setUp(self):
+        category = ServiceCategory.objects.create(name="Plumbing")
+        self.user = User.objects.create(
+            email="new@example.com", full_name="New", service_category=category
+        )
+        User.objects.create(email="verified@example.com", is_verified=True)
+        Complaint.objects.create(user=self.user, title="Late", details="...")
+
+    def body(self, url):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return json.loads(b"".join(response.streaming_content))
+
+    def test_bodies_parse(self):
+        users = self.body("/api/non-verified-users/")
+        self.assertEqual(
+            [(user["email"], user["service_category"]) for user in users],
+            [("new@example.com", "Plumbing")],
+        )
+        complaints = self.body("/api/complaints/")
+        self.assertEqual(
+            (complaints["message"], complaints["status"]),
+            ("Complaints fetched successfully", "success"),
+        )
+        self.assertEqual(
+            [complaint["title"] for complaint in complaints["data"]], ["Late"]
+        )
+        self.assertEqual(
+            {user["email"] for user in self.body("/api/users/")["data"]},
+            {"new@example.com", "verified@example.com"},
+        )
+
+    def test_failing_query_is_a_500(self):
+        def fail(*args, **kwargs):
+            # The query only runs when the first row is asked for
+            raise DatabaseError("disk I/O error")
+            yield
+
+        with mock.patch.object(QuerySet, "iterator", fail):
+            response = self.client.get("/api/non-verified-users/")
+        self.assertEqual(response.status_code, 500)
+        self.assertEqual(response.json(), {"error": "disk I/O error"})
+
+    def test_error_mid_stream_truncates_the_body(self):
+        def rows():
+            yield {"id": 1}
+            raise DatabaseError("connection lost")
+
+        response = streaming.streaming_json_response(rows(), message="Rows")
+        self.assertEqual(response.status_code, 200)
+        chunks = []
+        with self.assertRaises(DatabaseError):
+            for chunk in response.streaming_content:
+                chunks.append(chunk)
+        with self.assertRaises(ValueError):
+            json.loads(b"".join(chunks))
+
+
+class JobBulkCreateTests(JobFixtureTestCase):
+    client_pincode = "682016"
+
+    def setUp(self):
+        super().setUp()
+        PincodeLocation.objects.create(pincode="682016", latitude=9.97, longitude=76.29)
+
+    def row(self, i, **extra):
+        return {
+            "title": f"Bulk job {i}",
+            "description": "Imported",
+            "user": str(self.client_user.id),
+            "service_category": str(self.category.id),
+            "budget": "100",
+            "location": "Kochi",
+            **extra,
+        }
+
+    def post(self, body, content_type):
+        return self.client.post(
+            "/api/jobs/bulk-create/", body, content_type=content_type
+        )
+
+    def test_ndjson_rows_with_errors(self):
+        rows = [self.row(i) for i in range(5)]
+        rows[1]["budget"] = "lots"
+        rows[3]["user"] = "00000000-0000-0000-0000-000000000000"
+        body = "\n".join(json.dumps(row) for row in rows) + "\nnot json\n"
+
+        response = self.post(body, "application/x-ndjson")
+
+        self.assertEqual(response.status_code, 201, response.content)
+        data = response.json()["data"]
+        self.assertEqual(len(data["created"]), 3)
+        self.assertEqual([error["row"] for error in data["errors"]], [2, 4, 6])
+        job = Job.objects.get(title="Bulk job 0")
+        self.assertEqual(job.pincode, "682016")
+        self.assertEqual(job.geo_cell, cell_key(9.97, 76.29))
+
+    def test_undecodable_lines(self):
+        rows = [json.dumps(self.row(i)).encode() for i in range(3)]
+        body = b"\n".join([rows[0], b'{"title": "\xff"}', rows[1], rows[2]])
+        response = self.post(body, "application/x-ndjson")
+        self.assertEqual(response.status_code, 201, response.content)
+        data = response.json()["data"]
+        self.assertEqual(len(data["created"]), 3)
+        self.assertEqual([error["row"] for error in data["errors"]], [2])
+
+        # CSV can't resync after a bad line: the rows before it are created
+        # and reported, and the rest is one error
+        header = "title,description,user,service_category,budget,location\n"
+        line = f"Fix,Imported,{self.client_user.id},{self.category.id},50,Kochi\n"
+        body = (header + line).encode() + b"\xff\n" + line.encode()
+        response = self.post(body, "text/csv")
+        self.assertEqual(response.status_code, 201, response.content)
+        data = response.json()["data"]
+        self.assertEqual(len(data["created"]), 1)
+        self.assertEqual([error["row"] for error in data["errors"]], [2])
+
+    def test_unsupported_media_type(self):
+        response = self.post("{}", "application/json")
+        self.assertEqual(response.status_code, 415)
+
+    def test_csv_and_no_valid_rows(self):
+        body = (
+            "title,description,user,service_category,budget,location,deadline\n"
+            f"CSV job,Imported,{self.client_user.id},{self.category.id},50,Kochi,2030-01-01\n"
+        )
+        response = self.post(body, "text/csv")
+        self.assertEqual(response.status_code, 201, response.content)
+        self.assertEqual(str(Job.objects.get(title="CSV job").deadline), "2030-01-01")
+
+        response = self.post("title\nNo other fields\n", "text/csv")
+        self.assertEqual(response.status_code, 400)
+
+    def test_queries_per_batch_and_feed_invalidation(self):
+        params = {"service_category": str(self.category.id)}
+        self.assertEqual(
+            self.client.get("/api/jobs/available/", params).json()["data"], []
+        )
+
+        body = "\n".join(json.dumps(self.row(i)) for i in range(bulk.BATCH_SIZE))
+        with CaptureQueriesContext(connection) as queries:
+            response = self.post(body, "application/x-ndjson")
+        self.assertEqual(response.status_code, 201, response.content)
+        # One lookup each for users, categories and pincodes per batch
+        selects = [q for q in queries if q["sql"].startswith("SELECT")]
+        self.assertEqual(len(selects), 3)
+
+        feed = self.client.get("/api/jobs/available/", params).json()["data"]
+        self.assertEqual(len(feed), bulk.BATCH_SIZE)
+
+
+class JobBatchApplicationTests(JobFixtureTestCase):
+    def setUp(self):
+        super().setUp()
+        self.worker = self.create_worker()
+
+    def apply(self, job_ids):
+        return self.client.post(
+            "/api/jobs/apply/batch/",
+            {"userId": str(self.worker.id), "job_ids": job_ids},
+            content_type="application/json",
+        )
+
+    def test_outcomes_per_job(self):
+        first, second = self.create_jobs(2)
+        self.client.post(
+            "/api/jobs/apply/", {"job_id": first.id, "userId": self.worker.id}
+        )
+        missing = "00000000-0000-0000-0000-000000000000"
+
+        response = self.apply([str(first.id), str(second.id), missing, "nope"])
+
+        self.assertEqual(response.status_code, 201, response.content)
+        self.assertEqual(
+            [outcome["status"] for outcome in response.json()["data"]],
+            ["already_applied", "applied", "not_found", "invalid"],
+        )
+        self.assertTrue(
+            JobAcceptance.objects.filter(job=second, job_seekers=self.worker).exists()
+        )
+        response = self.apply([str(second.id)])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["data"][0]["status"], "already_applied")
+
+    def test_application_racing_the_batch(self):
+        first, second = self.create_jobs(2)
+        # Another request applies between the batch's check and its insert
+        self.client.post(
+            "/api/jobs/apply/", {"job_id": first.id, "userId": self.worker.id}
+        )
+        with mock.patch.object(
+            bulk, "already_applied", side_effect=[set(), {first.id}]
+        ):
+            response = self.apply([str(first.id), str(second.id)])
+
+        self.assertEqual(response.status_code, 201, response.content)
+        self.assertEqual(
+            [outcome["status"] for outcome in response.json()["data"]],
+            ["already_applied", "applied"],
+        )
+        self.assertEqual(Application.objects.filter(worker=self.worker).count(), 2)
+
+    def test_constant_queries_and_feed_exclusion(self):
+        batches = [self.create_jobs(size) for size in (1, 50)]
+        feed = self.client.get("/api/jobs/available/", {"userId": self.worker.id})
+        self.assertEqual(len(feed.json()["data"]), 51)
+
+        counts = []
+        for jobs in batches:
+            with CaptureQueriesContext(connection) as queries:
+                response = self.apply([str(job.id) for job in jobs])
+            self.assertEqual(response.status_code, 201, response.content)
+            counts.append(len(queries))
+        self.assertEqual(counts[0], counts[1])
+
+        feed = self.client.get("/api/jobs/available/", {"userId": self.worker.id})
+        self.assertEqual(feed.json()["data"], [])
+
+
+class ApplicationTests(JobFixtureTestCase):
+    def setUp(self):
+        super().setUp()
+        self.workers = [self.create_worker(f"worker{i}@example.com") for i in range(2)]
+        self.job = self.create_job()
+
+    def apply(self, worker):
+        return self.client.post(
+            "/api/jobs/apply/", {"job_id": self.job.id, "userId": worker.id}
+        )
+
+    def test_one_application_per_worker(self):
+        self.assertEqual(self.apply(self.workers[0]).status_code, 201)
+        self.assertEqual(self.apply(self.workers[0]).status_code, 400)
+        self.assertEqual(
+            Application.objects.filter(job=self.job, worker=self.workers[0]).count(),
+            1,
+        )
+        feed = self.client.get("/api/jobs/available/", {"userId": self.workers[0].id})
+        self.assertEqual(feed.json()["data"], [])
+
+    def test_assign_with_several_applicants(self):
+        for worker in self.workers:
+            self.assertEqual(self.apply(worker).status_code, 201)
+
+        response = self.client.post(
+            "/api/job-acceptance/",
+            {"job_id": self.job.id, "applicantId": self.workers[1].id},
+        )
+
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(
+            JobAcceptance.objects.get(assigned_to=self.workers[1]).job_id, self.job.id
+        )
+        self.assertEqual(
+            dict(
+                Application.objects.filter(job=self.job).values_list(
+                    "worker_id", "status"
+                )
+            ),
+            {self.workers[0].id: "pending", self.workers[1].id: "accepted"},
+        )
+
+
+class ListPaginationTests(JobFixtureTestCase):
+    """List endpoints page only when asked to, like the jobs feed."""
+
+    def setUp(self):
+        super().setUp()
+        self.worker = self.create_worker()
+        jobs = self.create_jobs(25)
+        self.job = jobs[0]
+        acceptances = JobAcceptance.objects.bulk_create(
+            JobAcceptance(job=job) for job in jobs
+        )
+        applicants = User.objects.bulk_create(
+            User(email=f"applicant{i}@example.com") for i in range(24)
+        )
+        through = JobAcceptance.job_seekers.through
+        through.objects.bulk_create(
+            [through(jobacceptance=a, user=self.worker) for a in acceptances]
+            + [through(jobacceptance=acceptances[0], user=u) for u in applicants]
+        )
+
+    def assertPagesMatch(self, url, params, total):
+        everything = self.client.get(url, params).json()
+        self.assertEqual(len(everything["data"]), total)
+        self.assertNotIn("next", everything)
+
+        pages, cursor = [], None
+        while True:
+            page = {**params, "limit": 7, **({"cursor": cursor} if cursor else {})}
+            body = self.client.get(url, page).json()
+            pages += body["data"]
+            cursor = body["next"]
+            if cursor is None:
+                break
+        self.assertEqual(pages, everything["data"])
+
+    def test_my_applications(self):
+        self.assertPagesMatch(
+            "/api/jobs/my-applications/", {"userId": self.worker.id}, 25
+        )
+
+    def test_job_requests(self):
+        for sort in ("recent", "-works"):
+            with self.subTest(sort=sort):
+                self.assertPagesMatch(
+                    "/api/jobs-requests/", {"job_id": self.job.id, "sort": sort}, 25
+                )
+
+    def test_requested_applications(self):
+        self.assertPagesMatch(
+            "/api/user/requested-applications/", {"userId": self.client_user.id}, 49
+        )
+
+
+class JobFeedPaginationTests(JobFixtureTestCase):
+    def setUp(self):
+        super().setUp()
+        self.create_jobs(23)
+        # Ties on created_at are broken by id
+        Job.objects.filter(title__in=["Job 3", "Job 4", "Job 5", "Job 6"]).update(
+            created_at=timezone.now()
+        )
+
+    def test_pages_have_no_duplicates_or_gaps(self):
+        seen, cursor = [], None
+        while True:
+            params = {"limit": 5, **({"cursor": cursor} if cursor else {})}
+            body = self.client.get("/api/jobs/available/", params).json()
+            seen += [job["id"] for job in body["data"]]
+            cursor = body["next"]
+            if cursor is None:
+                break
+        everything = self.client.get("/api/jobs/available/").json()["data"]
+        self.assertEqual(seen, [job["id"] for job in everything])
+        self.assertEqual(len(set(seen)), 23)
+
+    def test_mistyped_cursor_is_rejected(self):
+        now = timezone.now()
+        for values in (
+            ["yesterday", "00000000-0000-0000-0000-000000000000"],
+            [now, "not-a-uuid"],
+            [now, None],
+            [{"a": 1}, []],
+        ):
+            with self.subTest(values=values):
+                response = self.client.get(
+                    "/api/jobs/available/", {"cursor": encode_cursor(values)}
+                )
+                self.assertEqual(response.status_code, 400, response.content)
+
+
+class ServiceCategoryCacheTests(JobFixtureTestCase):
+
+    def fetch(self):
+        response = self.client.get("/api/service-categories/")
+        return [row["name"] for row in response.json()], response["ETag"]
+
+    def test_save_changes_body_and_etag(self):
+        names, etag = self.fetch()
+        self.assertEqual(names, ["Plumbing"])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.category.name = "Electrical"
+            self.category.save()
+            # A reader that saw the pre-commit table re-caches the old body
+            cache.service_categories.get(lambda: [{"name": "Plumbing"}])
+
+        names, new_etag = self.fetch()
+        self.assertEqual(names, ["Electrical"])
+        self.assertNotEqual(new_etag, etag)
+        response = self.client.get("/api/service-categories/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+    def test_job_writes_keep_the_etag(self):
+        _, etag = self.fetch()
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                "/api/jobs/create/",
+                {
+                    "title": "Fix sink",
+                    "description": "Leaking sink",
+                    "user": self.client_user.id,
+                    "service_category": self.category.id,
+                    "budget": 500,
+                    "location": "Kochi",
+                },
+            )
+        self.assertEqual(response.status_code, 201, response.content)
+
+        response = self.client.get("/api/service-categories/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        counts = self.client.get("/api/service-categories/open-jobs/").json()
+        self.assertEqual(
+            counts["data"], [{"id": str(self.category.id), "open_job_count": 1}]
+        )
+
+
+class CounterTests(JobFixtureTestCase):
+    def setUp(self):
+        super().setUp()
+        self.workers = [self.create_worker(f"worker{i}@example.com") for i in range(2)]
+
+    def create_job(self, title="Fix sink"):
+        response = self.client.post(
+            "/api/jobs/create/",
+            {
+                "title": title,
+                "description": "Leaking sink",
+                "user": self.client_user.id,
+                "service_category": self.category.id,
+                "budget": 500,
+                "location": "Kochi",
+            },
+        )
+        self.assertEqual(response.status_code, 201, response.content)
+        return Job.objects.get(id=response.json()["data"]["id"])
+
+    def counts(self, job=None):
+        self.category.refresh_from_db()
+        values = [self.category.open_job_count]
+        if job is not None:
+            job.refresh_from_db()
+            values.append(job.applicant_count)
+        return values
+
+    def test_counters_follow_the_job_lifecycle(self):
+        job = self.create_job()
+        other = self.create_job("Paint wall")
+        self.assertEqual(self.counts(job), [2, 0])
+
+        for worker in self.workers:
+            self.client.post(
+                "/api/jobs/apply/", {"job_id": job.id, "userId": worker.id}
+            )
+        self.client.post(
+            "/api/jobs/apply/batch/",
+            {
+                "userId": str(self.workers[0].id),
+                "job_ids": [str(job.id), str(other.id)],
+            },
+            content_type="application/json",
+        )
+        self.assertEqual(self.counts(job), [2, 2])
+        self.assertEqual(self.counts(other), [2, 1])
+
+        self.client.post(
+            "/api/job-acceptance/",
+            {"job_id": job.id, "applicantId": self.workers[0].id},
+        )
+        feed = self.client.get("/api/jobs/available/").json()["data"]
+        self.assertIn(str(job.id), [row["id"] for row in feed])
+        for _ in range(2):
+            self.client.post("/api/jobs/complete/", {"job_id": job.id})
+        self.workers[0].refresh_from_db()
+        self.assertEqual(self.workers[0].works, 1)
+        self.assertEqual(self.counts(job), [1, 2])
+        self.assertEqual(
+            Task.objects.filter(name=record_completion.task_name).count(), 1
+        )
+        feed = self.client.get("/api/jobs/available/").json()["data"]
+        self.assertNotIn(str(job.id), [row["id"] for row in feed])
+
+        self.client.delete(f"/api/user/delete/?userId={self.workers[1].id}")
+        self.assertEqual(self.counts(job), [1, 1])
+
+        # works is counted from the jobs, not the history rows a task writes
+        # later, so a pending or failed record_completion doesn't matter
+        self.assertFalse(CompletedJobSummary.objects.exists())
+        self.assertEqual(
+            counters.reconcile(),
+            {"works": 0, "applicant_count": 0, "open_job_count": 0},
+        )
+        Task.objects.update(status="failed")
+        self.assertEqual(counters.reconcile()["works"], 0)
+        response = self.client.get("/api/service-categories/open-jobs/")
+        self.assertEqual(response.json()["data"][0]["open_job_count"], 1)
+
+    def test_reconcile_fixes_drift(self):
+        job = self.create_job()
+        Job.objects.filter(pk=job.pk).update(applicant_count=7)
+        ServiceCategory.objects.update(open_job_count=0)
+        User.objects.filter(pk=self.workers[0].pk).update(works=3)
+
+        self.assertEqual(
+            counters.reconcile(),
+            {"works": 1, "applicant_count": 1, "open_job_count": 1},
+        )
+        self.assertEqual(self.counts(job), [1, 0])
+
+
+class AsyncViewTests(JobFixtureTestCase):
+    """The async read endpoints return exactly what their sync versions do."""
+
+    def setUp(self):
+        super().setUp()
+        self.worker = self.create_worker()
+        jobs = [self.create_job(f"Job {i}") for i in range(3)]
+        self.client.post(
+            "/api/jobs/apply/", {"job_id": jobs[0].id, "userId": self.worker.id}
+        )
+
+    def assertSameResponse(self, path, params):
+        sync = self.client.get(f"/api/{path}", params)
+        cache.job_feeds.clear()
+        cache.service_categories.clear()
+        async_ = self.client.get(f"/api/async/{path}", params)
+        self.assertEqual(async_.status_code, sync.status_code)
+        self.assertJSONEqual(async_.content, sync.json())
+        return async_
+
+    def test_job_feed(self):
+        worker = {"userId": self.worker.id}
+        response = self.assertSameResponse("jobs/available/", worker)
+        self.assertEqual(len(response.json()["data"]), 2)
+        response = self.assertSameResponse("jobs/available/", {**worker, "limit": 1})
+        self.assertSameResponse(
+            "jobs/available/", {**worker, "cursor": response.json()["next"]}
+        )
+        self.assertSameResponse(
+            "jobs/available/",
+            {"service_category": self.category.id, "location": "Kochi"},
+        )
+
+    def test_my_applications(self):
+        self.assertSameResponse("jobs/my-applications/", {"userId": self.worker.id})
+        self.assertSameResponse(
+            "jobs/my-applications/", {"userId": self.worker.id, "limit": 1}
+        )
+        self.assertSameResponse("jobs/my-applications/", {"userId": self.category.id})
+        self.assertSameResponse("jobs/my-applications/", {})
+
+    def test_service_categories(self):
+        response = self.assertSameResponse("service-categories/", {})
+        revalidated = self.client.get(
+            "/api/async/service-categories/", HTTP_IF_NONE_MATCH=response["ETag"]
+        )
+        self.assertEqual(revalidated.status_code, 304)
+
+    def test_profile(self):
+        self.assertSameResponse("user/profile/", {"userId": self.worker.id})
+        self.assertSameResponse("user/profile/", {"userId": self.category.id})
+
+
+class SQLiteConnectionTests(SimpleTestCase):
+    def test_pragmas_applied_to_new_connections(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            db = DatabaseWrapper(
+                {**connection.settings_dict, "NAME": str(Path(tmp) / "db.sqlite3")},
+                alias="pragmas",
+            )
+            try:
+                with db.cursor() as cursor:
+                    values = {}
+                    for name in ("journal_mode", "busy_timeout", "synchronous"):
+                        cursor.execute(f"PRAGMA {name}")
+                        values[name] = cursor.fetchone()[0]
+            finally:
+                db.close()
+        # synchronous is reported as a number: 1 is NORMAL
+        self.assertEqual(
+            values, {"journal_mode": "wal", "busy_timeout": 5000, "synchronous": 1}
+        )
+
+    def test_no_persistent_connections_under_asgi(self):
+        script = (
+            "import Quickfix.asgi; from django.conf import settings; "
+            "print(settings.DATABASES['default']['CONN_MAX_AGE'])"
+        )
+        env = {k: v for k, v in os.environ.items() if k != "QUICKFIX_ASGI"}
+        env.pop("DJANGO_SETTINGS_MODULE", None)
+        result = subprocess.run(
+            [sys.executable, "-c", script],
+            capture_output=True,
+            text=True,
+            env=env,
+            cwd=Path(__file__).resolve().parent.parent,
+            check=True,
+        )
+        self.assertEqual(result.stdout.strip(), "0")
+
+
+class ReplicaRoutingTests(SimpleTestCase):
+    def route(self, method, view):
+        middleware = routers.ReplicaRoutingMiddleware(view)
+        return middleware(getattr(RequestFactory(), method)("/"))
+
+    def test_only_safe_methods_use_the_replica(self):
+        seen = {}
+
+        def view(request):
+            seen[request.method] = routers._use_replica.get()
+            return HttpResponse()
+
+        self.route("get", view)
+        self.route("post", view)
+        self.assertEqual(seen, {"GET": True, "POST": False})
+        self.assertFalse(routers._use_replica.get())
+
+    def test_a_write_pins_the_request_to_the_primary(self):
+        def view(request):
+            routers.PrimaryReplicaRouter().db_for_write(Job)
+            return HttpResponse(str(routers._use_replica.get()))
+
+        self.assertEqual(self.route("get", view).content, b"False")
+
+    def test_streamed_body_keeps_the_routing(self):
+        def view(request):
+            return StreamingHttpResponse(
+                str(routers._use_replica.get()) for _ in range(2)
+            )
+
+        response = self.route("get", view)
+        self.assertFalse(routers._use_replica.get())
+        self.assertEqual(b"".join(response.streaming_content), b"TrueTrue")
+
+
+class ImageVariantTests(JobFixtureTestCase):
+    def setUp(self):
+        super().setUp()
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        settings_override = override_settings(MEDIA_ROOT=media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        self.job = self.create_job(image=self.upload("sink.png"))
+        queued = Task.objects.get()
+        self.assertEqual(queued.name, "project.images.make_variants")
+        self.assertEqual(
+            queued.kwargs, {"job_id": str(self.job.pk), "name": self.job.image.name}
+        )
+
+    def upload(self, name, size=(2000, 1500)):
+        out = io.BytesIO()
+        Image.new("RGB", size, "teal").save(out, "PNG")
+        return SimpleUploadedFile(name, out.getvalue(), content_type="image/png")
+
+    def test_variants_are_scaled_down_webp(self):
+        self.assertTrue(tasks.run_next())
+        self.assertFalse(Task.objects.exists())
+        self.job.refresh_from_db()
+        self.assertFalse(images.needs_variants(self.job))
+        for field, longest_side in (("image_thumb", 320), ("image_medium", 960)):
+            variant = getattr(self.job, field)
+            self.assertEqual(
+                variant.name,
+                images.variant_name(self.job.pk, self.job.image.name, field[6:]),
+            )
+            with Image.open(variant.path) as image:
+                self.assertEqual(image.format, "WEBP")
+                self.assertEqual(max(image.size), longest_side)
+
+        data = JobSerializer(self.job).data
+        self.assertTrue(data["image_thumb"].endswith("_thumb.webp"))
+        self.job.save()
+        self.assertFalse(Task.objects.exists())
+
+    def test_variants_never_overwrite_another_upload(self):
+        # An upload named like the first job's thumbnail would have been
+        other = Job.objects.create(
+            title="Fix tap",
+            description="Dripping",
+            user=self.job.user,
+            service_category=self.job.service_category,
+            budget=100,
+            location="Kochi",
+            image=self.upload("sink_thumb.webp", size=(50, 50)),
+        )
+        while tasks.run_next():
+            pass
+        self.job.refresh_from_db()
+        other.refresh_from_db()
+        self.assertNotEqual(self.job.image_thumb.name, other.image.name)
+        with Image.open(other.image.path) as image:
+            self.assertEqual(image.size, (50, 50))
+        with Image.open(self.job.image_thumb.path) as image:
+            self.assertEqual(image.size, (320, 240))
+
+    def test_replaced_image_is_left_alone(self):
+        old_name = self.job.image.name
+        self.job.image = self.upload("new.png", size=(50, 50))
+        self.job.save()
+        self.assertFalse(images.make_variants(self.job.pk, old_name))
+        self.job.refresh_from_db()
+        self.assertEqual(self.job.image_thumb.name, "")
+
+
+class ChunkedUploadTests(TestCase):
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        settings_override = override_settings(
+            MEDIA_ROOT=f"{directory}/media", UPLOAD_TEMP_DIR=f"{directory}/tmp"
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.user = User.objects.create(email="worker@example.com")
+
+    def start(self, content, **fields):
+        response = self.client.post(
+            "/api/uploads/",
+            {
+                "user": str(self.user.id),
+                "target": "qualification_certificate",
+                "filename": "certificate.pdf",
+                "size": len(content),
+                "sha256": hashlib.sha256(content).hexdigest(),
+                **fields,
+            },
+            content_type="application/json",
+        )
+        return response
+
+    def put(self, upload_id, chunk, offset):
+        return self.client.put(
+            f"/api/uploads/{upload_id}/",
+            chunk,
+            content_type="application/octet-stream",
+            HTTP_UPLOAD_OFFSET=str(offset),
+        )
+
+    def test_resumed_certificate_upload(self):
+        content = b"%PDF" + bytes(range(256)) * 1000
+        upload_id = self.start(content).json()["data"]["id"]
+
+        self.assertEqual(self.put(upload_id, content[:100000], 0).status_code, 200)
+        # A retry of the first chunk is told where to carry on from
+        retry = self.put(upload_id, content[:100000], 0)
+        self.assertEqual(retry.status_code, 409)
+        self.assertEqual(retry.json()["data"]["received"], 100000)
+        status = self.client.get(f"/api/uploads/{upload_id}/").json()["data"]
+        self.assertEqual(status["received"], 100000)
+        self.assertEqual(
+            self.client.post(f"/api/uploads/{upload_id}/finalize/").status_code, 400
+        )
+
+        self.assertEqual(self.put(upload_id, content[100000:], 100000).status_code, 200)
+        response = self.client.post(f"/api/uploads/{upload_id}/finalize/")
+        self.assertEqual(response.status_code, 200)
+
+        self.user.refresh_from_db()
+        with self.user.qualification_certificate.open("rb") as f:
+            self.assertEqual(f.read(), content)
+        self.assertFalse(UploadSession.objects.exists())
+        self.assertEqual(list(uploads.temp_dir().iterdir()), [])
+
+    def test_checksum_mismatch(self):
+        upload_id = self.start(b"abc", sha256="0" * 64).json()["data"]["id"]
+        self.put(upload_id, b"abc", 0)
+        response = self.client.post(f"/api/uploads/{upload_id}/finalize/")
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(UploadSession.objects.exists())
+        self.user.refresh_from_db()
+        self.assertFalse(self.user.qualification_certificate)
+
+    def test_job_image(self):
+        job = Job.objects.create(
+            title="Fix sink",
+            description="Leaking",
+            user=self.user,
+            budget=100,
+            location="Kochi",
+        )
+        other = User.objects.create(email="other@example.com")
+        out = io.BytesIO()
+        Image.new("RGB", (40, 30), "teal").save(out, "PNG")
+        content = out.getvalue()
+
+        image = {"target": "job_image", "job": str(job.id), "filename": "sink.png"}
+        response = self.start(content, **image, user=str(other.id))
+        self.assertEqual(response.status_code, 400)
+        upload_id = self.start(b"not an image", **image).json()["data"]["id"]
+        self.put(upload_id, b"not an image", 0)
+        response = self.client.post(f"/api/uploads/{upload_id}/finalize/")
+        self.assertEqual(response.status_code, 400)
+
+        upload_id = self.start(content, **image).json()["data"]["id"]
+        self.put(upload_id, content, 0)
+        response = self.client.post(f"/api/uploads/{upload_id}/finalize/")
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.json()["data"]["image"].endswith(".png"))
+
+
+class MediaServingTests(TestCase):
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        settings_override = override_settings(MEDIA_ROOT=media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        (Path(media_root) / "job_images").mkdir()
+        (Path(media_root) / "job_images" / "sink.jpg").write_bytes(b"0123456789")
+        (Path(media_root) / "secret.txt").write_bytes(b"secret")
+
+    def test_full_and_conditional(self):
+        response = self.client.get("/media/job_images/sink.jpg")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b"".join(response.streaming_content), b"0123456789")
+        self.assertEqual(response["Content-Type"], "image/jpeg")
+        self.assertIn("max-age=31536000", response["Cache-Control"])
+
+        revalidated = self.client.get(
+            "/media/job_images/sink.jpg", HTTP_IF_NONE_MATCH=response["ETag"]
+        )
+        self.assertEqual(revalidated.status_code, 304)
+
+    def test_ranges(self):
+        response = self.client.get("/media/job_images/sink.jpg", HTTP_RANGE="bytes=2-5")
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response["Content-Range"], "bytes 2-5/10")
+        self.assertEqual(b"".join(response.streaming_content), b"2345")
+
+        response = self.client.get("/media/job_images/sink.jpg", HTTP_RANGE="bytes=-3")
+        self.assertEqual(b"".join(response.streaming_content), b"789")
+
+        response = self.client.get("/media/job_images/sink.jpg", HTTP_RANGE="bytes=10-")
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response["Content-Range"], "bytes */10")
+
+        # A stale If-Range gets the whole, current file
+        response = self.client.get(
+            "/media/job_images/sink.jpg",
+            HTTP_RANGE="bytes=2-5",
+            HTTP_IF_RANGE='"stale"',
+        )
+        self.assertEqual(response.status_code, 200)
+
+    def test_only_upload_directories_are_served(self):
+        for path in ("secret.txt", "job_images/../secret.txt", "job_images/none.jpg"):
+            with self.subTest(path=path):
+                self.assertEqual(self.client.get(f"/media/{path}").status_code, 404)
+
+    @override_settings(MEDIA_ACCEL="x-accel-redirect")
+    def test_proxy_sends_the_file(self):
+        response = self.client.get("/media/job_images/sink.jpg")
+        self.assertEqual(
+            response["X-Accel-Redirect"], "/protected-media/job_images/sink.jpg"
+        )
+        self.assertEqual(response.content, b"")
+        self.assertIn("ETag", response)
+
+
+@tasks.task(max_attempts=2)
+def failing_task(reason):
+    raise RuntimeError(reason)
+
+
+class TaskQueueTests(TestCase):
+    def test_retries_with_backoff_then_fails(self):
+        queued = failing_task.enqueue(reason="disk full")
+        with self.assertLogs("project.tasks", "ERROR"):
+            self.assertTrue(tasks.run_next())
+        queued.refresh_from_db()
+        self.assertEqual((queued.status, queued.attempts), ("pending", 1))
+        self.assertGreater(queued.run_at, timezone.now())
+        self.assertIn("disk full", queued.last_error)
+        # Not due again yet
+        self.assertFalse(tasks.run_next())
+
+        Task.objects.update(run_at=timezone.now())
+        with self.assertLogs("project.tasks", "ERROR"):
+            self.assertTrue(tasks.run_next())
+        queued.refresh_from_db()
+        self.assertEqual((queued.status, queued.attempts), ("failed", 2))
+        self.assertFalse(tasks.run_next())
+
+    def test_stale_running_tasks_are_requeued(self):
+        failing_task.enqueue(reason="worker died")
+        Task.objects.update(
+            status="running", started_at=timezone.now() - timedelta(hours=1)
+        )
+        self.assertEqual(tasks.requeue_stale(timedelta(minutes=10)), 1)
+        self.assertEqual(Task.objects.get().status, "pending")
+
+    def test_stale_task_out_of_attempts_fails(self):
+        failing_task.enqueue(reason="crashes its worker")
+        Task.objects.update(
+            status="running",
+            attempts=2,
+            started_at=timezone.now() - timedelta(hours=1),
+        )
+        self.assertEqual(tasks.requeue_stale(timedelta(minutes=10)), 0)
+        self.assertEqual(Task.objects.get().status, "failed")
+
+    def test_admin_code_is_claimed_once(self):
+        AdminRegistrationCode.objects.create(code="letmein")
+        responses = [
+            self.client.post(
+                "/api/admin/register/",
+                {"registration_code": "letmein", "email": email},
+                content_type="application/json",
+            )
+            for email in ("one@example.com", "two@example.com")
+        ]
+        self.assertEqual([r.status_code for r in responses], [201, 400])
+        self.assertTrue(User.objects.get(email="one@example.com").is_admin)
+        self.assertFalse(User.objects.filter(email="two@example.com").exists())
+
+
+class JobEventTests(JobFixtureTestCase):
+    client_pincode = "682016"
+
+    def setUp(self):
+        super().setUp()
+        self.other_category = ServiceCategory.objects.create(name="Painting")
+        self.addCleanup(events.new_jobs._subscriptions.clear)
+
+    def job(self, category, title="Fix sink"):
+        return Job(
+            **self.job_fields(title, service_category=category, pincode="682016")
+        )
+
+    async def listen(self, headers=None, **params):
+        response = await self.async_client.get(
+            "/api/async/jobs/events/", params, headers=headers
+        )
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+        stream = aiter(response.streaming_content)
+        self.assertEqual(await anext(stream), b"retry: 3000\n\n")
+        return stream
+
+    async def next_event(self, stream):
+        chunk = await asyncio.wait_for(anext(stream), timeout=1)
+        event_id, event, data = chunk.decode().strip().split("\n")
+        self.assertEqual(event, "event: job")
+        row = json.loads(data.removeprefix("data: "))
+        self.assertEqual(event_id, f"id: {row['id']}")
+        return row
+
+    async def test_new_matching_jobs_are_pushed(self):
+        stream = await self.listen(service_category=self.category.id, pincode="682016")
+        ignored = self.job(self.other_category, "Paint wall")
+        wanted = self.job(self.category)
+        await asyncio.to_thread(events.new_jobs.publish, [ignored, wanted])
+        row = await self.next_event(stream)
+        self.assertEqual(row["id"], str(wanted.id))
+        self.assertEqual(row["service_category_name"], "Plumbing")
+
+    async def test_closed_stream_unsubscribes(self):
+        stream = async_views.job_event_stream(None, None, None)
+        await anext(stream)
+        self.assertEqual(len(events.new_jobs._subscriptions), 1)
+        await stream.aclose()
+        self.assertEqual(events.new_jobs._subscriptions, set())
+
+    async def test_reconnect_replays_missed_jobs(self):
+        @sync_to_async
+        def create(category, title):
+            job = self.job(category, title)
+            job.save()
+            return job
+
+        seen = await create(self.category, "Seen")
+        await create(self.other_category, "Paint wall")
+        missed = await create(self.category, "Missed")
+
+        stream = await self.listen(
+            headers={"Last-Event-ID": str(seen.id)}, service_category=self.category.id
+        )
+        self.assertEqual((await self.next_event(stream))["id"], str(missed.id))
+
+    def test_created_jobs_are_published_on_commit(self):
+        publish = mock.patch.object(events.new_jobs, "publish").start()
+        self.addCleanup(mock.patch.stopall)
+        with self.captureOnCommitCallbacks(execute=True):
+            job = self.job(self.category)
+            job.save()
+            bulk.create_jobs(
+                [
+                    {
+                        "title": "Bulk job",
+                        "description": "Imported",
+                        "user": str(self.client_user.id),
+                        "service_category": str(self.category.id),
+                        "budget": "100",
+                        "location": "Kochi",
+                    }
+                ]
+            )
+            publish.assert_not_called()
+        self.assertEqual(publish.call_count, 2)
+        self.assertEqual(publish.call_args_list[0].args, ([job],))
+        self.assertEqual(publish.call_args_list[1].args[0][0].title, "Bulk job")
+
+
+class ExportTests(JobFixtureTestCase):
+    def setUp(self):
+        super().setUp()
+        self.workers = [self.create_worker(f"worker{i}@example.com") for i in range(2)]
+        self.job = self.create_job()
+        for worker in self.workers:
+            self.client.post(
+                "/api/jobs/apply/", {"job_id": self.job.id, "userId": worker.id}
+            )
+        self.client.post(
+            "/api/job-acceptance/",
+            {"job_id": self.job.id, "applicantId": self.workers[0].id},
+        )
+
+    def export(self, entity, **params):
+        response = self.client.get(f"/api/export/{entity}/", params)
+        self.assertEqual(response.status_code, 200)
+        return b"".join(response.streaming_content)
+
+    def test_applications_ndjson_includes_accepted(self):
+        rows = [json.loads(line) for line in self.export("applications").splitlines()]
+        self.assertEqual(
+            {(row["worker_id"], row["status"]) for row in rows},
+            {
+                (str(self.workers[0].id), "accepted"),
+                (str(self.workers[1].id), "pending"),
+            },
+        )
+
+    def test_csv(self):
+        body = self.export("applications", output="csv").decode()
+        rows = list(csv.DictReader(io.StringIO(body)))
+        self.assertEqual(len(rows), 2)
+        self.assertEqual(
+            set(rows[0]), {"id", "created_at", "job_id", "worker_id", "status"}
+        )
+        self.assertEqual(rows[0]["job_id"], str(self.job.id))
+
+    def test_gzip(self):
+        response = self.client.get("/api/export/jobs/", HTTP_ACCEPT_ENCODING="gzip")
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        body = gzip.decompress(b"".join(response.streaming_content))
+        self.assertEqual(json.loads(body)["id"], str(self.job.id))
+
+    def test_since(self):
+        later = (self.job.created_at + timedelta(seconds=1)).isoformat()
+        self.assertEqual(self.export("jobs", since=later), b"")
+        self.assertEqual(len(self.export("jobs", since="2000-01-01").splitlines()), 1)
+        # Users have no creation time
+        for entity, since in (("jobs", "soon"), ("users", "2000-01-01")):
+            response = self.client.get(f"/api/export/{entity}/", {"since": since})
+            self.assertEqual(response.status_code, 400)
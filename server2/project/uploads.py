@@ -0,0 +1,142 @@
+"""
+Chunked, resumable uploads. A client starts a session with the file's size
+and SHA-256, sends the bytes in any number of chunks, each at the offset the
+server has so far, then finalizes. Chunks are streamed to a temp file in
+``UPLOAD_TEMP_DIR`` so memory use doesn't grow with the file, and after a
+dropped connection the client asks for the offset and carries on from there.
+"""
+
+import hashlib
+from datetime import timedelta
+from pathlib import Path
+
+from django.conf import settings
+from django.core.files import File
+from django.db import transaction
+from django.utils import timezone
+from PIL import Image
+
+from .models import UploadSession
+
+READ_SIZE = 64 * 1024
+
+
+class UploadError(ValueError):
+    pass
+
+
+class OffsetMismatch(UploadError):
+    def __init__(self, received):
+        super().__init__(f"Expected a chunk starting at byte {received}")
+        self.received = received
+
+
+def temp_dir():
+    return Path(settings.UPLOAD_TEMP_DIR)
+
+
+def temp_path(session):
+    return temp_dir() / f"{session.pk}.part"
+
+
+def start(session):
+    temp_dir().mkdir(parents=True, exist_ok=True)
+    temp_path(session).write_bytes(b"")
+
+
+def append(session, offset, stream):
+    """
+    Write ``stream`` to the upload starting at ``offset``, which must be the
+    number of bytes received so far. Whatever arrives is kept even if the
+    connection drops mid-chunk. Returns the new offset.
+    """
+    if offset != session.received:
+        raise OffsetMismatch(session.received)
+
+    remaining = session.size - offset
+    with open(temp_path(session), "r+b") as f:
+        # Drop anything past the offset left by an interrupted write
+        f.seek(offset)
+        f.truncate()
+        try:
+            while chunk := stream.read(READ_SIZE):
+                if len(chunk) > remaining:
+                    raise UploadError(f"The file is only {session.size} bytes")
+                f.write(chunk)
+                remaining -= len(chunk)
+        finally:
+            received = f.tell()
+            # Conditional, so two copies of the same chunk can't both count
+            updated = UploadSession.objects.filter(
+                pk=session.pk, received=offset
+            ).update(received=received, updated_at=timezone.now())
+    if not updated:
+        session.refresh_from_db(fields=["received"])
+        raise OffsetMismatch(session.received)
+    session.received = received
+    return received
+
+
+def finish(session):
+    """
+    Check the upload is complete and matches its checksum, then attach it to
+    the user or job it was started for. Returns that user or job.
+    """
+    if session.received != session.size:
+        raise UploadError(
+            f"Upload incomplete: {session.received} of {session.size} bytes received"
+        )
+
+    if session.target == "job_image":
+        instance, field = session.job, "image"
+    else:
+        instance, field = session.user, "qualification_certificate"
+
+    path = temp_path(session)
+    with open(path, "rb") as f:
+        if hashlib.file_digest(f, "sha256").hexdigest() != session.sha256:
+            discard(session)
+            raise UploadError("Checksum mismatch, upload the file again")
+        if field == "image":
+            f.seek(0)
+            try:
+                Image.open(f).verify()
+            except Exception:
+                discard(session)
+                raise UploadError("The file is not a valid image")
+        f.seek(0)
+        # Copied into storage in chunks, like any other File
+        getattr(instance, field).save(session.filename, File(f), save=False)
+
+    with transaction.atomic():
+        instance.save(update_fields=[field])
+        session.delete()
+    path.unlink(missing_ok=True)
+    return instance
+
+
+def discard(session):
+    temp_path(session).unlink(missing_ok=True)
+    session.delete()
+
+
+def clear_stale(max_age=None):
+    """
+    Drop sessions with no chunk for ``max_age`` (default
+    ``UPLOAD_SESSION_MAX_AGE``) and any temp file without a session.
+    Returns how many sessions were dropped.
+    """
+    max_age = max_age or timedelta(seconds=settings.UPLOAD_SESSION_MAX_AGE)
+    cutoff = timezone.now() - max_age
+    stale = list(UploadSession.objects.filter(updated_at__lt=cutoff))
+    for session in stale:
+        discard(session)
+
+    if temp_dir().is_dir():
+        live = {
+            f"{pk}.part" for pk in UploadSession.objects.values_list("pk", flat=True)
+        }
+        for path in temp_dir().glob("*.part"):
+            if path.name not in live and path.stat().st_mtime < cutoff.timestamp():
+                path.unlink(missing_ok=True)
+    return len(stale)
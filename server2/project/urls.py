@@ -1,15 +1,23 @@
 from django.urls import path
-from . import views
+from . import async_views, views
 from .views import (
     UserSignupView,
     UserLoginView,
     ServiceCategoryListView,
+    ServiceCategoryOpenJobsView,
     JobCreateView,
+    JobBulkCreateView,
     JobsByClientView,
     JobsForSeekersView,
+    JobSearchView,
+    NearbyJobsView,
     JobApplicationView,
+    JobBatchApplicationView,
     MyApplicationsView,
     UserProfileUpdateView,
+    UploadSessionCreateView,
+    UploadSessionView,
+    UploadFinalizeView,
     RequestedApplicationsView,
     UserPostedJobsView,
     JobRequestListView,
@@ -19,6 +27,7 @@ from .views import (
     NonVerifiedUsersView,
     AcceptUserView,
     CompletedJobsView,
+    CompletedJobHistoryView,
     DeleteUserView,
     AllUsersView,
     ComplaintCreateView,
@@ -40,12 +49,32 @@ urlpatterns = [
         ServiceCategoryListView.as_view(),
         name="service-categories",
     ),
+    path(
+        "service-categories/open-jobs/",
+        ServiceCategoryOpenJobsView.as_view(),
+        name="service-category-open-jobs",
+    ),
     path("jobs/create/", JobCreateView.as_view(), name="job-create"),
+    path("jobs/bulk-create/", JobBulkCreateView.as_view(), name="job-bulk-create"),
     path("jobs/client/", JobsByClientView.as_view(), name="jobs-by-client"),
     path("jobs/available/", JobsForSeekersView.as_view(), name="jobs-for-seekers"),
+    path("jobs/search/", JobSearchView.as_view(), name="job-search"),
+    path("jobs/nearby/", NearbyJobsView.as_view(), name="jobs-nearby"),
     path("jobs/apply/", JobApplicationView.as_view(), name="job-apply"),
+    path(
+        "jobs/apply/batch/",
+        JobBatchApplicationView.as_view(),
+        name="job-apply-batch",
+    ),
     path("jobs/my-applications/", MyApplicationsView.as_view(), name="my-applications"),
     path("user/profile/", UserProfileUpdateView.as_view(), name="user-profile"),
+    path("uploads/", UploadSessionCreateView.as_view(), name="upload-create"),
+    path("uploads/<uuid:upload_id>/", UploadSessionView.as_view(), name="upload"),
+    path(
+        "uploads/<uuid:upload_id>/finalize/",
+        UploadFinalizeView.as_view(),
+        name="upload-finalize",
+    ),
     path(
         "user/requested-applications/",
         RequestedApplicationsView.as_view(),
@@ -61,8 +90,32 @@ urlpatterns = [
     path("jobs/delete/", JobDeleteView.as_view(), name="job-delete"),
     path("jobs/complete/", JobCompleteView.as_view(), name="job-complete"),
     path("jobs/completed/", CompletedJobsView.as_view(), name="completed-jobs"),
+    path(
+        "jobs/completed/history/",
+        CompletedJobHistoryView.as_view(),
+        name="completed-jobs-history",
+    ),
     path("user/delete/", DeleteUserView.as_view(), name="delete-user"),
     path("complaints/create/", ComplaintCreateView.as_view(), name="complaint-create"),
     path("complaints/", ComplaintsListView.as_view(), name="complaints-list"),
     path("admin/register/", AdminRegistrationView.as_view(), name="admin-register"),
+    path("export/<str:entity>/", views.export, name="export"),
+    # Async versions of the hot reads, for ASGI deployments
+    path(
+        "async/jobs/available/",
+        async_views.jobs_for_seekers,
+        name="async-jobs-for-seekers",
+    ),
+    path(
+        "async/jobs/my-applications/",
+        async_views.my_applications,
+        name="async-my-applications",
+    ),
+    path(
+        "async/service-categories/",
+        async_views.service_categories,
+        name="async-service-categories",
+    ),
+    path("async/user/profile/", async_views.user_profile, name="async-user-profile"),
+    path("async/jobs/events/", async_views.job_events, name="async-job-events"),
 ]
@@ -1,24 +1,54 @@
+from django.conf import settings
 from django.shortcuts import render
-from django.http import JsonResponse
+from django.db import IntegrityError, transaction
+from django.db.models import Prefetch, Q
+from django.db.models.functions import Coalesce
+from django.http import (
+    FileResponse,
+    HttpResponse,
+    JsonResponse,
+    StreamingHttpResponse,
+)
+from django.utils.cache import get_conditional_response
+from django.utils.encoding import filepath_to_uri
+from django.utils.dateparse import parse_datetime
+from django.utils.http import http_date, parse_etags
+from django.views.decorators.http import require_GET, require_safe
 from rest_framework import status
+from rest_framework.exceptions import APIException
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework.parsers import MultiPartParser, FormParser
 from .serializers import (
     UserSerializer,
     ServiceCategorySerializer,
+    ServiceCategoryOpenJobsSerializer,
     JobSerializer,
+    ClientJobSerializer,
     JobAcceptanceSerializer,
     ComplaintSerializer,
+    UploadSessionSerializer,
 )
 from .models import (
     ServiceCategory,
     User,
     Job,
     JobAcceptance,
+    Application,
     Complaint,
     AdminRegistrationCode,
+    CompletedJobSummary,
+    UploadSession,
 )
+from . import cache, counters, media, uploads
+from .bulk import MAX_APPLY_JOBS, apply_to_jobs, create_jobs
+from .export import EXPORTS, export_stream
+from .history import record_completion, summary_data
+from .geo import MAX_RADIUS_KM, cells_within, distance_km, lookup_pincode
+from .parsers import CSVParser, NDJSONParser
+from .pagination import InvalidPage, keyset_page, parse_limit
+from .search import search_jobs
+from .streaming import iterate, streaming_json_response
 from django.utils import timezone
 
 
@@ -27,17 +57,137 @@ def index(request):
     return JsonResponse({"message": "Hello, world!", "status": "success"})
 
 
+@require_safe
+def serve_media(request, path):
+    """
+    Serve an uploaded file from MEDIA_ROOT, see media.py. Revalidation and
+    unchanged files get a 304 without reading the file; with ``MEDIA_ACCEL``
+    set the body is sent by the front proxy.
+    """
+    file_path = media.resolve(path)
+    if file_path is None:
+        return JsonResponse(
+            {"message": "File not found", "status": "error"},
+            status=status.HTTP_404_NOT_FOUND,
+        )
+
+    stat = file_path.stat()
+    etag = media.etag(file_path, stat)
+    headers = {
+        "ETag": etag,
+        "Last-Modified": http_date(stat.st_mtime),
+        "Cache-Control": media.cache_control(path),
+        "Accept-Ranges": "bytes",
+    }
+    content_type = media.content_type(file_path)
+
+    response = get_conditional_response(
+        request, etag=etag, last_modified=int(stat.st_mtime)
+    )
+    if response is None and (accel := media.accel_headers(path, file_path)):
+        # The proxy also takes care of Range
+        response = HttpResponse(content_type=content_type, headers=accel)
+    elif response is None:
+        if_range = request.headers.get("If-Range")
+        try:
+            byte_range = (
+                media.parse_range(request.headers.get("Range"), stat.st_size)
+                if if_range in (None, etag)
+                else None
+            )
+        except media.UnsatisfiableRange:
+            response = HttpResponse(
+                status=416, headers={"Content-Range": f"bytes */{stat.st_size}"}
+            )
+        else:
+            if byte_range is None:
+                response = FileResponse(
+                    open(file_path, "rb"), content_type=content_type
+                )
+            else:
+                start, end = byte_range
+                response = StreamingHttpResponse(
+                    media.read_range(file_path, start, end),
+                    status=206,
+                    content_type=content_type,
+                    headers={
+                        "Content-Range": f"bytes {start}-{end}/{stat.st_size}",
+                        "Content-Length": str(end - start + 1),
+                    },
+                )
+
+    for header, value in headers.items():
+        response[header] = value
+    return response
+
+
+@require_GET
+def export(request, entity):
+    """
+    Stream every row of ``entity`` as NDJSON (default) or CSV, gzipped when
+    the client accepts it. ``since`` limits the export to rows created at or
+    after the given timestamp.
+    """
+    if entity not in EXPORTS:
+        return JsonResponse(
+            {"message": "Unknown export", "status": "error"},
+            status=status.HTTP_404_NOT_FOUND,
+        )
+    build_queryset, since_field = EXPORTS[entity]
+
+    output = request.GET.get("output", "ndjson")
+    if output not in ("ndjson", "csv"):
+        return JsonResponse(
+            {"message": "output must be ndjson or csv", "status": "error"},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
+    queryset = build_queryset()
+    since = request.GET.get("since")
+    if since and since_field is None:
+        return JsonResponse(
+            {
+                "message": f"{entity} has no creation time to filter on",
+                "status": "error",
+            },
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+    if since:
+        try:
+            # Accept a full timestamp or a bare date
+            since_value = parse_datetime(since) or parse_datetime(f"{since}T00:00")
+        except ValueError:
+            since_value = None
+        if since_value is None:
+            return JsonResponse(
+                {"message": "since must be a date or timestamp", "status": "error"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if timezone.is_naive(since_value):
+            since_value = timezone.make_aware(since_value)
+        queryset = queryset.filter(**{f"{since_field}__gte": since_value})
+
+    gzip = "gzip" in request.headers.get("Accept-Encoding", "")
+    response = StreamingHttpResponse(
+        export_stream(queryset, output, gzip=gzip),
+        content_type="text/csv" if output == "csv" else "application/x-ndjson",
+    )
+    response["Content-Disposition"] = f'attachment; filename="{entity}.{output}"'
+    response["Vary"] = "Accept-Encoding"
+    if gzip:
+        response["Content-Encoding"] = "gzip"
+    return response
+
+
 class UserSignupView(APIView):
     def post(self, request):
         serializer = UserSerializer(data=request.data)
         if serializer.is_valid():
-            user = serializer.save()
+            # Workers wait for admin verification, clients are verified at once
             if request.data.get("user_type") == "worker":
-                user.is_worker = True
-                user.save()
+                serializer.save(is_worker=True)
             else:
-                user.is_verified = True
-                user.save()
+                serializer.save(is_verified=True)
             return Response(serializer.data, status=status.HTTP_201_CREATED)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
@@ -82,8 +232,9 @@ class NonVerifiedUsersView(APIView):
             )
 
             # Serialize with service category name
-            users_data = [
-                {
+            users_data = iterate(
+                non_verified_users,
+                lambda user: {
                     "id": str(user.id),
                     "full_name": user.full_name,
                     "email": user.email,
@@ -97,11 +248,11 @@ class NonVerifiedUsersView(APIView):
                         else None
                     ),
                     # ... other fields ...
-                }
-                for user in non_verified_users
-            ]
+                },
+            )
 
-            return Response(users_data, status=status.HTTP_200_OK)
+            # This endpoint has always returned a bare list
+            return streaming_json_response(users_data)
         except Exception as e:
             return Response(
                 {"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR
@@ -120,7 +271,7 @@ class AcceptUserView(APIView):
 
             user = User.objects.get(id=user_id)
             user.is_verified = True
-            user.save()
+            user.save(update_fields=["is_verified"])
 
             return Response(
                 {"message": "User accepted successfully", "status": "success"},
@@ -140,9 +291,41 @@ class AcceptUserView(APIView):
 
 class ServiceCategoryListView(APIView):
     def get(self, request):
-        categories = ServiceCategory.objects.all()
-        serializer = ServiceCategorySerializer(categories, many=True)
-        return Response(serializer.data)
+        # Revalidation is answered from the cached ETag without touching the DB
+        etag = cache.service_categories.peek_etag()
+        if etag and etag in parse_etags(request.headers.get("If-None-Match", "")):
+            response = HttpResponse(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            body, etag = cache.service_categories.get(
+                lambda: ServiceCategorySerializer(
+                    ServiceCategory.objects.all(), many=True
+                ).data
+            )
+            response = HttpResponse(body, content_type="application/json")
+        response["ETag"] = etag
+        response["Cache-Control"] = "no-cache"
+        return response
+
+
+class ServiceCategoryOpenJobsView(APIView):
+    # Kept out of the cached category list, which changes far less often
+    def get(self, request):
+        try:
+            serializer = ServiceCategoryOpenJobsSerializer(
+                ServiceCategory.objects.all(), many=True
+            )
+            return Response(
+                {
+                    "message": "Open job counts fetched successfully",
+                    "data": serializer.data,
+                    "status": "success",
+                }
+            )
+        except Exception as e:
+            return Response(
+                {"message": str(e), "status": "error"},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            )
 
 
 class JobCreateView(APIView):
@@ -169,7 +352,9 @@ class JobCreateView(APIView):
 
         serializer = JobSerializer(data=job_data)
         if serializer.is_valid():
-            job = serializer.save()
+            with transaction.atomic():
+                job = serializer.save()
+                counters.add_open_jobs([job.service_category_id])
             return Response(
                 {
                     "message": "Job created successfully",
@@ -184,6 +369,35 @@ class JobCreateView(APIView):
         )
 
 
+class JobBulkCreateView(APIView):
+    parser_classes = (NDJSONParser, CSVParser)
+
+    def post(self, request):
+        try:
+            created, errors = create_jobs(request.data)
+            return Response(
+                {
+                    "message": f"{len(created)} jobs created, {len(errors)} rejected",
+                    "data": {
+                        "created": [str(job.id) for job in created],
+                        "errors": errors,
+                    },
+                    "status": "success" if created else "error",
+                },
+                status=(
+                    status.HTTP_201_CREATED if created else status.HTTP_400_BAD_REQUEST
+                ),
+            )
+        except APIException:
+            # Unsupported media type and the like keep their own status
+            raise
+        except Exception as e:
+            return Response(
+                {"message": str(e), "status": "error"},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            )
+
+
 class JobsByClientView(APIView):
     def get(self, request):
         client_id = request.query_params.get("client_id")
@@ -194,8 +408,8 @@ class JobsByClientView(APIView):
             )
 
         try:
-            jobs = Job.objects.filter(client=client_id)
-            serializer = JobSerializer(jobs, many=True)
+            jobs = Job.objects.filter(user_id=client_id).order_by("-created_at")
+            serializer = ClientJobSerializer(jobs, many=True)
             return Response(
                 {
                     "message": "Jobs fetched successfully",
@@ -221,7 +435,7 @@ class UserPostedJobsView(APIView):
 
         try:
             jobs = Job.objects.filter(user_id=user_id).order_by("-created_at")
-            serializer = JobSerializer(jobs, many=True)
+            serializer = ClientJobSerializer(jobs, many=True)
 
             return Response(
                 {
@@ -237,6 +451,23 @@ class UserPostedJobsView(APIView):
             )
 
 
+def open_jobs(service_category=None, location=None):
+    """Jobs that are not completed, optionally in one category and location."""
+    jobs = Job.objects.filter(is_completed=False)
+    if service_category:
+        jobs = jobs.filter(service_category=service_category)
+    if location:
+        jobs = jobs.filter(location=location)
+    return jobs
+
+
+def applied_jobs(user_id):
+    """IDs of the jobs a worker has applied to."""
+    return Application.objects.filter(worker_id=user_id).values_list(
+        "job_id", flat=True
+    )
+
+
 class JobsForSeekersView(APIView):
     def get(self, request):
         try:
@@ -252,34 +483,207 @@ class JobsForSeekersView(APIView):
             #     )
 
             # Start with all jobs that are not completed
-            jobs = Job.objects.filter(is_completed=False)
+            shared_jobs = open_jobs(service_category, location)
 
             # Get all job IDs that the user has already applied for
-            applied_job_ids = JobAcceptance.objects.filter(
-                job_seekers__id=user_id
-            ).values_list("job_id", flat=True)
+            applied_job_ids = applied_jobs(user_id)
+
+            # Cursor-paginated mode, opted into by passing limit or cursor
+            limit = request.query_params.get("limit")
+            cursor = request.query_params.get("cursor")
+            if limit is not None or cursor is not None:
+                # Exclude jobs that the user has already applied for
+                jobs = shared_jobs
+                if user_id:
+                    jobs = jobs.exclude(id__in=applied_job_ids)
+                page, next_cursor = keyset_page(
+                    jobs,
+                    ("-created_at", "-id"),
+                    cursor=cursor,
+                    limit=parse_limit(limit),
+                )
+                serializer = JobSerializer(page, many=True)
+                return Response(
+                    {
+                        "message": "Jobs fetched successfully",
+                        "data": serializer.data,
+                        "next": next_cursor,
+                        "status": "success",
+                    }
+                )
+
+            # Full feed: the shared category/location list comes from the feed
+            # cache and the worker's applications are dropped in memory
+            rows = cache.job_feeds.get_feed(
+                service_category,
+                location,
+                lambda: JobSerializer(
+                    shared_jobs.order_by("-created_at", "-id"), many=True
+                ).data,
+            )
+            applied = (
+                cache.job_feeds.get_applied(user_id, lambda: applied_job_ids)
+                if user_id
+                else frozenset()
+            )
+            return Response(
+                {
+                    "message": "Jobs fetched successfully",
+                    "data": [row for row in rows if row["id"] not in applied],
+                    "status": "success",
+                }
+            )
 
-            # Exclude jobs that the user has already applied for
-            jobs = jobs.exclude(id__in=applied_job_ids)
+        except InvalidPage as e:
+            return Response(
+                {"message": str(e), "status": "error"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        except Exception as e:
+            return Response(
+                {"message": str(e), "status": "error"},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            )
 
-            # Apply filters if provided
-            if service_category:
-                jobs = jobs.filter(service_category=service_category)
-            if location:
-                jobs = jobs.filter(location=location)
 
-            # Order by most recent first
-            jobs = jobs.order_by("-created_at")
+class JobSearchView(APIView):
+    def get(self, request):
+        try:
+            query = request.query_params.get("q", "").strip()
+            if not query:
+                return Response(
+                    {"message": "Search query is required", "status": "error"},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
 
+            jobs, next_cursor = search_jobs(
+                query,
+                service_category=request.query_params.get("service_category"),
+                is_completed=request.query_params.get("is_completed") == "true",
+                cursor=request.query_params.get("cursor"),
+                limit=parse_limit(request.query_params.get("limit")),
+            )
             serializer = JobSerializer(jobs, many=True)
             return Response(
                 {
                     "message": "Jobs fetched successfully",
                     "data": serializer.data,
+                    "next": next_cursor,
+                    "status": "success",
+                }
+            )
+
+        except (InvalidPage, ValueError) as e:
+            return Response(
+                {"message": str(e), "status": "error"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        except Exception as e:
+            return Response(
+                {"message": str(e), "status": "error"},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            )
+
+
+class NearbyJobsView(APIView):
+    def get(self, request):
+        try:
+            pincode = request.query_params.get("pincode")
+            user_id = request.query_params.get("userId")
+            service_category = request.query_params.get("service_category")
+
+            if not pincode and user_id:
+                pincode = (
+                    User.objects.filter(id=user_id)
+                    .values_list("pincode", flat=True)
+                    .first()
+                )
+            if not pincode:
+                return Response(
+                    {"message": "Pincode or User ID is required", "status": "error"},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+
+            try:
+                radius_km = float(request.query_params.get("radius_km", 10))
+            except ValueError:
+                radius_km = -1
+            if not 0 < radius_km <= MAX_RADIUS_KM:
+                return Response(
+                    {
+                        "message": f"radius_km must be between 0 and {MAX_RADIUS_KM}",
+                        "status": "error",
+                    },
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+            limit = parse_limit(request.query_params.get("limit"))
+
+            candidates = Job.objects.filter(is_completed=False)
+            if user_id:
+                candidates = candidates.exclude(id__in=applied_jobs(user_id))
+            if service_category:
+                candidates = candidates.filter(service_category=service_category)
+
+            origin = lookup_pincode(pincode)
+            if origin is None:
+                # A pincode we have no coordinates for, so neither do its jobs:
+                # they can't be measured, but they are still the nearest ones
+                jobs_data = JobSerializer(
+                    candidates.filter(pincode=pincode.strip()).order_by(
+                        "-created_at", "-id"
+                    )[:limit],
+                    many=True,
+                ).data
+                for job_data in jobs_data:
+                    job_data["distance_km"] = None
+                return Response(
+                    {
+                        "message": "Jobs fetched successfully",
+                        "data": jobs_data,
+                        "status": "success",
+                    }
+                )
+
+            # Only read the grid cells overlapping the search radius
+            candidates = candidates.filter(
+                geo_cell__in=cells_within(origin.latitude, origin.longitude, radius_km)
+            )
+
+            nearby = []
+            for job_id, latitude, longitude in candidates.values_list(
+                "id", "latitude", "longitude"
+            ):
+                distance = distance_km(
+                    origin.latitude, origin.longitude, latitude, longitude
+                )
+                if distance <= radius_km:
+                    nearby.append((distance, job_id))
+            nearby.sort()
+            nearby = nearby[:limit]
+
+            jobs = Job.objects.in_bulk([job_id for _, job_id in nearby])
+            nearby = [
+                (distance, job_id) for distance, job_id in nearby if job_id in jobs
+            ]
+            jobs_data = JobSerializer(
+                [jobs[job_id] for _, job_id in nearby], many=True
+            ).data
+            for job_data, (distance, _) in zip(jobs_data, nearby):
+                job_data["distance_km"] = round(distance, 2)
+
+            return Response(
+                {
+                    "message": "Jobs fetched successfully",
+                    "data": jobs_data,
                     "status": "success",
                 }
             )
 
+        except InvalidPage as e:
+            return Response(
+                {"message": str(e), "status": "error"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
         except Exception as e:
             return Response(
                 {"message": str(e), "status": "error"},
@@ -318,19 +722,76 @@ class JobApplicationView(APIView):
                 )
 
             # Check if already applied
-            if JobAcceptance.objects.filter(job=job, job_seekers=user).exists():
+            already_applied = Response(
+                {"message": "Already applied to this job", "status": "error"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+            if Application.objects.filter(worker=user, job=job).exists():
+                return already_applied
+
+            # Create job application; the unique (worker, job) constraint
+            # catches a concurrent duplicate
+            try:
+                with transaction.atomic():
+                    Application.objects.create(job=job, worker=user)
+                    job_acceptance = JobAcceptance.objects.create(job=job)
+                    job_acceptance.job_seekers.add(user)
+                    counters.add_applicants([job.pk])
+            except IntegrityError:
+                return already_applied
+
+            return Response(
+                {"message": "Application submitted successfully", "status": "success"},
+                status=status.HTTP_201_CREATED,
+            )
+
+        except Exception as e:
+            return Response(
+                {"message": str(e), "status": "error"},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            )
+
+
+class JobBatchApplicationView(APIView):
+    def post(self, request):
+        try:
+            job_ids = request.data.get("job_ids")
+            user_id = request.data.get("userId")
+
+            if not isinstance(job_ids, list) or not job_ids or not user_id:
                 return Response(
-                    {"message": "Already applied to this job", "status": "error"},
+                    {
+                        "message": "A list of job IDs and a User ID are required",
+                        "status": "error",
+                    },
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+            if len(job_ids) > MAX_APPLY_JOBS:
+                return Response(
+                    {
+                        "message": f"At most {MAX_APPLY_JOBS} jobs per request",
+                        "status": "error",
+                    },
                     status=status.HTTP_400_BAD_REQUEST,
                 )
 
-            # Create job application
-            job_acceptance = JobAcceptance.objects.create(job=job)
-            job_acceptance.job_seekers.add(user)
+            try:
+                user = User.objects.get(id=user_id, is_worker=True)
+            except User.DoesNotExist:
+                return Response(
+                    {"message": "Worker not found", "status": "error"},
+                    status=status.HTTP_404_NOT_FOUND,
+                )
 
+            outcomes = apply_to_jobs(user, job_ids)
+            applied = sum(outcome["status"] == "applied" for outcome in outcomes)
             return Response(
-                {"message": "Application submitted successfully", "status": "success"},
-                status=status.HTTP_201_CREATED,
+                {
+                    "message": f"{applied} applications submitted",
+                    "data": outcomes,
+                    "status": "success",
+                },
+                status=status.HTTP_201_CREATED if applied else status.HTTP_200_OK,
             )
 
         except Exception as e:
@@ -340,6 +801,44 @@ class JobApplicationView(APIView):
             )
 
 
+def worker_applications(user_id, application_status=None):
+    """One projected row per application of a worker, for ``application_data``."""
+    # Applications the worker is still an applicant on, or was assigned
+    applied = JobAcceptance.job_seekers.through.objects.filter(user_id=user_id).values(
+        "jobacceptance_id"
+    )
+    applications = JobAcceptance.objects.filter(
+        Q(id__in=applied) | Q(assigned_to_id=user_id)
+    )
+    if application_status:
+        applications = applications.filter(status=application_status)
+    return applications.values(
+        "id",
+        "created_at",
+        "status",
+        "job__title",
+        "job__description",
+        "job__budget",
+        "job__location",
+        "job__user__full_name",
+        "job__service_category__name",
+    )
+
+
+def application_data(row):
+    return {
+        "id": str(row["id"]),
+        "job_title": row["job__title"],
+        "job_description": row["job__description"],
+        "budget": float(row["job__budget"]),  # Convert Decimal to float
+        "location": row["job__location"],
+        "client_name": row["job__user__full_name"],
+        "applied_date": row["created_at"].isoformat(),  # Format datetime
+        "status": row["status"],
+        "service_category": row["job__service_category__name"],
+    }
+
+
 class MyApplicationsView(APIView):
     def get(self, request):
         try:
@@ -350,36 +849,31 @@ class MyApplicationsView(APIView):
                     status=status.HTTP_400_BAD_REQUEST,
                 )
 
-            # Get user's applications
-            user = User.objects.get(id=user_id)
-            applications = JobAcceptance.objects.filter(job_seekers=user)
-            if not applications.exists():
-                applications = JobAcceptance.objects.filter(assigned_to=user)
-
-            # Prepare response data
-            application_data = []
-            for application in applications:
-                job = application.job
-                application_data.append(
-                    {
-                        "id": str(application.id),  # Convert UUID to string
-                        "job_title": job.title,
-                        "job_description": job.description,
-                        "budget": float(job.budget),  # Convert Decimal to float
-                        "location": job.location,
-                        "client_name": job.user.full_name,  # Changed from client to user
-                        "applied_date": application.created_at.isoformat(),  # Format datetime
-                        "status": application.status,
-                        "service_category": (
-                            job.service_category.name if job.service_category else None
-                        ),
-                    }
+            applications = worker_applications(
+                user_id, request.query_params.get("status")
+            )
+            ordering = ("-created_at", "-id")
+            # Cursor-paginated mode, opted into by passing limit or cursor
+            limit = request.query_params.get("limit")
+            cursor = request.query_params.get("cursor")
+            page = {}
+            if limit is not None or cursor is not None:
+                rows, page["next"] = keyset_page(
+                    applications, ordering, cursor=cursor, limit=parse_limit(limit)
                 )
+            else:
+                rows = list(applications.order_by(*ordering))
+
+            # Only an empty first page needs to tell "no applications" apart
+            # from "no such user"
+            if not rows and not cursor and not User.objects.filter(id=user_id).exists():
+                raise User.DoesNotExist
 
             return Response(
                 {
                     "message": "Applications fetched successfully",
-                    "data": application_data,
+                    "data": [application_data(row) for row in rows],
+                    **page,
                     "status": "success",
                 }
             )
@@ -389,6 +883,11 @@ class MyApplicationsView(APIView):
                 {"message": "User not found", "status": "error"},
                 status=status.HTTP_404_NOT_FOUND,
             )
+        except InvalidPage as e:
+            return Response(
+                {"message": str(e), "status": "error"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
         except Exception as e:
             return Response(
                 {"message": str(e), "status": "error"},
@@ -461,6 +960,165 @@ class UserProfileUpdateView(APIView):
             )
 
 
+class UploadSessionCreateView(APIView):
+    """Start a chunked upload, see uploads.py."""
+
+    def post(self, request):
+        try:
+            serializer = UploadSessionSerializer(data=request.data)
+            if not serializer.is_valid():
+                return Response(
+                    {
+                        "message": "Invalid data",
+                        "errors": serializer.errors,
+                        "status": "error",
+                    },
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+            session = serializer.save()
+            uploads.start(session)
+            return Response(
+                {
+                    "message": "Upload started",
+                    "data": serializer.data,
+                    "status": "success",
+                },
+                status=status.HTTP_201_CREATED,
+            )
+
+        except Exception as e:
+            return Response(
+                {"message": str(e), "status": "error"},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            )
+
+
+class UploadSessionView(APIView):
+    """
+    GET reports how many bytes have arrived, PUT appends the raw request body
+    at the ``Upload-Offset`` header, DELETE abandons the upload.
+    """
+
+    def get(self, request, upload_id):
+        try:
+            session = UploadSession.objects.get(id=upload_id)
+            return Response(
+                {
+                    "message": "Upload fetched successfully",
+                    "data": UploadSessionSerializer(session).data,
+                    "status": "success",
+                }
+            )
+
+        except UploadSession.DoesNotExist:
+            return Response(
+                {"message": "Upload not found", "status": "error"},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+
+    def put(self, request, upload_id):
+        try:
+            offset = request.headers.get("Upload-Offset", "")
+            if not offset.isdigit():
+                return Response(
+                    {"message": "Upload-Offset header is required", "status": "error"},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+
+            # request.stream, not request.data: the body is never buffered
+            if request.stream is None:
+                return Response(
+                    {"message": "The chunk is empty", "status": "error"},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+
+            session = UploadSession.objects.get(id=upload_id)
+            received = uploads.append(session, int(offset), request.stream)
+            return Response(
+                {
+                    "message": "Chunk received",
+                    "data": {"received": received, "size": session.size},
+                    "status": "success",
+                }
+            )
+
+        except UploadSession.DoesNotExist:
+            return Response(
+                {"message": "Upload not found", "status": "error"},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+        except uploads.OffsetMismatch as e:
+            return Response(
+                {
+                    "message": str(e),
+                    "data": {"received": e.received, "size": session.size},
+                    "status": "error",
+                },
+                status=status.HTTP_409_CONFLICT,
+            )
+        except uploads.UploadError as e:
+            return Response(
+                {"message": str(e), "status": "error"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        except Exception as e:
+            return Response(
+                {"message": str(e), "status": "error"},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            )
+
+    def delete(self, request, upload_id):
+        try:
+            uploads.discard(UploadSession.objects.get(id=upload_id))
+            return Response(
+                {"message": "Upload cancelled", "status": "success"},
+                status=status.HTTP_200_OK,
+            )
+
+        except UploadSession.DoesNotExist:
+            return Response(
+                {"message": "Upload not found", "status": "error"},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+
+
+class UploadFinalizeView(APIView):
+    def post(self, request, upload_id):
+        try:
+            session = UploadSession.objects.select_related("user", "job").get(
+                id=upload_id
+            )
+            target = uploads.finish(session)
+            serializer = (
+                JobSerializer(target, context={"request": request})
+                if isinstance(target, Job)
+                else UserSerializer(target, context={"request": request})
+            )
+            return Response(
+                {
+                    "message": "Upload complete",
+                    "data": serializer.data,
+                    "status": "success",
+                }
+            )
+
+        except UploadSession.DoesNotExist:
+            return Response(
+                {"message": "Upload not found", "status": "error"},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+        except uploads.UploadError as e:
+            return Response(
+                {"message": str(e), "status": "error"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        except Exception as e:
+            return Response(
+                {"message": str(e), "status": "error"},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            )
+
+
 class RequestedApplicationsView(APIView):
     def get(self, request):
         try:
@@ -471,43 +1129,75 @@ class RequestedApplicationsView(APIView):
                     status=status.HTTP_400_BAD_REQUEST,
                 )
 
-            # Get jobs posted by the user
-            user_jobs = Job.objects.filter(user_id=user_id)
-
-            # Get all applications for those jobs
-            applications_data = []
-            for job in user_jobs:
-                job_applications = JobAcceptance.objects.filter(job=job)
-
-                for application in job_applications:
-                    for seeker in application.job_seekers.all():
-                        applications_data.append(
-                            {
-                                "application_id": str(application.id),
-                                "job_title": job.title,
-                                "job_description": job.description,
-                                "budget": str(job.budget),
-                                "application_status": application.status,
-                                "applied_date": application.created_at,
-                                "applicant_name": seeker.full_name,  # Changed from first_name + last_name
-                                "applicant_email": seeker.email,
-                                "applicant_phone": seeker.mobile_number,  # Make sure this matches your model field name
-                                "service_category": job.service_category.name,
-                            }
-                        )
+            # One row per (application, applicant) straight off the through table
+            applications = JobAcceptance.job_seekers.through.objects.filter(
+                jobacceptance__job__user_id=user_id
+            )
+            job_id = request.query_params.get("job_id")
+            if job_id:
+                applications = applications.filter(jobacceptance__job_id=job_id)
+            application_status = request.query_params.get("status")
+            if application_status:
+                applications = applications.filter(
+                    jobacceptance__status=application_status
+                )
+
+            applications = applications.values(
+                "id",
+                "jobacceptance_id",
+                "jobacceptance__status",
+                "jobacceptance__created_at",
+                "jobacceptance__job__title",
+                "jobacceptance__job__description",
+                "jobacceptance__job__budget",
+                "jobacceptance__job__service_category__name",
+                "user__full_name",
+                "user__email",
+                "user__mobile_number",
+            )
+            ordering = ("-jobacceptance__created_at", "-id")
+            # Cursor-paginated mode, opted into by passing limit or cursor
+            limit = request.query_params.get("limit")
+            cursor = request.query_params.get("cursor")
+            page = {}
+            if limit is not None or cursor is not None:
+                rows, page["next"] = keyset_page(
+                    applications, ordering, cursor=cursor, limit=parse_limit(limit)
+                )
+            else:
+                rows = applications.order_by(*ordering)
+
+            applications_data = [
+                {
+                    "application_id": str(row["jobacceptance_id"]),
+                    "job_title": row["jobacceptance__job__title"],
+                    "job_description": row["jobacceptance__job__description"],
+                    "budget": str(row["jobacceptance__job__budget"]),
+                    "application_status": row["jobacceptance__status"],
+                    "applied_date": row["jobacceptance__created_at"],
+                    "applicant_name": row["user__full_name"],
+                    "applicant_email": row["user__email"],
+                    "applicant_phone": row["user__mobile_number"],
+                    "service_category": row[
+                        "jobacceptance__job__service_category__name"
+                    ],
+                }
+                for row in rows
+            ]
 
             return Response(
                 {
                     "message": "Applications fetched successfully",
                     "data": applications_data,
+                    **page,
                     "status": "success",
                 }
             )
 
-        except User.DoesNotExist:
+        except InvalidPage as e:
             return Response(
-                {"message": "User not found", "status": "error"},
-                status=status.HTTP_404_NOT_FOUND,
+                {"message": str(e), "status": "error"},
+                status=status.HTTP_400_BAD_REQUEST,
             )
         except Exception as e:
             return Response(
@@ -517,6 +1207,15 @@ class RequestedApplicationsView(APIView):
 
 
 class JobRequestListView(APIView):
+    # Applicant orderings; the through row id keeps each one total for paging
+    SORT_ORDERINGS = {
+        "recent": ("-jobacceptance__created_at", "-id"),
+        "works": ("user__works", "id"),
+        "-works": ("-user__works", "-id"),
+        "experience": ("experience_years", "id"),
+        "-experience": ("-experience_years", "-id"),
+    }
+
     def get(self, request):
         try:
             job_id = request.query_params.get("job_id")
@@ -526,66 +1225,107 @@ class JobRequestListView(APIView):
                     status=status.HTTP_400_BAD_REQUEST,
                 )
 
-            job_requests = JobAcceptance.objects.filter(job_id=job_id)
+            sort = request.query_params.get("sort", "recent")
+            if sort not in self.SORT_ORDERINGS:
+                return Response(
+                    {
+                        "message": "sort must be one of "
+                        + ", ".join(self.SORT_ORDERINGS),
+                        "status": "error",
+                    },
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
 
-            requests_data = []
-            for job_request in job_requests:
-                # Check if job is already assigned
-                if job_request.assigned_to:
-                    qualification_url = None
-                    if job_request.assigned_to.qualification_certificate:
-                        qualification_url = request.build_absolute_uri(
-                            job_request.assigned_to.qualification_certificate.url
-                        )
-                    return Response(
-                        {
-                            "message": "Job already assigned",
-                            "data": {
-                                "application_id": str(
-                                    job_request.assigned_to.id
-                                ),  # Changed to user ID
-                                "applicant_name": job_request.assigned_to.full_name,
-                                "applicant_qualification": qualification_url,
-                                "applicant_works": job_request.assigned_to.works or 0,
-                                "experience": job_request.assigned_to.experience
-                                or "Not specified",
-                                "applied_date": job_request.created_at.strftime(
-                                    "%Y-%m-%d"
-                                ),
-                                "status": job_request.status,
-                            },
-                            "status": "success",
-                        }
-                    )
+            # Build certificate URLs from one absolute media prefix
+            media_url = request.build_absolute_uri(settings.MEDIA_URL)
 
-                # If not assigned, return all applicants
-                for applicant in job_request.job_seekers.all():
-                    qualification_url = None
-                    if applicant.qualification_certificate:
-                        qualification_url = request.build_absolute_uri(
-                            applicant.qualification_certificate.url
-                        )
+            def qualification_url(name):
+                return media_url + filepath_to_uri(name) if name else None
 
-                    requests_data.append(
-                        {
-                            "application_id": str(applicant.id),  # Changed to user ID
-                            "applicant_name": applicant.full_name,
-                            "applicant_qualification": qualification_url,
-                            "applicant_works": applicant.works or 0,
-                            "experience": applicant.experience or "Not specified",
-                            "applied_date": job_request.created_at.strftime("%Y-%m-%d"),
-                            "status": job_request.status,
-                        }
-                    )
+            # Check if job is already assigned
+            assigned = (
+                JobAcceptance.objects.filter(job_id=job_id, assigned_to__isnull=False)
+                .select_related("assigned_to")
+                .first()
+            )
+            if assigned:
+                worker = assigned.assigned_to
+                return Response(
+                    {
+                        "message": "Job already assigned",
+                        "data": {
+                            "application_id": str(worker.id),  # Changed to user ID
+                            "applicant_name": worker.full_name,
+                            "applicant_qualification": qualification_url(
+                                worker.qualification_certificate.name
+                            ),
+                            "applicant_works": worker.works or 0,
+                            "experience": worker.experience or "Not specified",
+                            "applied_date": assigned.created_at.strftime("%Y-%m-%d"),
+                            "status": assigned.status,
+                        },
+                        "status": "success",
+                    }
+                )
+
+            # If not assigned, return all applicants
+            applicants = JobAcceptance.job_seekers.through.objects.filter(
+                jobacceptance__job_id=job_id
+            ).annotate(experience_years=Coalesce("user__experience", 0))
+            applicants = applicants.values(
+                "id",
+                "experience_years",
+                "jobacceptance__created_at",
+                "jobacceptance__status",
+                "user_id",
+                "user__full_name",
+                "user__qualification_certificate",
+                "user__works",
+                "user__experience",
+            )
+            ordering = self.SORT_ORDERINGS[sort]
+            # Cursor-paginated mode, opted into by passing limit or cursor
+            limit = request.query_params.get("limit")
+            cursor = request.query_params.get("cursor")
+            page = {}
+            if limit is not None or cursor is not None:
+                rows, page["next"] = keyset_page(
+                    applicants, ordering, cursor=cursor, limit=parse_limit(limit)
+                )
+            else:
+                rows = applicants.order_by(*ordering)
+
+            requests_data = [
+                {
+                    "application_id": str(row["user_id"]),  # Changed to user ID
+                    "applicant_name": row["user__full_name"],
+                    "applicant_qualification": qualification_url(
+                        row["user__qualification_certificate"]
+                    ),
+                    "applicant_works": row["user__works"] or 0,
+                    "experience": row["user__experience"] or "Not specified",
+                    "applied_date": row["jobacceptance__created_at"].strftime(
+                        "%Y-%m-%d"
+                    ),
+                    "status": row["jobacceptance__status"],
+                }
+                for row in rows
+            ]
 
             return Response(
                 {
                     "message": "Job requests fetched successfully",
                     "data": requests_data,
+                    **page,
                     "status": "success",
                 }
             )
 
+        except InvalidPage as e:
+            return Response(
+                {"message": str(e), "status": "error"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
         except Exception as e:
             return Response(
                 {"message": str(e), "status": "error"},
@@ -607,23 +1347,32 @@ class JobRequestUpdateView(APIView):
                     status=status.HTTP_400_BAD_REQUEST,
                 )
             try:
-                job_request = JobAcceptance.objects.get(job__id=job_id)
                 applicant = User.objects.get(id=applicantId)
-            except JobAcceptance.DoesNotExist:
+            except User.DoesNotExist:
                 return Response(
-                    {"message": "Job request not found", "status": "error"},
+                    {"message": "Applicant not found", "status": "error"},
                     status=status.HTTP_404_NOT_FOUND,
                 )
-            except User.DoesNotExist:
+            # The applicant's own request; a job has one per applicant
+            job_request = (
+                JobAcceptance.objects.filter(job_id=job_id, job_seekers=applicant)
+                .select_related("job")
+                .first()
+            )
+            if job_request is None:
                 return Response(
-                    {"message": "Applicant not found", "status": "error"},
+                    {"message": "Job request not found", "status": "error"},
                     status=status.HTTP_404_NOT_FOUND,
                 )
 
-            job_request.status = "accepted"
-            job_request.assigned_to = applicant
-            job_request.job_seekers.remove(applicantId)
-            job_request.save()
+            with transaction.atomic():
+                job_request.status = "accepted"
+                job_request.assigned_to = applicant
+                job_request.job_seekers.remove(applicant)
+                job_request.save()
+                Application.objects.filter(job_id=job_id, worker=applicant).update(
+                    status="accepted"
+                )
 
             # Prepare response data
             response_data = {
@@ -656,8 +1405,11 @@ class JobDeleteView(APIView):
         try:
             job_id = request.data.get("job_id")
 
-            job = Job.objects.get(id=job_id)
-            job.delete()
+            with transaction.atomic():
+                job = Job.objects.get(id=job_id)
+                job.delete()
+                if not job.is_completed:
+                    counters.add_open_jobs([job.service_category_id], -1)
             return Response(
                 {"message": "Job deleted successfully", "status": "success"},
                 status=status.HTTP_204_NO_CONTENT,
@@ -680,24 +1432,48 @@ class JobCompleteView(APIView):
                     status=status.HTTP_400_BAD_REQUEST,
                 )
 
-            # Get the job and update its status
-            job = Job.objects.get(id=job_id)
-            job.is_completed = True
-            job.save()
-
-            # Update the job acceptance status if it exists
-            try:
-                job_acceptance = JobAcceptance.objects.get(job=job)
-                job_acceptance.status = "completed"
-                job_acceptance.save()
+            with transaction.atomic():
+                # Get the job and update its status
+                job = Job.objects.select_related("user", "service_category").get(
+                    id=job_id
+                )
+                # Only the request that flips the flag moves the counters
+                newly_completed = Job.objects.filter(
+                    pk=job.pk, is_completed=False
+                ).update(is_completed=True)
+                job.is_completed = True
+                if newly_completed:
+                    counters.add_open_jobs([job.service_category_id], -1)
+                    # update() skips the post_save signal that invalidates the feed
+                    cache.on_change_and_commit(
+                        lambda: cache.job_feeds.invalidate_jobs([job])
+                    )
 
-                # Update the assigned worker's works count
-                if job_acceptance.assigned_to:
-                    worker = job_acceptance.assigned_to
-                    worker.works += 1
-                    worker.save()
-            except JobAcceptance.DoesNotExist:
-                pass  # If no job acceptance exists, that's fine
+                # Update the job acceptance status if it exists, preferring the
+                # one the job was assigned through
+                job_acceptance = (
+                    job.acceptances.filter(assigned_to__isnull=False)
+                    .select_related("assigned_to")
+                    .first()
+                ) or job.acceptances.first()
+                worker = None
+                if job_acceptance:
+                    job_acceptance.status = "completed"
+                    job_acceptance.save()
+
+                    # Update the assigned worker's works count
+                    if job_acceptance.assigned_to:
+                        worker = job_acceptance.assigned_to
+                        if newly_completed:
+                            counters.add_works(worker.pk)
+
+                # The admin history row can wait; the counters above can't
+                if newly_completed:
+                    record_completion.enqueue(
+                        job_id=str(job.pk),
+                        worker_id=str(worker.pk) if worker else None,
+                        completed_at=timezone.now().isoformat(),
+                    )
 
             return Response(
                 {
@@ -725,15 +1501,24 @@ class CompletedJobsView(APIView):
                 Job.objects.filter(is_completed=True)
                 .select_related("user", "service_category")
                 .prefetch_related(
-                    "acceptances"
-                )  # Use the related_name from JobAcceptance model
+                    # The acceptance the job was assigned through, with its worker
+                    Prefetch(
+                        "acceptances",
+                        queryset=JobAcceptance.objects.filter(
+                            assigned_to__isnull=False
+                        ).select_related("assigned_to"),
+                        to_attr="assigned_acceptances",
+                    )
+                )
                 .order_by("-created_at")
             )
 
             completed_jobs_data = []
             for job in jobs:
                 # Get the job acceptance record for this job
-                job_acceptance = job.acceptances.first()
+                job_acceptance = (
+                    job.assigned_acceptances[0] if job.assigned_acceptances else None
+                )
                 assigned_worker = job_acceptance.assigned_to if job_acceptance else None
 
                 job_data = {
@@ -777,6 +1562,35 @@ class CompletedJobsView(APIView):
             )
 
 
+class CompletedJobHistoryView(APIView):
+    def get(self, request):
+        try:
+            summaries, next_cursor = keyset_page(
+                CompletedJobSummary.objects.all(),
+                ("-created_at", "-job_id"),
+                cursor=request.query_params.get("cursor"),
+                limit=parse_limit(request.query_params.get("limit")),
+            )
+            return Response(
+                {
+                    "message": "Completed jobs fetched successfully",
+                    "data": [summary_data(summary) for summary in summaries],
+                    "next": next_cursor,
+                    "status": "success",
+                }
+            )
+        except InvalidPage as e:
+            return Response(
+                {"message": str(e), "status": "error"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        except Exception as e:
+            return Response(
+                {"message": str(e), "status": "error"},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            )
+
+
 class DeleteUserView(APIView):
     def delete(self, request):
         try:
@@ -787,8 +1601,23 @@ class DeleteUserView(APIView):
                     status=status.HTTP_400_BAD_REQUEST,
                 )
 
-            user = User.objects.get(id=user_id)
-            user.delete()
+            with transaction.atomic():
+                user = User.objects.get(id=user_id)
+                # Counts on other users' jobs and on categories that the
+                # cascade is about to change
+                counters.add_applicants(
+                    Application.objects.filter(worker=user)
+                    .exclude(job__user=user)
+                    .values_list("job_id", flat=True),
+                    -1,
+                )
+                counters.add_open_jobs(
+                    Job.objects.filter(user=user, is_completed=False).values_list(
+                        "service_category_id", flat=True
+                    ),
+                    -1,
+                )
+                user.delete()
 
             return Response(
                 {"message": "User deleted successfully", "status": "success"},
@@ -812,15 +1641,12 @@ class AllUsersView(APIView):
             # Get all users
             users = User.objects.filter(is_admin=False)
 
-            # Serialize the users
-            serializer = UserSerializer(users, many=True)
+            # Serialize the users one at a time as the response streams
+            serializer = UserSerializer()
 
-            return Response(
-                {
-                    "message": "Users fetched successfully",
-                    "data": serializer.data,
-                    "status": "success",
-                }
+            return streaming_json_response(
+                iterate(users, serializer.to_representation),
+                message="Users fetched successfully",
             )
         except Exception as e:
             return Response(
@@ -877,8 +1703,9 @@ class ComplaintsListView(APIView):
             complaints = (
                 Complaint.objects.all().select_related("user").order_by("-created_at")
             )
-            complaints_data = [
-                {
+            complaints_data = iterate(
+                complaints,
+                lambda complaint: {
                     "id": str(complaint.id),
                     "title": complaint.title,
                     "details": complaint.details,
@@ -887,16 +1714,11 @@ class ComplaintsListView(APIView):
                         complaint.user.full_name if complaint.user else None
                     ),
                     "status": "success",
-                }
-                for complaint in complaints
-            ]
+                },
+            )
 
-            return Response(
-                {
-                    "message": "Complaints fetched successfully",
-                    "data": complaints_data,
-                    "status": "success",
-                }
+            return streaming_json_response(
+                complaints_data, message="Complaints fetched successfully"
             )
         except Exception as e:
             return Response(
@@ -951,16 +1773,22 @@ class AdminRegistrationView(APIView):
             serializer = UserSerializer(data=request.data)
             if serializer.is_valid():
                 try:
-                    # Set admin-specific fields
-                    user = serializer.save()
-                    user.is_admin = True
-                    user.is_verified = True
-                    user.save()
-
-                    # Mark the code as used
-                    admin_code.is_used = True
-                    admin_code.used_at = timezone.now()
-                    admin_code.save()
+                    with transaction.atomic():
+                        # Claim the code in the same transaction as the user,
+                        # so two requests can't both use it
+                        claimed = AdminRegistrationCode.objects.filter(
+                            pk=admin_code.pk, is_used=False
+                        ).update(is_used=True, used_at=timezone.now())
+                        if not claimed:
+                            return Response(
+                                {
+                                    "message": "Invalid or already used registration code",
+                                    "status": "error",
+                                    "error": "Invalid or already used registration code",
+                                },
+                                status=status.HTTP_400_BAD_REQUEST,
+                            )
+                        serializer.save(is_admin=True, is_verified=True)
 
                     return Response(
                         {